@@ -1,23 +1,14 @@
 import csv
 import json
-import string
-from collections import Counter
+import sys
+from pathlib import Path
 
-# --- Basic English stopwords list (no downloads needed) ---
-stop_words = set("""
-a about above after again against all am an and any are aren't as at be because been before being below between both 
-but by can can't cannot could couldn't did didn't do does doesn't doing don't down during each few for from further 
-had hadn't has hasn't have haven't having he he'd he'll he's her here here's hers herself him himself his how how's i 
-i'd i'll i'm i've if in into is isn't it it's its itself let's me more most mustn't my myself no nor not of off on once 
-only or other ought our ours ourselves out over own same shan't she she'd she'll she's should shouldn't so some such 
-than that that's the their theirs them themselves then there there's these they they'd they'll they're they've this 
-those through to too under until up very was wasn't we we'd we'll we're we've were weren't what what's when when's where 
-where's which while who who's whom why why's with won't would wouldn't you you'd you'll you're you've your yours yourself 
-yourselves
-""".split())
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from create_data_set_code.lyrics_store import LyricsStore
+from create_data_set_code.lyrics_tokenizer import total_counts
 
-# --- Storage for all words ---
-all_words = []
+# --- Lyrics ids of every selected song (the full lyrics live in the lyrics store) ---
+selected_ids = []
 
 # --- Load songs from CSV ---
 with open('eurovision_songs_final.csv', 'r', encoding='utf-8') as f:
@@ -31,17 +22,11 @@ with open('eurovision_songs_final.csv', 'r', encoding='utf-8') as f:
 
         # Filter only top 3 songs (excluding 1956)
         if place and place <= 3 and year != 1956:
-            lyrics = row['lyrics_english']
-            if lyrics and lyrics != "Not available in English":
-                # Normalize text: lowercase, remove punctuation
-                text = lyrics.lower().translate(str.maketrans('', '', string.punctuation))
-                words = text.split()
-                # Filter out stopwords and short words
-                words = [word for word in words if word not in stop_words and len(word) > 2]
-                all_words.extend(words)
+            selected_ids.append(int(row['lyrics_id']))
 
-# --- Count word frequencies ---
-word_counts = Counter(all_words)
+# --- Count word frequencies over the complete English lyrics (stopwords, punctuation and short words removed) ---
+with LyricsStore() as store:
+    word_counts = total_counts(lyrics for _, lyrics in store.iter(selected_ids, 'english'))
 top_words = word_counts.most_common(100)
 
 # --- Save to JSON ---
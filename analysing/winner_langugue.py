@@ -1,62 +1,81 @@
+import argparse
+import hashlib
+import html
+import inspect
 import json
+import os
+import sys
+import time
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from matplotlib.patches import Patch
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from create_data_set_code.contest_model import load_contests
+from create_data_set_code.year_stats import YearStats
+
 sns.set(style="whitegrid")
 
 def load_eurovision_data(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def extract_winner_languages(data):
-    rows = []
-    for contest in data:
-        year = contest.get("year")
-        final_round = next((r for r in contest.get("rounds", []) if r["name"] == "final"), None)
-        if not final_round:
-            continue
-        winning_perf = next((p for p in final_round.get("performances", []) if p["place"] == 1), None)
-        if not winning_perf:
-            continue
-        winner_id = winning_perf["contestantId"]
-        contestant = next((c for c in contest.get("contestants", []) if c["id"] == winner_id), None)
-        if not contestant:
-            continue
-        lyrics = contestant.get("lyrics", [])
-        if lyrics:
-            languages = lyrics[0].get("languages", ["Unknown"])
-            lang = " & ".join(languages)
-        else:
-            lang = "Unknown"
-        rows.append({"year": year, "language": lang})
-    return pd.DataFrame(rows)
-
-def plot_cumulative_language_wins(df, top_n=5):
-    df = df.copy()
-    df['language'] = df['language'].replace({
+    # Lyrics text is never plotted - keep only the languages and the final round
+    return list(load_contests(filepath, lyrics='meta', final_only=True))
+
+def winner_language(contestant):
+    if contestant.lyrics:
+        return " & ".join(contestant.lyrics[0].get("languages", ["Unknown"]))
+    return "Unknown"
+
+def contest_counts(contest):
+    """One contest's contribution to every YearStats dimension."""
+    countries = set(c.country for c in contest.contestants if c.country)
+    counts = {"participation": {country: 1 for country in countries}}
+    winner = contest.winner
+    if winner:
+        contestant, _ = winner
+        lang = winner_language(contestant)
+        counts["language"] = {lang: 1}
+        if contestant.country:
+            counts["country"] = {contestant.country: 1}
+            counts["language_country"] = {(lang, contestant.country): 1}
+    return counts
+
+def build_year_stats(data):
+    """
+    Wins by language, by country and by (language, country), and entries by country,
+    as prefix sums over the years - every table below is read off these.
+    """
+    stats = YearStats(["language", "country", "language_country", "participation"])
+    for contest in sorted(data, key=lambda c: c.year):
+        stats.add_year(contest.year, contest_counts(contest))
+    return stats
+
+def merge_labels(table, labels):
+    # Columns of a language spelled several ways are added up, in first-seen order
+    merged = table.T.groupby(lambda lang: labels.get(lang, lang), sort=False).sum().T
+    merged.columns.name = "language"
+    return merged
+
+def cumulative_language_wins(stats, top_n=5):
+    labels = {
         'English version': 'English',
         'english': 'English',
         'eng': 'English'
-    })
+    }
 
-    counts = df['language'].value_counts()
-    top_languages = counts.head(top_n).index.tolist()
+    totals = stats.total("language").groupby(lambda lang: labels.get(lang, lang), sort=False).sum()
+    top_languages = sorted(totals.sort_values(ascending=False, kind="stable").head(top_n).index)
 
-    df_top = df[df['language'].isin(top_languages)].copy()
-    df_top['count'] = 1
-
-    cum_df = (
-        df_top.pivot_table(index='year', columns='language', values='count', aggfunc='sum')
-        .fillna(0)
-        .cumsum()
-        .sort_index()
-    )
+    # Running totals straight from the prefix sums, on the years one of the top languages won
+    cum_df = merge_labels(stats.cumulative("language"), labels)[top_languages]
+    won = merge_labels(stats.per_year("language"), labels)[top_languages].sum(axis=1) > 0
+    return cum_df[won]
 
-    plt.figure(figsize=(12, 6))
+def draw_cumulative_language_wins(cum_df, top_n=5):
+    fig = plt.figure(figsize=(12, 6))
     for lang in cum_df.columns:
         plt.plot(cum_df.index, cum_df[lang], label=lang, linewidth=2)
 
@@ -66,20 +85,17 @@ def plot_cumulative_language_wins(df, top_n=5):
     plt.grid(axis="y", linestyle="--", alpha=0.4)
     plt.legend(title="Language", fontsize=10)
     plt.tight_layout()
+    return fig
+
+def plot_cumulative_language_wins(stats, top_n=5):
+    draw_cumulative_language_wins(cumulative_language_wins(stats, top_n), top_n)
     plt.show()
 
-def plot_language_win_heatmap(winners_df):
-    df = winners_df.copy()
-    df["language"] = df["language"].replace({"English version": "English"})
-
-    heatmap_df = (
-        df.groupby(["year", "language"])
-        .size()
-        .reset_index(name="wins")
-        .pivot(index="year", columns="language", values="wins")
-        .fillna(0)
-        .astype(int)
-    )
+def language_win_table(stats):
+    heatmap_df = merge_labels(stats.per_year("language"), {"English version": "English"})
+    # Years with a winner, languages in alphabetical order
+    heatmap_df = heatmap_df[heatmap_df.sum(axis=1) > 0]
+    heatmap_df = heatmap_df[sorted(heatmap_df.columns)]
 
     if 2020 not in heatmap_df.index:
         empty_row = pd.DataFrame(
@@ -94,12 +110,14 @@ def plot_language_win_heatmap(winners_df):
     filtered_langs = total_wins[total_wins >= 2].index
     heatmap_df = heatmap_df[filtered_langs]
     heatmap_df = heatmap_df[heatmap_df.sum().sort_values(ascending=False).index]
+    return heatmap_df
 
+def draw_language_win_heatmap(heatmap_df):
     cmap = sns.color_palette(["#d1d5db", "#f2f2f2", "#1f77b4"])
     bounds = [-1.5, -0.5, 0.5, 1.5]
     norm = plt.Normalize(vmin=-1.5, vmax=1.5)
 
-    plt.figure(figsize=(12, 8))
+    fig = plt.figure(figsize=(12, 8))
     sns.heatmap(
         heatmap_df.T,
         cmap=cmap,
@@ -126,24 +144,18 @@ def plot_language_win_heatmap(winners_df):
     plt.xlabel("Year")
     plt.ylabel("Language")
     plt.tight_layout()
-    plt.show()
-
-def plot_participation_trends(data):
-    """
-    Plot the number of participating countries per year to support the historical claim
-    about post-1991 expansion and diversity.
-    """
-    participation = []
+    return fig
 
-    for contest in data:
-        year = contest.get("year")
-        contestants = contest.get("contestants", [])
-        country_count = len(set(c.get("country") for c in contestants if c.get("country")))
-        participation.append({"year": year, "countries": country_count})
+def plot_language_win_heatmap(stats):
+    draw_language_win_heatmap(language_win_table(stats))
+    plt.show()
 
-    df = pd.DataFrame(participation).sort_values("year")
+def participation_counts(stats):
+    per_year = stats.per_year("participation")
+    return pd.DataFrame({"year": per_year.index, "countries": (per_year > 0).sum(axis=1).to_numpy()})
 
-    plt.figure(figsize=(12, 6))
+def draw_participation_trends(df):
+    fig = plt.figure(figsize=(12, 6))
     sns.lineplot(data=df, x="year", y="countries", marker="o", linewidth=2)
 
     # Highlight the post-Cold War turning point
@@ -155,21 +167,118 @@ def plot_participation_trends(data):
     plt.grid(axis="y", linestyle="--", alpha=0.4)
     plt.legend()
     plt.tight_layout()
+    return fig
+
+def plot_participation_trends(stats):
+    """
+    Plot the number of participating countries per year to support the historical claim
+    about post-1991 expansion and diversity.
+    """
+    draw_participation_trends(participation_counts(stats))
     plt.show()
 
-def main():
+# --- Batch rendering: every figure to files, headless, in parallel, cached ---
+
+FIGURES_DIR = "../datasets/figures"
+
+def figure_specs(stats, top_n=5):
+    """(name, draw function, table it plots, extra parameters) of every figure."""
+    return [
+        ("participation_trends", draw_participation_trends, participation_counts(stats), {}),
+        ("language_win_heatmap", draw_language_win_heatmap, language_win_table(stats), {}),
+        ("cumulative_language_wins", draw_cumulative_language_wins,
+         cumulative_language_wins(stats, top_n), {"top_n": top_n}),
+    ]
+
+def figure_hash(name, draw, table, params, fmt, dpi):
+    # The drawing code is part of the key, so editing a plot redraws it
+    digest = hashlib.sha256()
+    digest.update(json.dumps([name, params, fmt, dpi], sort_keys=True).encode("utf-8"))
+    digest.update(inspect.getsource(draw).encode("utf-8"))
+    digest.update(table.to_csv().encode("utf-8"))
+    return digest.hexdigest()
+
+def render_one(draw, table, params, path, dpi):
+    plt.switch_backend("Agg")  # no display needed, nothing blocks
+    fig = draw(table, **params)
+    tmp_path = f"{path}.tmp{os.path.splitext(path)[1]}"
+    fig.savefig(tmp_path, dpi=dpi)
+    plt.close(fig)
+    os.replace(tmp_path, path)
+    return path
+
+def write_figure_index(entries, out_dir):
+    with open(os.path.join(out_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=4)
+    items = "\n".join(
+        f'<figure><img src="{html.escape(e["file"])}" width="900"><figcaption>{html.escape(e["name"])} '
+        f'({e["format"]}, {"cached" if e["cached"] else "rendered"})</figcaption></figure>'
+        for e in entries
+    )
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f"<!doctype html>\n<title>Eurovision figures</title>\n{items}\n")
+
+def render_figures(specs, out_dir=FIGURES_DIR, formats=("png",), dpi=150, workers=None, report=print):
+    """
+    Save every figure in every format to out_dir. A file is named after the hash of its table,
+    parameters and drawing code, so unchanged figures are reused instead of redrawn.
+    Writes index.json / index.html listing this run's figures and returns the entries.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    entries, jobs = [], []
+    for name, draw, table, params in specs:
+        for fmt in formats:
+            key = figure_hash(name, draw, table, params, fmt, dpi)
+            filename = f"{name}-{key[:12]}.{fmt}"
+            entry = {"name": name, "format": fmt, "file": filename, "hash": key,
+                     "cached": os.path.exists(os.path.join(out_dir, filename))}
+            entries.append(entry)
+            if not entry["cached"]:
+                jobs.append((entry, (draw, table, params, os.path.join(out_dir, filename), dpi)))
+
+    start = time.perf_counter()
+    if jobs:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(jobs))) as executor:
+            for future in [executor.submit(render_one, *args) for _, args in jobs]:
+                future.result()
+
+    # Drop the files of earlier versions of the figures
+    current = {entry["file"] for entry in entries}
+    for name, _, _, _ in specs:
+        for fmt in formats:
+            for old in Path(out_dir).glob(f"{name}-*.{fmt}"):
+                if old.name not in current:
+                    old.unlink()
+
+    write_figure_index(entries, out_dir)
+    report(f"🖼️ {len(jobs)} figures rendered, {len(entries) - len(jobs)} cached "
+           f"in {time.perf_counter() - start:.2f}s -> {os.path.join(out_dir, 'index.html')}")
+    return entries
+
+def main(batch=False, out_dir=FIGURES_DIR, formats=("png",), dpi=150, workers=None):
     data_path = Path("../basic_datasets/eurovision.json")
-    euro_data = load_eurovision_data(data_path)
-    winners_df = extract_winner_languages(euro_data)
+    stats = build_year_stats(load_eurovision_data(data_path))
+
+    if batch:
+        return render_figures(figure_specs(stats), out_dir, formats, dpi, workers)
 
     # Plot 1: Participation trend (your new analysis)
-    plot_participation_trends(euro_data)
+    plot_participation_trends(stats)
 
     # Plot 2: Heatmap of winner languages
-    plot_language_win_heatmap(winners_df)
+    plot_language_win_heatmap(stats)
 
     # Optional: cumulative wins (can uncomment if needed)
-    # plot_cumulative_language_wins(winners_df)
+    # plot_cumulative_language_wins(stats)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Winner language plots")
+    parser.add_argument("--batch", action="store_true",
+                        help="save every figure to files instead of showing them (no display needed)")
+    parser.add_argument("--out", default=FIGURES_DIR, help="folder for the figures and their index")
+    parser.add_argument("--format", action="append", choices=["png", "svg", "pdf"],
+                        help="file format (can be repeated, default png)")
+    parser.add_argument("--dpi", type=int, default=150)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    main(args.batch, args.out, tuple(args.format or ["png"]), args.dpi, args.workers)
@@ -0,0 +1,61 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from create_data_set_code.audio_download import HTTPBackend, download_all
+
+
+class SlowHandler(SimpleHTTPRequestHandler):
+    # Simulates the per-request latency of a remote host
+    latency = 0.1
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(n_files=40, size=2 << 20, worker_counts=(1, 4, 8, 16), latency=0.1):
+    source_dir = tempfile.mkdtemp()
+    for i in range(n_files):
+        with open(os.path.join(source_dir, f"song_{i}.mp3"), "wb") as f:
+            f.write(os.urandom(size))
+
+    SlowHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(SlowHandler, directory=source_dir))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"{n_files} files x {size >> 20} MB, {latency * 1000:.0f} ms latency per request")
+    try:
+        for workers in worker_counts:
+            target_dir = tempfile.mkdtemp()
+            jobs = [(f"{base_url}/song_{i}.mp3", os.path.join(target_dir, str(i % 5), f"song_{i}"))
+                    for i in range(n_files)]
+            manifest = os.path.join(target_dir, "manifest.json")
+            stats = download_all(jobs, manifest, backend=HTTPBackend(), workers=workers, report=lambda msg: None)
+
+            start = time.perf_counter()
+            download_all(jobs, manifest, backend=HTTPBackend(), workers=workers, report=lambda msg: None)
+            rerun = time.perf_counter() - start
+
+            mb_per_s = stats["bytes"] / stats["seconds"] / (1 << 20)
+            print(f"{workers:>3} workers: {stats['seconds']:.2f}s ({mb_per_s:.0f} MB/s, "
+                  f"{stats['failed']} failed), rerun {rerun * 1000:.1f} ms")
+            shutil.rmtree(target_dir)
+    finally:
+        server.shutdown()
+        shutil.rmtree(source_dir)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,90 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks.synthetic_data import write_dataset
+from eurovision import HEAVY_MODULES
+
+CLI = os.path.join(ROOT, "eurovision.py")
+EUROVISION_JSON = os.path.join(ROOT, "basic_datasets", "eurovision.json")
+
+# Commands that must start fast: the help of every subcommand and the lyrics word counts
+HELP_COMMANDS = [[], ["build"], ["scrape"], ["audio"], ["words"], ["plots"], ["serve"]]
+
+
+def light_commands(words_args):
+    return [command + ["--help"] for command in HELP_COMMANDS] + [
+        ["words", "--winners", "-n", "5"] + words_args,
+        ["words", "--top-three", "--vs", "losers", "-n", "5"] + words_args,
+    ]
+
+
+def imported_modules(command):
+    """Top-level module names imported while running `command`, from `python -X importtime`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", CLI] + command,
+                            capture_output=True, text=True, cwd=ROOT)
+    if result.returncode != 0:
+        raise RuntimeError(f"eurovision {' '.join(command)} failed:\n{result.stderr[-2000:]}")
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    return modules
+
+
+def wall_ms(argv, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, capture_output=True, cwd=ROOT, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)  # the least disturbed run on a noisy machine
+
+
+def check(words_args, budget_ms=60.0, repeat=5):
+    """Problems found: heavy imports on a light path, or startup over the budget (above bare Python)."""
+    problems = []
+    interpreter = wall_ms([sys.executable, "-c", "pass"], repeat)
+    print(f"{'python -c pass':<50} {interpreter:8.1f} ms")
+    for command in light_commands(words_args):
+        label = "eurovision " + " ".join(arg for arg in command if arg not in words_args)
+        heavy = sorted(imported_modules(command) & set(HEAVY_MODULES))
+        elapsed = wall_ms([sys.executable, CLI] + command, repeat)
+        overhead = elapsed - interpreter
+        print(f"{label:<50} {elapsed:8.1f} ms  (+{overhead:.1f} ms)")
+        if heavy:
+            problems.append(f"{label} imports {', '.join(heavy)}")
+        if overhead > budget_ms:
+            problems.append(f"{label} takes {overhead:.1f} ms over the interpreter (budget {budget_ms:.0f} ms)")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import-time budget for the eurovision CLI")
+    parser.add_argument("--budget-ms", type=float, default=60.0,
+                        help="allowed startup time on top of a bare interpreter")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Without the real contests (not in the repo) the word counts run on a synthetic year range
+        words_args = ["--index", os.path.join(workdir, "lyrics_index.json")]
+        if not os.path.exists(EUROVISION_JSON):
+            write_dataset(workdir, scale=1, report=lambda message: None)
+            words_args += ["--source", os.path.join(workdir, "eurovision.json")]
+        # Builds the lyrics index first, so the timed runs only read it
+        subprocess.run([sys.executable, CLI, "words", "-n", "1"] + words_args, capture_output=True, cwd=ROOT,
+                       check=True)
+        problems = check(words_args, args.budget_ms, args.repeat)
+    if problems:
+        print("❌ Startup budget exceeded:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    print("✅ Every light command starts within the budget")
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from create_data_set_code.extract_song_db_1 import apply_jury_scores, scoreboards_to_long
+
+
+def legacy_backfill(df, scoreboards):
+    # The original nested .loc loop from extract_song_db_1.main, kept for comparison
+    df = df.copy()
+    for year, year_df in scoreboards.items():
+        mask_year = df["year"] == int(year)
+        for idx, row in year_df.iterrows():
+            mask = mask_year & (df["to_country"] == row["Country"])
+            df.loc[mask, "points_jury_final"] = row["total_judge_points"]
+            df.loc[mask, "points_final"] = row["total_judge_points"]
+            for voter_country in year_df.columns[2:]:
+                if voter_country in df.columns:
+                    df.loc[mask, voter_country] = row[voter_country]
+    return df
+
+
+def make_inputs(n_years, n_voters, seed=0):
+    rng = np.random.default_rng(seed)
+    countries = [f"Country {i}" for i in range(n_voters)]
+    voter_cols = [f"{c} Jury" for c in countries]
+
+    rows = []
+    scoreboards = {}
+    for year in range(1957, 1957 + n_years):
+        points = rng.integers(0, 13, size=(n_voters, n_voters)).astype(float)
+        year_df = pd.DataFrame(points, columns=voter_cols)
+        year_df.insert(0, "total_judge_points", points.sum(axis=1))
+        year_df.insert(0, "Country", countries)
+        scoreboards[year] = year_df
+        rows += [{"year": year, "to_country": c} for c in countries]
+
+    df = pd.DataFrame(rows)
+    df["points_final"] = 0.0
+    df["points_jury_final"] = 0.0
+    for col in voter_cols:
+        df[col] = 0.0
+    return df, scoreboards
+
+
+def run(sizes=((5, 10), (10, 20), (20, 30), (40, 40), (59, 45))):
+    print(f"{'years':>6} {'voters':>7} {'loop (s)':>10} {'bulk (s)':>10} {'speedup':>8}")
+    for n_years, n_voters in sizes:
+        df, scoreboards = make_inputs(n_years, n_voters)
+
+        start = time.perf_counter()
+        old = legacy_backfill(df, scoreboards)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new = apply_jury_scores(df, scoreboards_to_long(scoreboards))
+        bulk_time = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(old, new, check_dtype=False)
+        print(f"{n_years:>6} {n_voters:>7} {loop_time:>10.3f} {bulk_time:>10.3f} {loop_time / bulk_time:>7.0f}x")
+
+
+if __name__ == "__main__":
+    run()
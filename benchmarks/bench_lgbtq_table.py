@@ -0,0 +1,123 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from create_data_set_code.lgtbq_artist_list import URL, extract_table
+
+
+def legacy_extract(html):
+    # The original three passes from lgtbq_artist_list.main, kept for comparison
+    from io import StringIO
+
+    import pandas as pd
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    target_table = soup.find_all("table", {"class": "wikitable"})[1]
+    df = pd.read_html(StringIO(str(target_table)))[0]
+
+    links = []
+    placements = []
+    for row in target_table.find_all("tr")[1:]:
+        cell = row.find("td")
+        if cell and cell.find("a"):
+            link = cell.find("a")["href"]
+            if link.startswith("/wiki/"):
+                link = "https://en.wikipedia.org" + link
+            links.append(link)
+        else:
+            links.append(None)
+
+        style = row.get("style", "").lower()
+        tds = row.find_all("td")
+        bgc = row.get("bgcolor", "").lower()
+        if (not style or not bgc) and tds:
+            for td in tds:
+                if "background" in td.get("style", "").lower():
+                    style = td["style"].lower()
+                    break
+        if "gold" in bgc:
+            placements.append("1st place")
+        elif "silver" in style:
+            placements.append("2nd place")
+        elif "#cc9966" in style or "bronze" in style:
+            placements.append("3rd place")
+        else:
+            placements.append("None")
+
+    df["Artist Link"] = links
+    df["Placement"] = placements
+    return df
+
+
+def synthetic_page(n_rows=120, filler_tables=6, seed=0):
+    """A page shaped like the Wikipedia list: navigation, several wikitables, references."""
+    rng = np.random.default_rng(seed)
+    colors = ['bgcolor="gold"', 'style="background:silver"', 'style="background:#cc9966"', ""]
+    parts = ["<html><head><style>.x{}</style></head><body>", "<div>" + "<p>Intro text.</p>" * 400 + "</div>"]
+    for t in range(filler_tables + 1):
+        parts.append('<table class="wikitable sortable"><tr><th>Artist</th><th>Country</th><th>Year</th>'
+                     '<th>Song</th><th>Sexual orientation or gender identity</th><th>Points</th><th>Place</th></tr>')
+        i = 0
+        while i < n_rows:
+            repeat = int(rng.integers(1, 3))
+            color = colors[int(rng.integers(0, len(colors)))] if t == 1 else ""
+            for r in range(repeat):
+                cells = []
+                if r == 0:
+                    span = f' rowspan="{repeat}"' if repeat > 1 else ""
+                    cells.append(f'<td{span}><a href="/wiki/Artist_{i}">Artist {i}</a></td>'
+                                 f'<td{span}>Country {i % 40}</td>')
+                cells.append(f"<td>{1956 + i + r}</td><td>&quot;Song {i}-{r}&quot;</td>"
+                             f"<td>Gay<sup class=\"reference\">[{i}]</sup></td>"
+                             f"<td>{int(rng.integers(0, 300))}</td><td>{int(rng.integers(1, 27))}</td>")
+                parts.append(f"<tr {color}>" + "".join(cells) + "</tr>")
+            i += repeat
+        parts.append("</table>")
+    parts.append("<ol class=\"references\">" + "<li>Reference</li>" * 600 + "</ol></body></html>")
+    return "".join(parts)
+
+
+def timed(func, html, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(html)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def run(saved_page=None, repeat=5):
+    if saved_page:
+        with open(saved_page, "r", encoding="utf-8") as f:
+            html = f.read()
+        print(f"Saved page {saved_page} ({len(html) / 1e6:.1f} MB)")
+    else:
+        html = synthetic_page()
+        print(f"Synthetic page ({len(html) / 1e6:.1f} MB) - pass a saved copy of {URL} to use the real one")
+
+    new, new_time = timed(extract_table, html, repeat)
+    print(f"single pass: {new_time * 1000:8.1f} ms  ({len(new)} rows)")
+
+    try:
+        old, old_time = timed(legacy_extract, html, repeat)
+    except ImportError as e:
+        # pd.read_html needs lxml or html5lib - time the BeautifulSoup parse alone as a lower bound
+        from bs4 import BeautifulSoup
+
+        _, soup_time = timed(lambda page: BeautifulSoup(page, "html.parser"), html, repeat)
+        print(f"legacy:      >{soup_time * 1000:7.1f} ms  (soup parse only, read_html unavailable: {e})"
+              f" -> >{soup_time / new_time:.1f}x")
+        return
+    print(f"legacy:      {old_time * 1000:8.1f} ms  ({len(old)} rows) -> {old_time / new_time:.1f}x")
+    for column in ("Artist Link", "Placement"):
+        differing = int((old[column].fillna("") != new[column].fillna("")).sum())
+        print(f"  {column}: {differing} rows differ from the legacy output")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else None)
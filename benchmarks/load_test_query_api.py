@@ -0,0 +1,97 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from create_data_set_code.query_api import make_server
+
+
+def request_mix(host, port, n, seed=0):
+    """n paths spread over every endpoint, built from the (year, country) entries the server reports."""
+    conn = http.client.HTTPConnection(host, port)
+    conn.request("GET", "/years")
+    years = json.loads(conn.getresponse().read())
+    entries = []
+    for year in years:
+        conn.request("GET", f"/results/{year}")
+        entries += [(year, quote(row["country"])) for row in json.loads(conn.getresponse().read())]
+    conn.close()
+
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(n):
+        year, country = rng.choice(entries)
+        paths.append(rng.choice([
+            f"/results/{year}",
+            f"/countries/{country}",
+            f"/votes/{year}/given/{country}",
+            f"/votes/{year}/received/{country}?kind=jury",
+        ]))
+    return paths
+
+
+def worker(host, port, paths, latencies, statuses, conditional):
+    conn = http.client.HTTPConnection(host, port)
+    etags = {}
+    for path in paths:
+        headers = {"If-None-Match": etags[path]} if conditional and path in etags else {}
+        start = time.perf_counter()
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        statuses.append(response.status)
+        if response.getheader("ETag"):
+            etags[path] = response.getheader("ETag")
+    conn.close()
+
+
+def load_test(host, port, requests=5000, concurrency=8, conditional=False):
+    paths = request_mix(host, port, requests)
+    latencies, statuses = [], []
+    chunks = [paths[i::concurrency] for i in range(concurrency)]
+    threads = [threading.Thread(target=worker, args=(host, port, chunk, latencies, statuses, conditional))
+               for chunk in chunks]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    cuts = statistics.quantiles(latencies, n=100)
+    counts = {status: statuses.count(status) for status in sorted(set(statuses))}
+    print(f"{len(latencies)} requests, {concurrency} clients{' (conditional GET)' if conditional else ''}: "
+          f"{len(latencies) / elapsed:,.0f} req/s, p50 {cuts[49] * 1000:.2f} ms, "
+          f"p99 {cuts[98] * 1000:.2f} ms, statuses {counts}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for the query API")
+    parser.add_argument("--url", help="test a running server instead of starting one")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        server = make_server(port=0, reload_interval=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+
+    load_test(host, port, args.requests, args.concurrency)
+    load_test(host, port, args.requests, args.concurrency, conditional=True)
+
+    if server:
+        server.shutdown()
@@ -0,0 +1,427 @@
+"""
+Benchmark every dataset-building and analysis stage against fixed fixture inputs.
+
+Each stage runs in its own process (so peak RSS is per stage) inside a throwaway
+workspace laid out like the repo. Network access is stubbed: scoreboards are read
+from an empty offline cache and the LGBTQ page from a saved snapshot.
+
+    python benchmarks/suite.py                    # compare against benchmarks/baseline.json
+    python benchmarks/suite.py --update-baseline  # record a new baseline
+    python benchmarks/suite.py --scale 100        # stress test on synthetic data (see synthetic_data.py)
+    python benchmarks/suite.py --stage merge      # one stage; the stages it reads from run first, untimed
+
+The baseline records the host it was measured on and its number of runs per stage; timings
+are only compared on that host, over the same number of runs.
+"""
+import argparse
+import csv
+import functools
+import json
+import os
+import platform
+import resource
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "baseline.json")
+DEFAULT_REPEAT = 5
+SOURCE_DIR = os.path.join(ROOT, "basic_datasets")
+
+csv.field_size_limit(sys.maxsize)
+
+
+# --- Fixtures ---
+
+def contests_from_csv(contestants_csv):
+    """eurovision.json-shaped contests rebuilt from contestants.csv, one year at a time."""
+    by_year = {}
+    with open(contestants_csv, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            by_year.setdefault(int(row["year"]), []).append(row)
+
+    def number(text):
+        return int(float(text)) if text else None
+
+    for year, rows in sorted(by_year.items()):
+        contestants, final, semis = [], [], {}
+        for i, row in enumerate(rows):
+            lyrics = row["lyrics"]
+            contestants.append({
+                "id": i,
+                "country": row["to_country_id"].upper(),
+                "artist": row["performer"],
+                "song": row["song"],
+                "lyrics": [{"languages": ["English"], "content": lyrics}] if lyrics else [],
+            })
+            if row["place_final"]:
+                final.append({
+                    "contestantId": i,
+                    "place": number(row["place_final"]),
+                    "running": number(row["running_final"]),
+                    "scores": [{"name": "total", "points": number(row["points_final"])}],
+                })
+            if row["place_sf"]:
+                name = f"semi-final-{number(row['sf_num'])}" if row["sf_num"] else "semi-final"
+                semis.setdefault(name, []).append({
+                    "contestantId": i,
+                    "place": number(row["place_sf"]),
+                    "running": number(row["running_sf"]),
+                    "scores": [{"name": "total", "points": number(row["points_sf"])}],
+                })
+        rounds = [{"name": name, "performances": perfs} for name, perfs in sorted(semis.items())]
+        rounds.append({"name": "final", "performances": final})
+        yield {"year": year, "contestants": contestants, "rounds": rounds}
+
+
+def write_json_array(items, path):
+    # Streamed so the fixture writer never holds every contest at once
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, item in enumerate(items):
+            f.write(",\n" if i else "\n")
+            json.dump(item, f, ensure_ascii=False)
+        f.write("\n]\n")
+
+
+def build_workspace(workdir, source_dir=SOURCE_DIR, scale=None):
+    """
+    Repo-shaped workspace: basic_datasets/ inputs, datasets/ outputs and the stage working
+    directories. With a scale, the inputs are synthetic data of that many times the real size.
+    """
+    from benchmarks.bench_lgbtq_table import synthetic_page
+    from benchmarks.synthetic_data import write_dataset
+    from create_data_set_code.lgtbq_artist_list import CACHE_DIR, URL
+    from create_data_set_code.scoreboard_scraper import write_snapshot
+
+    basic = os.path.join(workdir, "basic_datasets")
+    for sub in ("basic_datasets", "datasets", "create_data_set_code", "analysing"):
+        os.makedirs(os.path.join(workdir, sub), exist_ok=True)
+
+    if scale:
+        write_dataset(basic, scale, report=lambda message: None)
+    else:
+        for name in ("contestants.csv", "votes.csv", "countries.json"):
+            shutil.copy(os.path.join(source_dir, name), basic)
+        json_source = os.path.join(source_dir, "eurovision.json")
+        if os.path.exists(json_source):
+            shutil.copy(json_source, basic)
+        else:
+            write_json_array(contests_from_csv(os.path.join(basic, "contestants.csv")),
+                             os.path.join(basic, "eurovision.json"))
+
+    write_snapshot(URL, synthetic_page(), os.path.join(workdir, CACHE_DIR))
+
+
+# --- Stages (run inside the child process, cwd relative to the workspace) ---
+
+def count_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return sum(1 for _ in csv.reader(f)) - 1
+
+
+def rows_in(path):
+    if path.endswith(".xlsx"):
+        def count():
+            import pandas as pd
+
+            return len(pd.read_excel(path))
+        return count
+    return lambda: count_rows(path)
+
+
+def run_song_db_1():
+    from create_data_set_code import extract_song_db_1
+    from create_data_set_code.scoreboard_scraper import ScoreboardScraper
+
+    # Network stubbed: no scoreboard snapshots in the workspace, so every year is skipped offline
+    extract_song_db_1.ScoreboardScraper = functools.partial(ScoreboardScraper, offline=True)
+    extract_song_db_1.main()
+
+
+def run_wide_votes():
+    from create_data_set_code.csv_cache import load_csv
+    from create_data_set_code.vote_tensor import VoteTensor
+
+    contestants = load_csv("basic_datasets/contestants.csv", columns=["to_country_id", "to_country"])
+    names = contestants.set_index("to_country_id")["to_country"].to_dict()
+    VoteTensor.load("basic_datasets/votes.csv").wide_votes(names, round="final")
+
+
+def run_song_db_2():
+    from create_data_set_code import extract_song_db_2
+
+    extract_song_db_2.main()
+    # The word-frequency scripts read this table under their own names
+    for name in ("eurovision_song.csv", "eurovision_songs_final.csv"):
+        shutil.copy("../datasets/eurovision_dataset_2.csv", os.path.join("..", "analysing", name))
+
+
+def run_lgbtq():
+    from create_data_set_code import lgtbq_artist_list
+
+    lgtbq_artist_list.main()
+
+
+def run_merge():
+    from create_data_set_code.merge_datasets import merge_datasets
+
+    merge_datasets()
+
+
+def run_load_entries():
+    from create_data_set_code.vote_store import load_entries
+
+    # The common read: scalar columns of every entry, no lyrics and no votes
+    load_entries("datasets/final_merged.csv")
+
+
+def run_lyrics_index():
+    from create_data_set_code import lyrics_index
+
+    # Build from scratch every run, not just the incremental no-op of a rerun
+    if os.path.exists(lyrics_index.INDEX_FILE):
+        os.remove(lyrics_index.INDEX_FILE)
+    lyrics_index.main()
+
+
+def run_figures():
+    sys.path.insert(0, os.path.join(ROOT, "analysing"))
+    import winner_langugue
+
+    # Every figure is drawn every run, not served from the previous run's figure cache
+    shutil.rmtree(winner_langugue.FIGURES_DIR, ignore_errors=True)
+    winner_langugue.main(batch=True)
+
+
+def run_script(script):
+    return lambda: runpy.run_path(os.path.join(ROOT, "analysing", script), run_name="__main__")
+
+
+def count_entries(path):
+    from create_data_set_code.contest_reader import iter_contests
+
+    return sum(len(contest.get("contestants", [])) for contest in iter_contests(path, lyrics="none"))
+
+
+class Stage(namedtuple("Stage", "cwd runner rows needs")):
+    """
+    cwd: working directory inside the workspace; runner; rows: rows handled (counted after
+    the timing); needs: the stages whose outputs it reads.
+    """
+
+
+STAGES = {
+    "song_db_1": Stage(".", run_song_db_1, rows_in("basic_datasets/contestants.csv"), []),
+    "wide_votes": Stage(".", run_wide_votes, rows_in("basic_datasets/votes.csv"), []),
+    "song_db_2": Stage("create_data_set_code", run_song_db_2,
+                       lambda: count_entries("../basic_datasets/eurovision.json"), []),
+    "lgbtq": Stage(".", run_lgbtq, rows_in("datasets/lgbtq_eurovision_artists.xlsx"), []),
+    "merge": Stage(".", run_merge, rows_in("datasets/final_merged.csv"), ["song_db_1", "song_db_2", "lgbtq"]),
+    "load_entries": Stage(".", run_load_entries, rows_in("datasets/final_merged.csv"), ["merge"]),
+    "lyrics_index": Stage("create_data_set_code", run_lyrics_index,
+                          lambda: count_entries("../basic_datasets/eurovision.json"), []),
+    "winner_words": Stage("analysing", run_script("winner_freq_words.py"), rows_in("eurovision_song.csv"),
+                          ["song_db_2"]),
+    "loser_words": Stage("analysing", run_script("lost_freq_words.py"), rows_in("eurovision_song.csv"),
+                         ["song_db_2"]),
+    "winner_lyrics_words": Stage("analysing", run_script("winner_freq_words_in_lyrc.py"),
+                                 rows_in("eurovision_songs_final.csv"), ["song_db_2"]),
+    "loser_lyrics_words": Stage("analysing", run_script("loser_freq_words_in_lyrc.py"),
+                                lambda: count_entries("../basic_datasets/eurovision.json"), []),
+    "figures": Stage("analysing", run_figures, lambda: count_entries("../basic_datasets/eurovision.json"), []),
+}
+
+
+def with_producers(stages):
+    """The given stages and every stage they need, directly or not, in STAGES order."""
+    wanted = set()
+    pending = list(stages)
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(STAGES[name].needs)
+    return [name for name in STAGES if name in wanted]
+
+
+def host_info():
+    """What the timings depend on; a baseline only holds on the host it was recorded on."""
+    return {
+        "cpus": os.cpu_count(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "python": platform.python_version(),
+    }
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux but in bytes on macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def run_stage_here(name, workdir):
+    """Child side: run one stage and print its measurements as JSON."""
+    from create_data_set_code import lyrics_store
+
+    cwd, runner, rows, _ = STAGES[name]
+    os.chdir(os.path.join(workdir, cwd))
+    # The lyrics store defaults to the repo's datasets/lyrics, not the workspace's
+    lyrics_store.LYRICS_DIR = os.path.join(workdir, "datasets", "lyrics")
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            start = time.perf_counter()
+            runner()
+            seconds = time.perf_counter() - start
+            peak = peak_rss_mb()
+            count = rows()
+        finally:
+            sys.stdout = stdout
+    print(json.dumps({"seconds": seconds, "peak_rss_mb": peak, "rows": count}))
+
+
+def measure(name, workdir):
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run-stage", name, "--workdir", workdir],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Stage {name} failed:\n{result.stderr.strip()}")
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    stats["rows_per_s"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def median_run(runs):
+    return sorted(runs, key=lambda r: r["seconds"])[(len(runs) - 1) // 2]
+
+
+def run_suite(stages=None, repeat=DEFAULT_REPEAT, source_dir=SOURCE_DIR, scale=None, report=print):
+    """
+    {stage: measurements}, each stage's median wall time over `repeat` runs (peak RSS of that run).
+    Every stage runs once untimed first, so no timed run pays for filling the workspace's
+    caches (csv_cache parquet files, ...) and one run compares with the median of five.
+    Scaled runs are keyed "<stage>@<scale>x" so they sit next to the real-data baseline.
+    A stage that crashes (e.g. runs out of memory at scale) is recorded as {"failed": error}.
+    The stages a selected stage needs are run first, once and untimed, to produce its inputs.
+    """
+    selected = set(stages or STAGES)
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="eurovision_bench_")
+    try:
+        build_workspace(workdir, source_dir, scale)
+        for name in with_producers(selected):
+            if name not in selected:
+                try:
+                    measure(name, workdir)
+                except RuntimeError as e:
+                    # The stages that need it fail on their own and are reported as such
+                    report(f"{name:<26} FAILED (needed by another stage): {str(e).splitlines()[-1]}")
+                continue
+            key = f"{name}@{scale}x" if scale else name
+            try:
+                runs = [measure(name, workdir) for _ in range(repeat + 1)][1:]
+            except RuntimeError as e:
+                results[key] = {"failed": str(e).splitlines()[-1]}
+                report(f"{key:<26} FAILED: {results[key]['failed']}")
+                continue
+            results[key] = median_run(runs)
+            report(f"{key:<26} {results[key]['seconds']:8.3f}s {results[key]['peak_rss_mb']:8.1f} MB "
+                   f"{results[key]['rows_per_s']:12,.0f} rows/s")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold=0.25, min_seconds=0.25, min_mb=5.0, timings=True):
+    """
+    Stages whose wall time or peak RSS grew by more than `threshold` over the baseline
+    plus an absolute margin: `min_seconds` of wall time, `min_mb` of memory. The margin
+    keeps scheduler and timer noise on the sub-second stages from failing the check.
+    timings=False compares peak RSS only (a baseline recorded on another host).
+    """
+    metrics = [("seconds", min_seconds), ("peak_rss_mb", min_mb)] if timings else [("peak_rss_mb", min_mb)]
+    regressions = []
+    for name, stats in results.items():
+        if "failed" in stats:
+            regressions.append(f"{name}: failed ({stats['failed']})")
+            continue
+        if name not in baseline or "failed" in baseline[name]:
+            continue
+        for metric, floor in metrics:
+            before, now = baseline[name][metric], stats[metric]
+            if before and now > before * (1 + threshold) + floor:
+                regressions.append(f"{name}: {metric} {before:.3f} -> {now:.3f} (+{(now / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dataset pipeline stages")
+    parser.add_argument("--stage", action="append", choices=list(STAGES), help="only run STAGE (can be repeated)")
+    parser.add_argument("--repeat", type=int, default=None,
+                        help=f"runs per stage, the median is kept (default: the baseline's, else {DEFAULT_REPEAT})")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown / memory growth (0.25 = 25%%)")
+    parser.add_argument("--scale", type=int, default=None,
+                        help="run on synthetic inputs SCALE times the size of the real archive")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--run-stage", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        run_stage_here(args.run_stage, args.workdir)
+        return
+
+    host = host_info()
+    baseline = {"host": host, "stages": {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    same_host = baseline.get("host") == host
+
+    # A check runs as many times as its baseline did, unless told otherwise
+    repeat = args.repeat or (baseline.get("repeat") if same_host else None) or DEFAULT_REPEAT
+    results = run_suite(args.stage, repeat, scale=args.scale)
+
+    if args.update_baseline:
+        # Stages recorded on another host are dropped rather than mixed with this one's
+        # and so are those measured over a different number of runs
+        stages = baseline.get("stages", {}) if same_host and baseline.get("repeat") == repeat else {}
+        stages.update({
+            name: {k: round(v, 4) if isinstance(v, float) else v for k, v in stats.items()}
+            for name, stats in results.items()
+        })
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"host": host, "repeat": repeat, "stages": stages}, f, indent=2, sort_keys=True)
+        print(f"✅ Baseline saved to {args.baseline}")
+        return
+
+    if not baseline.get("stages"):
+        print(f"No baseline at {args.baseline} - run with --update-baseline first")
+        return
+    if not same_host:
+        print(f"Baseline recorded on another host ({baseline.get('host')}, this one is {host}): "
+              "comparing peak RSS only - run with --update-baseline to record timings here")
+    if same_host and repeat != baseline.get("repeat"):
+        print(f"Baseline is the median of {baseline.get('repeat')} runs per stage, this check of {repeat}")
+    regressions = compare(results, baseline["stages"], args.threshold, timings=same_host)
+    if regressions:
+        print("❌ Regressions over the baseline:")
+        for line in regressions:
+            print("  " + line)
+        sys.exit(1)
+    print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
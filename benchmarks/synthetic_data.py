@@ -0,0 +1,314 @@
+"""
+Deterministic synthetic Eurovision data in the shapes of basic_datasets/: eurovision.json,
+contestants.csv and votes.csv, at a multiple of the real archive's size.
+
+There is one contest per year from 1956 to 2025, like the real archive; a scale grows the
+contests, not the years. At scale N every participating country picks its entry in a national
+selection of N songs, and the N - 1 songs that lose it are entries of that year too. They are
+voted on in N - 1 heats ("national-selection-1", ...), heat k holding every country's k-th
+losing song and judged by the other countries in it, so the vote rows grow with the scale
+like the entries do (and so does VoteTensor, which is dense over the rounds).
+
+Contests are generated and written one at a time, so memory stays flat at any scale.
+Every contest draws from its own seeded generator: the same (seed, scale) always gives
+byte-identical files, a contest's own entries are the same at any scale, and contest N
+is the same no matter how many follow it.
+
+    python benchmarks/synthetic_data.py --scale 100 --out /tmp/eurovision_100x
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+from itertools import accumulate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from create_data_set_code.contest_model import SELECTION_ROUND
+
+FIRST_YEAR = 1956
+LAST_YEAR = 2025  # 70 contests, about the size of the real archive (~1,700 entries, ~51k vote rows)
+SCALES = {"10x": 10, "100x": 100, "1000x": 1000}
+
+CONTESTANT_COLUMNS = [
+    "year", "to_country_id", "to_country", "performer", "song", "place_contest", "sf_num",
+    "running_final", "running_sf", "place_final", "points_final", "place_sf", "points_sf",
+    "points_tele_final", "points_jury_final", "points_tele_sf", "points_jury_sf",
+    "composers", "lyricists", "lyrics", "youtube_url",
+]
+VOTE_COLUMNS = [
+    "year", "round", "from_country_id", "to_country_id", "from_country", "to_country",
+    "total_points", "tele_points", "jury_points",
+]
+
+POINTS = [12, 10, 8, 7, 6, 5, 4, 3, 2, 1]
+AUTO_QUALIFIERS = 6
+QUALIFIERS_PER_SEMI = 10
+
+# Syllables per language - words are built from them, so each language has its own vocabulary
+SYLLABLES = {
+    "English": ["love", "heart", "night", "light", "fire", "dream", "we", "you", "ever", "sky", "dance", "stay"],
+    "French": ["a", "mour", "nuit", "ciel", "je", "toi", "rê", "ve", "cœur", "pour", "tou", "jours"],
+    "Italian": ["a", "mo", "re", "not", "te", "cie", "lo", "sei", "tu", "per", "sem", "pre"],
+    "Spanish": ["co", "ra", "zón", "no", "che", "vi", "da", "mi", "sol", "que", "ro", "llo"],
+    "German": ["lie", "be", "nacht", "herz", "ich", "dich", "mor", "gen", "traum", "und", "ein", "mal"],
+    "Swedish": ["kär", "lek", "natt", "ljus", "jag", "dig", "dröm", "och", "hjär", "ta", "al", "drig"],
+    "Portuguese": ["a", "mor", "noi", "te", "co", "ra", "ção", "sau", "da", "de", "mar", "luz"],
+    "Croatian": ["lju", "bav", "noć", "sr", "ce", "ja", "ti", "san", "ne", "bo", "zo", "ra"],
+}
+VOCABULARY_SIZE = 3000
+
+
+def _vocabulary(language, seed):
+    """VOCABULARY_SIZE distinct pseudo-words with Zipf weights (common words repeat, the tail is long)."""
+    rng = random.Random(f"{seed}:vocabulary:{language}")
+    syllables = SYLLABLES[language]
+    words = dict.fromkeys(syllables)
+    while len(words) < VOCABULARY_SIZE:
+        words.setdefault("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    words = list(words)
+    return words, list(accumulate(1.0 / rank for rank in range(1, len(words) + 1)))
+
+
+class SyntheticContests:
+    """Generator of synthetic contests; see contest() for the shape of each one."""
+
+    def __init__(self, scale=1, seed=0, countries=None):
+        self.scale = scale
+        self.seed = seed
+        self.n_contests = LAST_YEAR - FIRST_YEAR + 1
+        if countries is None:
+            with open(os.path.join(ROOT, "basic_datasets", "countries.json"), "r", encoding="utf-8") as f:
+                countries = json.load(f)
+        self.countries = sorted(countries.items())  # [(code, name)]
+        self.vocabularies = {language: _vocabulary(language, seed) for language in SYLLABLES}
+        self.languages = sorted(SYLLABLES)
+
+    def lyrics(self, rng, language, n_words):
+        words, weights = self.vocabularies[language]
+        chosen = rng.choices(words, cum_weights=weights, k=n_words)
+        lines = [" ".join(chosen[i:i + 7]).capitalize() for i in range(0, n_words, 7)]
+        return "\n".join(lines)
+
+    def entry(self, rng, year, index, code, name, selection=0):
+        language = rng.choice(self.languages)
+        n_words = rng.randint(80, 260)
+        lyrics = [{"languages": [language], "content": self.lyrics(rng, language, n_words)}]
+        if language != "English":
+            # Most non-English entries come with an English translation, as in the real archive
+            if rng.random() < 0.8:
+                lyrics.append({"languages": ["English"], "content": self.lyrics(rng, "English", n_words)})
+            if rng.random() < 0.15:
+                lyrics[0]["languages"].append("English")
+        title_words, _ = self.vocabularies[language]
+        return {
+            "id": index,
+            "country": code.upper(),
+            "artist": f"Artist {year}-{code}" + (f"-{selection}" if selection else ""),
+            "song": " ".join(rng.choice(title_words[:200]) for _ in range(rng.randint(1, 4))).title(),
+            "lyrics": lyrics,
+            "bpm": rng.randint(70, 180),
+            "tone": rng.choice(["C", "D", "E", "F", "G", "A", "B"]) + rng.choice(["", "m"]) + " " + rng.choice(["Major", "Minor"]),
+            "stageDirector": f"Director {rng.randint(1, 200)}",
+            "composers": [f"Composer {rng.randint(1, 5000)}" for _ in range(rng.randint(1, 3))],
+            "lyricists": [f"Lyricist {rng.randint(1, 5000)}" for _ in range(rng.randint(1, 2))],
+        }
+
+    def vote_round(self, rng, name, performers, voters):
+        """Jury and televote sets of 12..1 from every voter; returns (performances, vote rows)."""
+        jury = {p: 0 for p in performers}
+        tele = {p: 0 for p in performers}
+        votes = []
+        quality = {p: rng.random() for p in performers}
+        for voter in voters:
+            candidates = [p for p in performers if p != voter]
+            given = {}
+            for kind, totals in (("jury", jury), ("tele", tele)):
+                ranked = sorted(candidates, key=lambda p: quality[p] + rng.random() * 0.8, reverse=True)
+                for points, performer in zip(POINTS, ranked):
+                    totals[performer] += points
+                    given.setdefault(performer, {})[kind] = points
+            for performer in candidates:
+                kinds = given.get(performer, {})
+                votes.append((name, voter, performer, kinds.get("jury", 0) + kinds.get("tele", 0),
+                              kinds.get("tele", 0), kinds.get("jury", 0)))
+
+        running = list(performers)
+        rng.shuffle(running)
+        ranking = sorted(performers, key=lambda p: (jury[p] + tele[p], quality[p]), reverse=True)
+        places = {p: i + 1 for i, p in enumerate(ranking)}
+        performances = [{
+            "contestantId": p,
+            "running": running.index(p) + 1,
+            "place": places[p],
+            "dances": rng.randint(0, 6),
+            "scores": [
+                {"name": "total", "points": jury[p] + tele[p]},
+                {"name": "jury", "points": jury[p]},
+                {"name": "public", "points": tele[p]},
+            ],
+        } for p in running]
+        return performances, votes
+
+    def national_selections(self, number, year, participants, first_id):
+        """
+        The songs each country's entry beat at home: scale - 1 more entries per country, with
+        ids from first_id on, as [(country, entry)], and their heats as [(round, vote rows)].
+        Heat k ("national-selection-k") holds the k-th of these songs of every country.
+        """
+        rng = random.Random(f"{self.seed}:selection:{number}")
+        entries, heats = [], []
+        for selection in range(1, self.scale):
+            songs = []
+            for c in participants:
+                songs.append(first_id + len(entries))
+                entries.append((c, self.entry(rng, year, songs[-1], *self.countries[c], selection=selection)))
+            name = f"{SELECTION_ROUND}-{selection}"
+            performances, votes = self.vote_round(rng, name, songs, songs)
+            heats.append(({"name": name, "performances": performances}, votes))
+        return entries, heats
+
+    def contest(self, number):
+        """
+        One contest as (eurovision.json contest, contestants.csv rows, votes.csv rows):
+        the year 1956 + number, plus its national selections when the scale is above 1.
+        """
+        rng = random.Random(f"{self.seed}:contest:{number}")
+        year = FIRST_YEAR + number
+        n_countries = min(len(self.countries), rng.randint(20, 42))
+        participants = sorted(rng.sample(range(len(self.countries)), n_countries))
+        contestants = [self.entry(rng, year, i, *self.countries[c]) for i, c in enumerate(participants)]
+        ids = list(range(len(contestants)))
+        country_of = list(participants)  # entry id -> index into self.countries
+
+        # Auto-qualifiers plus two semi-finals once there are enough entries for them
+        rounds = []
+        round_of = {}
+        finalists = ids
+        if len(ids) > AUTO_QUALIFIERS + 2 * QUALIFIERS_PER_SEMI:
+            shuffled = ids[:]
+            rng.shuffle(shuffled)
+            finalists = shuffled[:AUTO_QUALIFIERS]
+            rest = shuffled[AUTO_QUALIFIERS:]
+            for semi, members in enumerate((rest[::2], rest[1::2]), start=1):
+                name = f"semi-final-{semi}"
+                performances, votes = self.vote_round(rng, name, sorted(members), sorted(members))
+                rounds.append(({"name": name, "performances": performances}, votes))
+                for p in performances:
+                    round_of[p["contestantId"]] = (semi, p)
+                finalists += [p["contestantId"] for p in performances if p["place"] <= QUALIFIERS_PER_SEMI]
+        performances, votes = self.vote_round(rng, "final", sorted(finalists), ids)
+        rounds.append(({"name": "final", "performances": performances}, votes))
+        final = {p["contestantId"]: p for p in performances}
+
+        if self.scale > 1:
+            # Drawn from their own generator, so the contest itself is the same at every scale
+            selected, heats = self.national_selections(number, year, participants, len(contestants))
+            country_of += [c for c, _ in selected]
+            contestants += [entry for _, entry in selected]
+            rounds = heats + rounds
+
+        contest = {
+            "year": year,
+            "city": f"City {number % 500}",
+            "contestants": contestants,
+            "rounds": [r for r, _ in rounds],
+        }
+
+        def score(perf, name):
+            return next(s["points"] for s in perf["scores"] if s["name"] == name) if perf else None
+
+        contestant_rows = []
+        for c in contestants:
+            semi, semi_perf = round_of.get(c["id"], (None, None))
+            final_perf = final.get(c["id"])
+            code = c["country"].lower()
+            if final_perf:
+                place_contest = final_perf["place"]
+            elif semi_perf:
+                place_contest = len(finalists) + semi_perf["place"]
+            else:
+                place_contest = None  # lost its national selection
+            contestant_rows.append({
+                "year": year,
+                "to_country_id": code,
+                "to_country": self.countries[country_of[c["id"]]][1],
+                "performer": c["artist"],
+                "song": c["song"],
+                "place_contest": place_contest,
+                "sf_num": semi,
+                "running_final": final_perf["running"] if final_perf else None,
+                "running_sf": semi_perf["running"] if semi_perf else None,
+                "place_final": final_perf["place"] if final_perf else None,
+                "points_final": score(final_perf, "total"),
+                "place_sf": semi_perf["place"] if semi_perf else None,
+                "points_sf": score(semi_perf, "total"),
+                "points_tele_final": score(final_perf, "public"),
+                "points_jury_final": score(final_perf, "jury"),
+                "points_tele_sf": score(semi_perf, "public"),
+                "points_jury_sf": score(semi_perf, "jury"),
+                "composers": ";".join(c["composers"]),
+                "lyricists": ";".join(c["lyricists"]),
+                "lyrics": c["lyrics"][0]["content"],
+                "youtube_url": f"https://youtube.com/watch?v=synthetic{year}{code}"
+                               + (f"-{c['id']}" if c["id"] >= len(participants) else ""),
+            })
+
+        vote_rows = []
+        for _, votes in rounds:
+            for name, voter, performer, total, tele, jury in votes:
+                from_code = contestants[voter]["country"].lower()
+                to_code = contestants[performer]["country"].lower()
+                vote_rows.append((year, name, from_code, to_code, from_code, to_code, total, tele, jury))
+        return contest, contestant_rows, vote_rows
+
+    def __iter__(self):
+        for number in range(self.n_contests):
+            yield self.contest(number)
+
+
+def write_dataset(out_dir, scale=1, seed=0, report=print):
+    """Stream eurovision.json, contestants.csv, votes.csv and countries.json into out_dir."""
+    os.makedirs(out_dir, exist_ok=True)
+    generator = SyntheticContests(scale, seed)
+    counts = {"contests": 0, "entries": 0, "votes": 0}
+
+    with open(os.path.join(out_dir, "countries.json"), "w", encoding="utf-8") as f:
+        json.dump({code: name for code, name in generator.countries}, f, ensure_ascii=False)
+
+    with open(os.path.join(out_dir, "eurovision.json"), "w", encoding="utf-8") as json_file, \
+            open(os.path.join(out_dir, "contestants.csv"), "w", newline="", encoding="utf-8") as contestants_file, \
+            open(os.path.join(out_dir, "votes.csv"), "w", newline="", encoding="utf-8") as votes_file:
+        contestants_writer = csv.DictWriter(contestants_file, fieldnames=CONTESTANT_COLUMNS)
+        contestants_writer.writeheader()
+        votes_writer = csv.writer(votes_file)
+        votes_writer.writerow(VOTE_COLUMNS)
+
+        json_file.write("[")
+        for contest, contestant_rows, vote_rows in generator:
+            json_file.write(",\n" if counts["contests"] else "\n")
+            json.dump(contest, json_file, ensure_ascii=False)
+            contestants_writer.writerows(contestant_rows)
+            votes_writer.writerows(vote_rows)
+            counts["contests"] += 1
+            counts["entries"] += len(contestant_rows)
+            counts["votes"] += len(vote_rows)
+            if counts["contests"] % 1000 == 0:
+                report(f"  {counts['contests']}/{generator.n_contests} contests")
+        json_file.write("\n]\n")
+
+    report(f"✅ {counts['contests']} contests, {counts['entries']} entries, {counts['votes']} vote rows in {out_dir}")
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic Eurovision datasets")
+    parser.add_argument("--scale", default="10x", help=f"one of {', '.join(SCALES)} or an integer multiple")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="output directory (laid out like basic_datasets/)")
+    args = parser.parse_args()
+    scale = SCALES.get(args.scale) or int(args.scale.rstrip("x"))
+    write_dataset(args.out, scale, args.seed)
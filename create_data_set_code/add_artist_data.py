@@ -1,83 +1,219 @@
-import wikipedia
+import hashlib
+import json
+import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import pandas as pd
 
-def get_freddie_mercury_info():
-    wikipedia.set_lang("en")
+CACHE_DIR = 'datasets/.artist_cache'
+CACHE_TTL = 30 * 24 * 3600  # seconds
+
+# Compiled once, applied to all pages at once with pandas' vectorized str.extract
+BIRTH_DATE_PATTERNS = [
+    (re.compile(r'born\s(?:[^()\d]*?)?(?P<date>[A-Za-z]+\s\d{1,2},\s\d{4})'), "%B %d, %Y"),
+    (re.compile(r'born\s(?:[^()\d]*?)?(?P<date>\d{1,2}\s[A-Za-z]+\s\d{4})'), "%d %B %Y"),
+]
+DEATH_DATE_PATTERN = re.compile(r'died\s(?P<date>[A-Za-z]+\s\d{1,2},\s\d{4}|\d{1,2}\s[A-Za-z]+\s\d{4})')
+YEARS_ACTIVE_PATTERN = re.compile(r'Years active\s*:?\s*(?P<start>\d{4})\s*[–-]\s*(?P<end>\d{4}|present)', re.IGNORECASE)
+BAND_PATTERN = re.compile(
+    r'\b(?:is|was|are|were)\s+an?\s+(?:[\w-]+\s+){0,4}(?:band|(?:super)?group|duo|trio|quartet|quintet|ensemble|choir)\b',
+    re.IGNORECASE
+)
+SEXUAL_KEYWORDS = ["gay", "homosexual", "bisexual", "queer", "partner", "relationship"]
+
+
+# --- Page sources: fetch(artist) -> {"title", "summary", "content"} or None ---
+
+class WikipediaSource:
+    host = 'en.wikipedia.org'
+
+    def __init__(self, lang="en"):
+        import wikipedia
+
+        self.wikipedia = wikipedia
+        wikipedia.set_lang(lang)
+
+    def fetch(self, artist):
+        wikipedia = self.wikipedia
+        search_results = wikipedia.search(artist)
+        if not search_results:
+            return None
+        try:
+            page = wikipedia.page(search_results[0], auto_suggest=False)
+        except wikipedia.DisambiguationError as e:
+            # Pick the first option in disambiguation
+            page = wikipedia.page(e.options[0], auto_suggest=False)
+        except wikipedia.PageError:
+            return None
+        return {"title": page.title, "summary": page.summary, "content": page.content}
+
+
+def fixture_name(artist):
+    slug = re.sub(r'[^\w]+', '_', artist.casefold()).strip('_')
+    return f"{slug or 'artist'}_{hashlib.sha1(artist.encode('utf-8')).hexdigest()[:8]}.json"
 
-    # Search for Freddie Mercury page title first
-    search_results = wikipedia.search("Freddie Mercury")
-    if not search_results:
-        raise Exception("No Wikipedia page found for Freddie Mercury")
 
-    page_title = search_results[0]
+class FixtureSource:
+    """Recorded pages on disk (one JSON per artist, named by fixture_name) - for offline runs."""
+    host = 'fixtures'
 
-    try:
-        page = wikipedia.page(page_title)
-    except wikipedia.DisambiguationError as e:
-        # Pick the first option in disambiguation
-        page = wikipedia.page(e.options[0])
-    except wikipedia.PageError:
-        raise Exception(f"Could not find Wikipedia page for {page_title}")
+    def __init__(self, fixture_dir):
+        self.fixture_dir = fixture_dir
 
-    content = page.content
-    summary = page.summary
+    def fetch(self, artist):
+        path = os.path.join(self.fixture_dir, fixture_name(artist))
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
 
-    # Extract birth date (look in summary for 'born Month Day, Year')
-    birth_date = None
-    birth_date_match = re.search(r'born\s([A-Za-z]+\s\d{1,2},\s\d{4})', summary)
-    if birth_date_match:
-        birth_date = birth_date_match.group(1)
+
+class RateLimiter:
+    """At most `per_second` requests per host, shared by all worker threads."""
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def wait(self, host):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class CachedSource:
+    """Wraps a source with an on-disk response cache; misses (no page) are cached too."""
+
+    def __init__(self, source, cache_dir=CACHE_DIR, ttl=CACHE_TTL, rate_limiter=None):
+        self.source = source
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.rate_limiter = rate_limiter or RateLimiter(per_second=5)
+        self.requests = 0
+
+    def fetch(self, artist):
+        path = os.path.join(self.cache_dir, fixture_name(artist))
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if self.ttl is None or time.time() - cached['fetched_at'] < self.ttl:
+                return cached['page']
+
+        self.rate_limiter.wait(self.source.host)
+        self.requests += 1
+        page = self.source.fetch(artist)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fetched_at': time.time(), 'artist': artist, 'page': page}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return page
+
+
+def fetch_pages(artists, source, workers=8):
+    """{artist: page or None}, fetched concurrently."""
+    def fetch(artist):
+        try:
+            return source.fetch(artist)
+        except Exception as e:
+            print(f"Failed to fetch {artist}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(artists, executor.map(fetch, artists)))
+
+
+def _parse_dates(values, fmt):
+    return pd.to_datetime(values, format=fmt, errors='coerce')
+
+
+def extract_artist_info(pages):
+    """Birth date, years active and band/solo status for every page, extracted in bulk."""
+    artists = list(pages)
+    summaries = pd.Series([(pages[a] or {}).get('summary', '') for a in artists], index=artists, dtype=object)
+    contents = pd.Series([(pages[a] or {}).get('content', '') for a in artists], index=artists, dtype=object)
+
+    birth_date = pd.Series(pd.NaT, index=artists)
+    birth_text = pd.Series(None, index=artists, dtype=object)
+    for pattern, fmt in BIRTH_DATE_PATTERNS:
+        found = summaries.str.extract(pattern)['date']
+        missing = birth_text.isna() & found.notna()
+        birth_text[missing] = found[missing]
+        birth_date[missing] = _parse_dates(found[missing], fmt)
+
+    death_text = contents.str.extract(DEATH_DATE_PATTERN)['date']
+    death_date = _parse_dates(death_text, "%B %d, %Y").fillna(_parse_dates(death_text, "%d %B %Y"))
+
+    active = contents.str.extract(YEARS_ACTIVE_PATTERN)
+    this_year = datetime.now().year
+    active_end = pd.to_numeric(active['end'].replace({'present': str(this_year)}), errors='coerce')
+    years_active = active_end - pd.to_numeric(active['start'], errors='coerce')
+    # fallback: assume the career started roughly at age 20 and lasted until death (or today)
+    estimate = death_date.dt.year.fillna(this_year) - (birth_date.dt.year + 20)
+    years_active = years_active.fillna(estimate)
+
+    is_band = summaries.str.contains(BAND_PATTERN)
+
+    return pd.DataFrame({
+        'artist': artists,
+        'wikipedia_title': [(pages[a] or {}).get('title') for a in artists],
+        'birth_date': birth_text.values,
+        'years_active': years_active.astype('Int64').values,
+        'band_info': [None if pages[a] is None else 'Band' if band else 'Solo performer'
+                      for a, band in zip(artists, is_band)],
+    })
+
+
+def get_artist_info(artist, source=None):
+    info = extract_artist_info({artist: (source or WikipediaSource()).fetch(artist)})
+    return info.drop(columns=['artist']).iloc[0].to_dict()
+
+
+def get_freddie_mercury_info(source=None):
+    page = (source or WikipediaSource()).fetch("Freddie Mercury")
+    if page is None:
+        raise Exception("No Wikipedia page found for Freddie Mercury")
+    info = extract_artist_info({"Freddie Mercury": page}).iloc[0]
 
     # Extract sexual orientation - look for keywords in the content
+    content_lower = page['content'].lower()
     sexual_orientation = "Not explicitly stated"
-    sexual_keywords = ["gay", "homosexual", "bisexual", "queer", "partner", "relationship"]
-    content_lower = content.lower()
-    for keyword in sexual_keywords:
-        if keyword in content_lower:
-            sexual_orientation = "Gay"  # For Freddie Mercury specifically, known as gay
-            break
-
-    # Extract years active
-    # Look for pattern like "Years active 1969–1991" in content or summary
-    years_active = None
-    years_active_match = re.search(r'Years active\s*:? (\d{4})\s*[\–-]\s*(\d{4})', content, re.IGNORECASE)
-    if years_active_match:
-        start_year = int(years_active_match.group(1))
-        end_year = int(years_active_match.group(2))
-        years_active = end_year - start_year
-    else:
-        # fallback: use birth and death years to estimate active years roughly
-        try:
-            birth_year = datetime.strptime(birth_date, "%B %d, %Y").year if birth_date else None
-            # Get death date if available
-            death_date_match = re.search(r'died\s([A-Za-z]+\s\d{1,2},\s\d{4})', content)
-            if death_date_match:
-                death_year = datetime.strptime(death_date_match.group(1), "%B %d, %Y").year
-            else:
-                death_year = datetime.now().year
-            if birth_year:
-                # assume career started roughly at age 20
-                years_active = death_year - (birth_year + 20)
-        except Exception:
-            years_active = None
-
-    # Extract band or solo info - check if 'Queen' is mentioned
-    band_info = "Solo performer"
-    if "queen" in content_lower:
-        band_info = "Lead vocalist of the band Queen"
+    if any(keyword in content_lower for keyword in SEXUAL_KEYWORDS):
+        sexual_orientation = "Gay"  # For Freddie Mercury specifically, known as gay
 
     return {
-        "birth_date": birth_date,
+        "birth_date": info['birth_date'],
         "sexual_orientation": sexual_orientation,
-        "years_active": years_active,
-        "band_info": band_info
+        "years_active": None if pd.isna(info['years_active']) else int(info['years_active']),
+        "band_info": info['band_info'],
     }
 
 
+def enrich_artists(merged_csv='datasets/final_merged.csv', output_csv='datasets/artist_info.csv',
+                   source=None, workers=8, cache_dir=CACHE_DIR):
+    artists = pd.read_csv(merged_csv, usecols=['artist'])['artist'].dropna().unique().tolist()
+    source = CachedSource(source or WikipediaSource(), cache_dir=cache_dir)
+
+    print(f"🎤 Enriching {len(artists)} artists...")
+    start = time.perf_counter()
+    pages = fetch_pages(artists, source, workers=workers)
+    info = extract_artist_info(pages)
+    info.to_csv(output_csv, index=False)
+
+    found = sum(page is not None for page in pages.values())
+    print(f"✅ {found}/{len(artists)} artist pages, {source.requests} requests, "
+          f"{time.perf_counter() - start:.1f}s - saved to {output_csv}")
+    return info
+
+
 if __name__ == "__main__":
-    info = get_freddie_mercury_info()
-    print("Freddie Mercury Info:")
-    for key, value in info.items():
-        print(f"{key}: {value}")
+    enrich_artists()
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+
+from create_data_set_code.audio_extraction import Progress
+
+MANIFEST_NAME = 'download_manifest.json'
+CHUNK_SIZE = 1 << 16
+
+
+def sha256_of(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# --- Fetch backends: fetch(source_url, target_stem) -> path of the finished file ---
+
+class YoutubeDLBackend:
+    """Downloads the best audio stream and converts it to mp3. youtube_dl resumes its own .part files."""
+
+    def __init__(self, quality='320'):
+        self.quality = quality
+
+    def fetch(self, source_url, target_stem):
+        import youtube_dl
+
+        ydl_opts = {
+            'outtmpl': target_stem + '.%(ext)s',
+            'format': 'bestaudio/best',
+            'postprocessors': [{
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': 'mp3',
+                'preferredquality': self.quality,
+            }],
+            'continuedl': True,
+            'quiet': True,
+            'nocheckcertificate': True,  # NOT recommended unless necessary
+        }
+        with youtube_dl.YoutubeDL(ydl_opts) as ydl:
+            ydl.download([source_url])
+        return target_stem + '.mp3'
+
+
+class HTTPBackend:
+    """Plain HTTP(S) download that resumes a partial .part file with a Range request."""
+
+    def __init__(self, extension='.mp3', timeout=60):
+        import requests
+
+        self.session = requests.Session()
+        self.extension = extension
+        self.timeout = timeout
+
+    def fetch(self, source_url, target_stem):
+        target = target_stem + self.extension
+        part = target + '.part'
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+        with self.session.get(source_url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 416:  # the .part file is already complete
+                os.replace(part, target)
+                return target
+            response.raise_for_status()
+            # A server ignoring Range sends the whole file again
+            mode = 'ab' if response.status_code == 206 else 'wb'
+            with open(part, mode) as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+        os.replace(part, target)
+        return target
+
+
+class LocalFileBackend:
+    """Copies file:// URLs or plain paths - lets tests and benchmarks run offline."""
+
+    def __init__(self, extension='.mp3'):
+        self.extension = extension
+
+    def fetch(self, source_url, target_stem):
+        parts = urlsplit(source_url)
+        source = url2pathname(parts.path) if parts.scheme == 'file' else source_url
+        target = target_stem + self.extension
+        part = target + '.part'
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        with open(source, 'rb') as src, open(part, 'ab' if offset else 'wb') as dst:
+            src.seek(offset)
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        os.replace(part, target)
+        return target
+
+
+class DownloadManifest:
+    """{source_url: {"target", "size", "sha256"}} for every finished download."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def is_complete(self, source_url, target):
+        # Decided from the manifest alone - no filesystem access for finished downloads
+        entry = self.entries.get(source_url)
+        return entry is not None and entry['target'] == target
+
+    def record(self, source_url, target, save=True):
+        entry = {'target': target, 'size': os.path.getsize(target), 'sha256': sha256_of(target)}
+        with self.lock:
+            self.entries[source_url] = entry
+            if save:
+                self._save()
+        return entry
+
+    def save(self):
+        with self.lock:
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def verify(self, source_url):
+        """Re-check a recorded download against its size and checksum."""
+        entry = self.entries.get(source_url)
+        return (
+            entry is not None
+            and os.path.exists(entry['target'])
+            and os.path.getsize(entry['target']) == entry['size']
+            and sha256_of(entry['target']) == entry['sha256']
+        )
+
+
+def download_all(jobs, manifest_path, backend=None, workers=4, extension='.mp3', report=print):
+    """
+    Download every (source_url, target_stem) job with a pool of `workers` threads.
+    Jobs already recorded in the manifest are skipped. Returns a stats dict.
+    """
+    backend = backend or YoutubeDLBackend()
+    manifest = DownloadManifest(manifest_path)
+    todo = []
+    adopted = 0
+    for url, stem in jobs:
+        if manifest.is_complete(url, stem + extension):
+            continue
+        if os.path.exists(stem + extension):
+            # Downloaded before the manifest existed - adopt it instead of fetching again
+            manifest.record(url, stem + extension, save=False)
+            adopted += 1
+            continue
+        todo.append((url, stem))
+    if adopted:
+        manifest.save()
+    report(f"{len(todo)} files to download ({len(jobs) - len(todo)} already complete)")
+
+    stats = {'downloaded': 0, 'failed': 0, 'bytes': 0, 'seconds': 0.0}
+    if not todo:
+        return stats
+
+    def fetch(url, stem):
+        os.makedirs(os.path.dirname(stem) or '.', exist_ok=True)
+        return backend.fetch(url, stem)
+
+    progress = Progress(len(todo), report)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(fetch, url, stem): url for url, stem in todo}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                target = future.result()
+                entry = manifest.record(url, target)
+                stats['downloaded'] += 1
+                stats['bytes'] += entry['size']
+                progress.update(os.path.basename(target), True)
+            except Exception as e:
+                stats['failed'] += 1
+                progress.update(f"{url}: {e}", False)
+    stats['seconds'] = time.perf_counter() - start
+    return stats
@@ -0,0 +1,147 @@
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+EXTRACTOR = 'streaming_extractor_music'
+MANIFEST_NAME = 'extraction_manifest.json'
+# Extractor output while it is being written; renamed to the .json output once it succeeded
+PARTIAL_SUFFIX = '.partial.json'
+
+
+class Manifest:
+    """
+    JSON record of finished extractions, rewritten after every file so an interrupted
+    run can resume: {"completed": {mp3: {...}}, "failed": {mp3: {...}}}.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.completed = {}
+        self.failed = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.completed = data.get('completed', {})
+            self.failed = data.get('failed', {})
+
+    def mark_completed(self, mp3, output, seconds, attempts):
+        with self.lock:
+            self.failed.pop(mp3, None)
+            self.completed[mp3] = {'output': output, 'seconds': round(seconds, 2), 'attempts': attempts}
+            self._save()
+
+    def mark_failed(self, mp3, error, attempts):
+        with self.lock:
+            self.failed[mp3] = {'error': error, 'attempts': attempts}
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'completed': self.completed, 'failed': self.failed}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class Progress:
+    """Thread-safe throughput / ETA reporting."""
+
+    def __init__(self, total, report=print):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.start = time.perf_counter()
+        self.lock = threading.Lock()
+        self.report = report
+
+    def update(self, name, ok):
+        with self.lock:
+            self.done += 1
+            self.failed += not ok
+            elapsed = time.perf_counter() - self.start
+            rate = self.done / elapsed if elapsed else 0.0
+            eta = (self.total - self.done) / rate if rate else float('inf')
+            status = 'ok' if ok else 'FAILED'
+            self.report(f"[{self.done}/{self.total}] {status} {name} - "
+                        f"{rate * 60:.1f} files/min, ETA {eta / 60:.1f} min")
+
+
+def output_path_for(mp3):
+    return os.path.splitext(mp3)[0] + '.json'
+
+
+def partial_path_for(mp3):
+    # Same extension as the output, the extractor picks its output format from it
+    return os.path.splitext(mp3)[0] + PARTIAL_SUFFIX
+
+
+def extract_one(mp3, extractor=EXTRACTOR, timeout=600, retries=2):
+    """Run the extractor on one file, retrying crashes and timeouts. Returns (ok, error, attempts, seconds)."""
+    output = output_path_for(mp3)
+    partial = partial_path_for(mp3)
+    error = None
+    start = time.perf_counter()
+    for attempt in range(1, retries + 2):
+        try:
+            # Written under a temporary name: only a finished extraction ever appears as the output
+            result = subprocess.run(
+                [extractor, mp3, partial],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            error = f'timed out after {timeout}s'
+            continue
+        if result.returncode == 0 and os.path.exists(partial):
+            os.replace(partial, output)
+            return True, None, attempt, time.perf_counter() - start
+        stderr = result.stderr.decode('utf-8', 'replace').strip().splitlines()
+        error = f'exit code {result.returncode}' + (f': {stderr[-1]}' if stderr else '')
+
+    if os.path.exists(partial):
+        os.remove(partial)
+    return False, error, retries + 1, time.perf_counter() - start
+
+
+def run_extractions(files, manifest_path, extractor=EXTRACTOR, workers=None, timeout=600, retries=2,
+                    retry_failed=False, report=print):
+    """
+    Extract features from every mp3 in `files` with up to `workers` extractor processes at once
+    (default: CPU count). Files the manifest records as completed whose output is still there
+    (and failed ones, unless retry_failed) are skipped. Returns the Manifest.
+    """
+    manifest = Manifest(manifest_path)
+    todo = []
+    for mp3 in files:
+        # Only the manifest says an extraction finished; an output it doesn't know about may be partial
+        if mp3 in manifest.completed and os.path.exists(output_path_for(mp3)):
+            continue
+        if mp3 in manifest.failed and not retry_failed:
+            continue
+        todo.append(mp3)
+
+    skipped = len(files) - len(todo)
+    report(f"{len(todo)} files to extract ({skipped} already done or failed before)")
+    if not todo:
+        return manifest
+
+    progress = Progress(len(todo), report)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        # Each thread only waits on its own extractor subprocess
+        futures = {executor.submit(extract_one, mp3, extractor, timeout, retries): mp3 for mp3 in todo}
+        for future in as_completed(futures):
+            mp3 = futures[future]
+            ok, error, attempts, seconds = future.result()
+            if ok:
+                manifest.mark_completed(mp3, output_path_for(mp3), seconds, attempts)
+            else:
+                manifest.mark_failed(mp3, error, attempts)
+            progress.update(os.path.basename(mp3), ok)
+
+    report(f"Finished: {progress.done - progress.failed} extracted, {progress.failed} failed")
+    return manifest
@@ -0,0 +1,115 @@
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from create_data_set_code.audio_extraction import PARTIAL_SUFFIX
+
+COLUMNS = ["year", "country", "song", "performer", "tempo", "danceability", "energy", "loudness", "spectral_centroid"]
+
+# (output column, Essentia section, key) - the values taken from each Essentia JSON
+FIELDS = [
+    ("tempo", "rhythm", "bpm"),
+    ("danceability", "rhythm", "danceability"),
+    ("energy", "lowlevel", "average_loudness"),
+    ("loudness", "lowlevel", "average_loudness"),
+    ("spectral_centroid", "lowlevel", "spectral_centroid"),
+]
+
+
+def read_fields(path):
+    """The FIELDS values of an Essentia output JSON (None where a section or key is missing)."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {column: (data.get(section) or {}).get(key) for column, section, key in FIELDS}
+
+
+def row_from_path(jf):
+    # Extract year and country from path or filename: audio/2023/country_song_performer.json
+    parts = jf.split(os.sep)
+    year = parts[1] if len(parts) > 1 else None
+
+    filename = os.path.splitext(os.path.basename(jf))[0]
+    parts_name = filename.split('_')
+    return {
+        "year": int(year) if year and year.isdigit() else None,
+        "country": parts_name[0] if len(parts_name) > 0 else None,
+        "song": parts_name[1] if len(parts_name) > 1 else None,
+        "performer": parts_name[2] if len(parts_name) > 2 else None,
+    }
+
+
+def parse_file(jf):
+    """Worker: (path, row or None, error or None)."""
+    try:
+        row = row_from_path(jf)
+        row.update(read_fields(jf))
+        return jf, row, None
+    except Exception as e:
+        return jf, None, str(e)
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def ingest(json_files, output_csv, manifest_path, workers=None, report=print):
+    """
+    Bring output_csv up to date with json_files. The manifest remembers the (mtime, size)
+    and extracted row of every ingested file, so only new or changed files are parsed
+    (across a process pool). New rows are appended; changed or deleted files rewrite the CSV.
+    Returns the full table as a DataFrame.
+    """
+    manifest = load_manifest(manifest_path)
+    stats = {jf: os.stat(jf) for jf in json_files}
+
+    todo = [
+        jf for jf, st in stats.items()
+        if jf not in manifest or manifest[jf]["mtime"] != st.st_mtime or manifest[jf]["size"] != st.st_size
+    ]
+    changed = [jf for jf in todo if jf in manifest]
+    removed = [jf for jf in manifest if jf not in stats]
+
+    new_rows = []
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for jf, row, error in executor.map(parse_file, todo, chunksize=16):
+                if error:
+                    report(f"Failed to parse {jf}: {error}")
+                    manifest.pop(jf, None)
+                    continue
+                manifest[jf] = {"mtime": stats[jf].st_mtime, "size": stats[jf].st_size, "row": row}
+                if jf not in changed:
+                    new_rows.append(row)
+    for jf in removed:
+        del manifest[jf]
+
+    rows = [entry["row"] for entry in manifest.values()]
+    if changed or removed or not os.path.exists(output_csv):
+        pd.DataFrame(rows, columns=COLUMNS).to_csv(output_csv, index=False)
+    elif new_rows:
+        pd.DataFrame(new_rows, columns=COLUMNS).to_csv(output_csv, mode="a", header=False, index=False)
+
+    if todo or removed:
+        save_manifest(manifest, manifest_path)
+    report(f"{len(todo) - len(changed)} new, {len(changed)} changed, {len(removed)} removed, "
+           f"{len(stats) - len(todo)} unchanged JSON files")
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def find_json_files(audio_dir="audio"):
+    # Manifests and outputs of extractions still running (or killed mid-write) aren't features
+    return sorted(f for f in glob.glob(os.path.join(audio_dir, "**", "*.json"), recursive=True)
+                  if not os.path.basename(f).endswith(("manifest.json", PARTIAL_SUFFIX)))
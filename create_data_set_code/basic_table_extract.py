@@ -1,37 +1,24 @@
-import json
 import pandas as pd
 
-def load_json_file(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+from create_data_set_code.contest_model import load_contests
 
 def extract_data_for_excel(eurovision_data):
     rows = []
     for contest in eurovision_data:
-        year = contest.get('year')
-        contestants = {c['id']: c for c in contest.get('contestants', [])}
-        rounds = contest.get('rounds', [])
-        final_round = next((r for r in rounds if r['name'].lower() == 'final'), None)
-
-        performances = {}
-        if final_round:
-            for perf in final_round.get('performances', []):
-                performances[perf['contestantId']] = perf
-
-        for contestant_id, contestant in contestants.items():
-            perf = performances.get(contestant_id, {})
+        for contestant in contest.by_id.values():
+            perf = contest.final_performance(contestant.id)
             rows.append({
-                'Year': year,
-                'Country': contestant.get('country'),
-                'Artist': contestant.get('artist'),
-                'Song': contestant.get('song'),
-                'Running Order': perf.get('running'),
-                'Place': perf.get('place'),
-                'Points': next((s['points'] for s in perf.get('scores', []) if s['name'] == 'total'), None),
-                'Dances': perf.get('dances'),
-                'Tone': contestant.get('tone'),
-                'BPM': contestant.get('bpm'),
-                'Stage Director': contestant.get('stageDirector'),
+                'Year': contest.year,
+                'Country': contestant.country,
+                'Artist': contestant.artist,
+                'Song': contestant.song,
+                'Running Order': perf.running if perf else None,
+                'Place': perf.place if perf else None,
+                'Points': perf.points if perf else None,
+                'Dances': perf.dances if perf else None,
+                'Tone': contestant.tone,
+                'BPM': contestant.bpm,
+                'Stage Director': contestant.stage_director,
             })
     return rows
 
@@ -41,6 +28,6 @@ def save_to_excel(data, filename):
     print(f"Saved data to {filename}")
 
 if __name__ == '__main__':
-    eurovision_data = load_json_file('../basic_datasets/eurovision.json')
+    eurovision_data = load_contests('../basic_datasets/eurovision.json', lyrics='none', final_only=True)
     data_rows = extract_data_for_excel(eurovision_data)
     save_to_excel(data_rows, 'eurovision_data.xlsx')
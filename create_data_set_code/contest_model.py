@@ -0,0 +1,148 @@
+from create_data_set_code.contest_reader import EUROVISION_JSON, iter_contests
+
+# Rounds named like this are national selections held before the contest, not contest rounds
+SELECTION_ROUND = 'national-selection'
+
+
+class Performance:
+    """One entry's performance in one round; `scores` maps score name ('total', 'jury', ...) to points."""
+
+    __slots__ = ('contestant_id', 'running', 'place', 'dances', 'scores')
+
+    def __init__(self, contestant_id, running=None, place=None, dances=None, scores=None):
+        self.contestant_id = contestant_id
+        self.running = running
+        self.place = place
+        self.dances = dances
+        self.scores = scores or {}
+
+    @classmethod
+    def from_dict(cls, perf):
+        scores = {s['name']: s.get('points') for s in perf.get('scores', [])}
+        return cls(perf['contestantId'], perf.get('running'), perf.get('place'), perf.get('dances'), scores)
+
+    @property
+    def points(self):
+        return self.scores.get('total')
+
+
+class Round:
+    __slots__ = ('name', 'performances', 'by_contestant')
+
+    def __init__(self, name, performances):
+        self.name = name
+        self.performances = performances
+        self.by_contestant = {p.contestant_id: p for p in performances}
+
+    @classmethod
+    def from_dict(cls, rnd):
+        return cls(rnd.get('name', '').lower(), [Performance.from_dict(p) for p in rnd.get('performances', [])])
+
+    def __contains__(self, contestant_id):
+        return contestant_id in self.by_contestant
+
+
+class Contestant:
+    """An entry of a contest. `lyrics` is kept as in eurovision.json (a list of {languages, content})."""
+
+    __slots__ = ('id', 'country', 'artist', 'song', 'bpm', 'tone', 'stage_director', 'lyrics')
+
+    def __init__(self, id, country=None, artist=None, song=None, bpm=None, tone=None, stage_director=None,
+                 lyrics=None):
+        self.id = id
+        self.country = country
+        self.artist = artist
+        self.song = song
+        self.bpm = bpm
+        self.tone = tone
+        self.stage_director = stage_director
+        self.lyrics = lyrics or []
+
+    @classmethod
+    def from_dict(cls, contestant):
+        return cls(
+            contestant['id'],
+            contestant.get('country'),
+            contestant.get('artist'),
+            contestant.get('song'),
+            contestant.get('bpm'),
+            contestant.get('tone'),
+            contestant.get('stageDirector'),
+            contestant.get('lyrics'),
+        )
+
+    @property
+    def languages(self):
+        """Languages of the first (original) lyrics version."""
+        return self.lyrics[0].get('languages', []) if self.lyrics else []
+
+    @property
+    def english_lyrics(self):
+        """The first lyrics version that is (partly) in English, or None."""
+        return next((lyr for lyr in self.lyrics if 'English' in lyr.get('languages', [])), None)
+
+
+class Contest:
+    """
+    One year of eurovision.json with the indexes every consumer needs built once:
+    contestant by id, round by (lower-case) name, the final's performances in place order
+    and the entries that took part in the contest but didn't reach the final.
+    """
+
+    __slots__ = ('year', 'contestants', 'by_id', 'rounds', 'by_name', 'final', 'finalists', 'entrants',
+                 'selection_only', 'semi_only')
+
+    def __init__(self, year, contestants, rounds):
+        self.year = year
+        self.contestants = contestants
+        self.by_id = {c.id: c for c in contestants}
+        self.rounds = rounds
+        self.by_name = {r.name: r for r in rounds}
+        self.final = self.by_name.get('final')
+
+        final = self.final.by_contestant if self.final else {}
+        # Finalists without a place (disqualified, not ranked) are left out of the order
+        self.finalists = sorted((p for p in final.values() if p.place), key=lambda p: p.place)
+        # Songs that lost a national selection never entered the contest, so they aren't semi-only
+        self.entrants, selected = set(), set()
+        for rnd in rounds:
+            (selected if rnd.name.startswith(SELECTION_ROUND) else self.entrants).update(rnd.by_contestant)
+        self.selection_only = selected - self.entrants
+        self.semi_only = [c for c in contestants if c.id not in final and c.id not in self.selection_only]
+
+    @classmethod
+    def from_dict(cls, contest):
+        return cls(
+            contest.get('year'),
+            [Contestant.from_dict(c) for c in contest.get('contestants', [])],
+            [Round.from_dict(r) for r in contest.get('rounds', [])],
+        )
+
+    def round(self, name):
+        return self.by_name.get(name.lower())
+
+    def final_performance(self, contestant_id):
+        return self.final.by_contestant.get(contestant_id) if self.final else None
+
+    @property
+    def winner(self):
+        """(contestant, performance) of the winning entry, or None."""
+        if not self.finalists or self.finalists[0].place != 1:
+            return None
+        performance = self.finalists[0]
+        contestant = self.by_id.get(performance.contestant_id)
+        return (contestant, performance) if contestant else None
+
+    def round_reached(self, contestant_id):
+        """'final', 'semifinal' (any other contest round), 'selection' (a national selection only) or 'none'."""
+        if self.final and contestant_id in self.final:
+            return 'final'
+        if contestant_id in self.entrants:
+            return 'semifinal'
+        return 'selection' if contestant_id in self.selection_only else 'none'
+
+
+def load_contests(path=EUROVISION_JSON, lyrics='full', final_only=False):
+    """Stream eurovision.json as Contest objects (see iter_contests for `lyrics` / `final_only`)."""
+    for contest in iter_contests(path, lyrics=lyrics, final_only=final_only):
+        yield Contest.from_dict(contest)
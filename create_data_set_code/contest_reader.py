@@ -0,0 +1,74 @@
+import json
+
+EUROVISION_JSON = '../basic_datasets/eurovision.json'
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+def _project(contest, lyrics, final_only):
+    if lyrics != 'full':
+        for contestant in contest.get('contestants', []):
+            if lyrics == 'none':
+                contestant.pop('lyrics', None)
+            else:
+                # 'meta' keeps languages etc. but drops the (large) lyrics text
+                for lyr in contestant.get('lyrics', []):
+                    lyr.pop('content', None)
+
+    if final_only:
+        contest['rounds'] = [r for r in contest.get('rounds', []) if r.get('name', '').lower() == 'final']
+
+    return contest
+
+
+def iter_contests(path=EUROVISION_JSON, lyrics='full', final_only=False, chunk_size=1 << 16):
+    """
+    Yield the contests of eurovision.json one at a time while the file is being read,
+    so only one contest (plus a read buffer) is held in memory.
+
+    lyrics: 'full' keeps everything, 'meta' drops the lyrics text but keeps languages,
+            'none' drops the lyrics entries entirely.
+    final_only: keep only the final round in contest['rounds'].
+    """
+    if lyrics not in ('full', 'meta', 'none'):
+        raise ValueError(f"lyrics must be 'full', 'meta' or 'none', not {lyrics!r}")
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+        started = False
+
+        while True:
+            # Skip whitespace and the array punctuation between contests
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE + (',' if started else '['):
+                if buffer[pos] == '[':
+                    started = True
+                pos += 1
+
+            if pos < len(buffer) and not started:
+                raise ValueError(f"{path} does not contain a JSON array of contests")
+            if pos < len(buffer) and buffer[pos] == ']':
+                return
+
+            if pos < len(buffer):
+                try:
+                    contest, end = _decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    contest = None
+                if contest is not None:
+                    pos = end
+                    yield _project(contest, lyrics, final_only)
+                    continue
+            elif eof:
+                raise ValueError(f"{path} ended before the contest array was closed")
+
+            # Need more text: drop what was consumed and read the next chunk.
+            # Grow the chunk when a single contest is larger than the buffer.
+            chunk = f.read(max(chunk_size, len(buffer) - pos))
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
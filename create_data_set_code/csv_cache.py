@@ -0,0 +1,143 @@
+import glob
+import hashlib
+import os
+
+import pandas as pd
+
+from create_data_set_code.tracing import traced
+
+# Typed schema per source CSV. Each column group is stored in its own parquet file,
+# so loading the scalar columns never touches the (large) lyrics text.
+SCHEMAS = {
+    "contestants.csv": {
+        "dtypes": {
+            "year": "int16",
+            "to_country_id": "category",
+            "to_country": "category",
+            "place_contest": "Int16",
+            "sf_num": "Int8",
+            "running_final": "Int16",
+            "running_sf": "Int16",
+            "place_final": "Int16",
+            "points_final": "Int32",
+            "place_sf": "Int16",
+            "points_sf": "Int32",
+            "points_tele_final": "Int32",
+            "points_jury_final": "Int32",
+            "points_tele_sf": "Int32",
+            "points_jury_sf": "Int32",
+        },
+        "groups": {"lyrics": ["lyrics"]},
+    },
+    "votes.csv": {
+        "dtypes": {
+            "year": "int16",
+            "round": "category",
+            "from_country_id": "category",
+            "to_country_id": "category",
+            "from_country": "category",
+            "to_country": "category",
+            "total_points": "Int16",
+            "tele_points": "Int16",
+            "jury_points": "Int16",
+        },
+        "groups": {},
+    },
+    # Entry tables: the lyrics go to their own group, the votes live in eurovision_votes.csv
+    "eurovision_dataset_1.csv": {
+        "dtypes": {"entry_id": "int32", "year": "int16"},
+        "groups": {"lyrics": ["lyrics"]},
+    },
+    "final_merged.csv": {
+        "dtypes": {"entry_id": "Int32", "year": "int16"},
+        "groups": {"lyrics": ["lyrics"]},
+    },
+    "eurovision_votes.csv": {
+        "dtypes": {"entry_id": "int32", "voter_id": "category", "kind": "category", "points": "Int16"},
+        "groups": {},
+    },
+}
+
+MAIN_GROUP = "main"
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def cache_dir_for(csv_path):
+    return os.path.join(os.path.dirname(csv_path) or ".", ".cache")
+
+
+def _group_path(csv_path, content_hash, group):
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir_for(csv_path), f"{name}.{content_hash}.{group}.parquet")
+
+
+def _write_parquet(df, path):
+    # Written under a temporary name and renamed, so an interrupted build never leaves a
+    # truncated group behind (the pid keeps stages converting the same CSV apart)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _schema(csv_path):
+    return SCHEMAS.get(os.path.basename(csv_path), {"dtypes": {}, "groups": {}})
+
+
+def build_cache(csv_path, content_hash=None):
+    """Parse the CSV once into typed parquet column groups and remove stale caches of it."""
+    content_hash = content_hash or file_hash(csv_path)
+    schema = _schema(csv_path)
+
+    df = pd.read_csv(csv_path)
+    df = df.astype({col: dtype for col, dtype in schema["dtypes"].items() if col in df.columns})
+
+    os.makedirs(cache_dir_for(csv_path), exist_ok=True)
+    grouped = set()
+    for group, columns in schema["groups"].items():
+        columns = [c for c in columns if c in df.columns]
+        _write_parquet(df[columns], _group_path(csv_path, content_hash, group))
+        grouped.update(columns)
+    # The main group is written last: load_csv takes its presence to mean the cache is complete
+    main_columns = [c for c in df.columns if c not in grouped]
+    _write_parquet(df[main_columns], _group_path(csv_path, content_hash, MAIN_GROUP))
+
+    # Any cache built from an older version of the CSV is now invalid
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    for old in glob.glob(os.path.join(cache_dir_for(csv_path), f"{name}.*.parquet")):
+        if f".{content_hash}." not in old:
+            os.remove(old)
+    return content_hash
+
+
+@traced()
+def load_csv(csv_path, columns=None):
+    """
+    Drop-in replacement for pd.read_csv(csv_path) backed by the typed columnar cache.
+    Only the column groups holding `columns` are read (all columns when None).
+    The cache is rebuilt automatically whenever the CSV's content changes.
+    """
+    content_hash = file_hash(csv_path)
+    if not os.path.exists(_group_path(csv_path, content_hash, MAIN_GROUP)):
+        build_cache(csv_path, content_hash)
+
+    groups = _schema(csv_path)["groups"]
+    # Keep the CSV's own column order when everything is requested
+    wanted = list(pd.read_csv(csv_path, nrows=0).columns) if columns is None else list(columns)
+
+    frames = []
+    main_columns = [c for c in wanted if not any(c in cols for cols in groups.values())]
+    if main_columns:
+        frames.append(pd.read_parquet(_group_path(csv_path, content_hash, MAIN_GROUP), columns=main_columns))
+    for group, group_columns in groups.items():
+        selected = [c for c in group_columns if c in wanted]
+        if selected:
+            frames.append(pd.read_parquet(_group_path(csv_path, content_hash, group), columns=selected))
+
+    return pd.concat(frames, axis=1)[wanted]
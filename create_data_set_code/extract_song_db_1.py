@@ -1,23 +1,20 @@
 import os
-from selenium import webdriver
-from selenium.webdriver.safari.options import Options
 from bs4 import BeautifulSoup
+import numpy as np
 import pandas as pd
-import time
 
-def get_score(year):
-    url = "https://eurovisionworld.com/eurovision/" + year
-
-    options = Options()
-    options.headless = True
-
-    driver = webdriver.Safari(options=options)
-    driver.get(url)
+from create_data_set_code.csv_cache import load_csv
+from create_data_set_code.scoreboard_scraper import ScoreboardScraper
+from create_data_set_code.tracing import span, traced
+from create_data_set_code.vocabulary import load_registry
+from create_data_set_code.vote_store import ANY_VOTER, ENTRY_ID, VOTES_CSV, votes_frame
+from create_data_set_code.vote_tensor import VoteTensor
 
-    time.sleep(3)  # wait for JS
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    driver.quit()
+def parse_scoreboard(html, countries=None):
+    # Voter codes and entry names are resolved through the shared country registry
+    countries = countries or load_registry().countries
+    soup = BeautifulSoup(html, "html.parser")
 
     table = soup.find("table", class_="scoreboard_table")
     if not table:
@@ -30,68 +27,136 @@ def get_score(year):
     df.rename(columns={df.columns[0]: "Country"}, inplace=True)
     df.rename(columns={df.columns[1]: "total_judge_points"}, inplace=True)
 
-    # Country code to full name mapping (add more as needed)
-    country_map = {
-        "al": "Albania",
-        "at": "Austria",
-        "am": "Armenia",
-        "az": "Azerbaijan",
-        "by": "Belarus",
-        "be": "Belgium",
-        "ba": "Bosnia & Herzegovina",
-        "bg": "Bulgaria",
-        "hr": "Croatia",
-        "cy": "Cyprus",
-        "cz": "Czech Republic",
-        "dk": "Denmark",
-        "ee": "Estonia",
-        "fi": "Finland",
-        "fr": "France",
-        "ge": "Georgia",
-        "de": "Germany",
-        "gr": "Greece",
-        "hu": "Hungary",
-        "is": "Iceland",
-        "ie": "Ireland",
-        "il": "Israel",
-        "it": "Italy",
-        "lv": "Latvia",
-        "lt": "Lithuania",
-        "lu": "Luxembourg",
-        "mt": "Malta",
-        "md": "Moldova",
-        "me": "Montenegro",
-        "nl": "Netherlands",
-        "no": "Norway",
-        "pl": "Poland",
-        "pt": "Portugal",
-        "ro": "Romania",
-        "ru": "Russia",
-        "rs": "Serbia",
-        "sk": "Slovakia",
-        "si": "Slovenia",
-        "es": "Spain",
-        "se": "Sweden",
-        "ch": "Switzerland",
-        "ua": "Ukraine",
-        "gb": "United Kingdom",
-        # Add any missing codes if needed
-    }
-
     # Extract header <td> elements with voting countries (skip first 4 columns and last empty one)
     header_tds = table.find("thead").find("tr").find_all("td")[1:-1]
 
     country_codes = [td.get("data-from") for td in header_tds]
-    columns = [country_map.get(code, code) for code in country_codes if country_codes]
+    columns = [countries.name(code) for code in country_codes if country_codes]
 
     for i in range(len(columns)):
         df.rename(columns={df.columns[i+2]: columns[i]+" Jury"}, inplace=True)
 
     df.fillna(0, inplace=True)
+    df["Country"] = countries.canonical(df["Country"])
 
     return df
 
 
+def get_score(year):
+    with ScoreboardScraper(workers=1) as scraper:
+        html = scraper.fetch_years([year])[year]
+    if isinstance(html, Exception):
+        raise html
+    return parse_scoreboard(html)
+
+
+@traced()
+def scoreboards_to_long(scoreboards):
+    """Reshape {year: scoreboard df} into one (year, to_country, voter, points, total_judge_points) table."""
+    frames = []
+    for year, year_df in scoreboards.items():
+        long_df = year_df.melt(
+            id_vars=["Country", "total_judge_points"],
+            var_name="voter",
+            value_name="points"
+        )
+        if long_df.empty:
+            # No voter columns: keep one row per entry so its total is still applied
+            long_df = year_df[["Country", "total_judge_points"]].assign(voter=None, points=float("nan"))
+        long_df["year"] = int(year)
+        frames.append(long_df)
+
+    columns = ["year", "to_country", "voter", "points", "total_judge_points"]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True).rename(columns={"Country": "to_country"})[columns]
+
+
+@traced()
+def apply_jury_scores(df, long_scores):
+    """
+    Write scraped jury scores into df in one keyed update on (year, to_country).
+    Totals go to points_jury_final / points_final, each voter's points to its "<Country> Jury" column.
+    """
+    df = df.copy()
+    keys = ["year", "to_country"]
+    totals = _jury_totals(long_scores)
+
+    # Later rows win, same as assigning the scoreboard row by row
+    voter_scores = long_scores[long_scores["voter"].isin(df.columns)]
+    voter_points = (
+        voter_scores.drop_duplicates(subset=keys + ["voter"], keep="last")
+        .pivot(index=keys, columns="voter", values="points")
+        .reindex(totals.index)
+    )
+    voter_points["points_jury_final"] = totals
+    voter_points["points_final"] = totals
+
+    # Align the scores with df's rows; rows without a scoreboard entry stay NaN and are left untouched
+    updates = voter_points.reindex(pd.MultiIndex.from_frame(df[keys].astype({"year": int})))
+    updates.index = df.index
+    df.update(updates)
+    return df
+
+
+def _jury_totals(long_scores):
+    # Every scoreboard row sets the totals, even when none of its voters has a column in df
+    keys = ["year", "to_country"]
+    return long_scores.drop_duplicates(subset=keys, keep="last").set_index(keys)["total_judge_points"]
+
+
+@traced()
+def apply_jury_totals(df, long_scores):
+    """The scraped jury totals of apply_jury_scores alone, for a table without the voter columns."""
+    df = df.copy()
+    keys = ["year", "to_country"]
+    totals = _jury_totals(long_scores)
+    updates = pd.DataFrame({"points_jury_final": totals, "points_final": totals})
+    updates = updates.reindex(pd.MultiIndex.from_frame(df[keys].astype({"year": int})))
+    updates.index = df.index
+    df.update(updates)
+    return df
+
+
+@traced()
+def entry_votes(entries, tensor_votes, long_scores, countries):
+    """
+    The long (entry_id, voter_id, kind, points) vote table of the entries, built without the
+    wide block: `tensor_votes` (VoteTensor.long_votes) matched on (year, to_country_id), with
+    the scraped per-voter jury points (scoreboards_to_long) written over them on (year, to_country).
+    An entry that received votes gets an ANY_VOTER row of 0 points per kind in place of its 0 cells,
+    which is what the wide block filled in for the voters that gave it nothing; with_votes
+    rebuilds the block apply_jury_scores wrote from these rows.
+    `entries` holds entry_id, year, to_country_id and to_country.
+    """
+    keys = entries.astype({"year": int, "to_country_id": object, "to_country": object})
+    recorded = keys.merge(tensor_votes.astype({"year": int, "to_country_id": object}),
+                          on=["year", "to_country_id"])
+
+    # Scoreboard voters only count when they have a jury column; later rows win, empty cells don't
+    jury_columns = {f"{name} Jury": name for name in tensor_votes.loc[tensor_votes["kind"] == "jury", "voter"].unique()}
+    scraped = long_scores[long_scores["voter"].isin(jury_columns)]
+    scraped = scraped.drop_duplicates(subset=["year", "to_country", "voter"], keep="last").dropna(subset=["points"])
+    scraped = keys.merge(scraped.astype({"year": int, "to_country": object}), on=["year", "to_country"])
+    scraped = scraped.assign(voter=scraped["voter"].map(jury_columns), kind="jury")
+
+    columns = [ENTRY_ID, "voter", "kind", "points"]
+    votes = pd.concat([recorded[columns], scraped[columns]], ignore_index=True)
+    votes = votes.drop_duplicates(subset=[ENTRY_ID, "voter", "kind"], keep="last")
+
+    voted = recorded[ENTRY_ID].unique()
+    kinds = tensor_votes["kind"].unique()
+    votes = votes[~(votes[ENTRY_ID].isin(voted) & (votes["points"] == 0))]
+    defaults = pd.DataFrame({
+        ENTRY_ID: np.repeat(voted, len(kinds)),
+        "voter": ANY_VOTER,
+        "kind": np.tile(kinds, len(voted)),
+        "points": 0,
+    })
+    votes = pd.concat([votes, defaults], ignore_index=True)
+    return votes_frame(votes[ENTRY_ID], votes["voter"], votes["kind"], votes["points"], countries)
+
+
 def main():
     # Path to your local dataset folder
     dataset_folder = "basic_datasets"
@@ -102,62 +167,20 @@ def main():
     audio_features_file = os.path.join(dataset_folder, "audio_features.csv")
 
     print("📥 Loading datasets from local folder...")
-    contestants = pd.read_csv(contestants_file)
-    votes = pd.read_csv(votes_file)
-
-    # Create mapping from country ID to country name
-    id_to_country = contestants.set_index("to_country_id")["to_country"].to_dict()
-
-    # Map voter country IDs to country names in votes DataFrame
-    votes["from_country_name"] = votes["from_country_id"].map(id_to_country)
-
-    # Filter votes for final round only
-    votes_final = votes[votes["round"].str.lower() == "final"]
-
-    # Separate jury and televote votes, using mapped names for pivot
-    votes_jury = votes_final[votes_final["jury_points"].notna()]
-    votes_jury = votes_jury[["year", "to_country_id", "from_country_name", "jury_points"]].copy()
-    votes_jury.rename(columns={"jury_points": "points", "from_country_name": "from_country"}, inplace=True)
-
-    votes_tv = votes_final[votes_final["tele_points"].notna()]
-    votes_tv = votes_tv[["year", "to_country_id", "from_country_name", "tele_points"]].copy()
-    votes_tv.rename(columns={"tele_points": "points", "from_country_name": "from_country"}, inplace=True)
-
-    # Pivot votes into wide format with voter country names as columns
-    def pivot_votes(df, suffix):
-        p = df.pivot_table(
-            index=["year", "to_country_id"],
-            columns="from_country",
-            values="points",
-            fill_value=0
-        ).reset_index()
-        return p.rename(columns={col: f"{col} {suffix}" for col in p.columns if col not in ["year", "to_country_id"]})
-
-    votes_jury_pivot = pivot_votes(votes_jury, "Jury")
-    votes_tv_pivot = pivot_votes(votes_tv, "Televote")
-
-    # Merge jury and televote votes
-    votes_combined = pd.merge(
-        votes_jury_pivot,
-        votes_tv_pivot,
-        on=["year", "to_country_id"],
-        how="outer"
-    ).fillna(0)
+    contestants = load_csv(contestants_file)
+    votes = VoteTensor.load(votes_file)
 
-    # Filter contestants for entries with a final placement
-    final_songs = contestants[contestants["place_final"].notna()]
-
-    # Merge contestants with votes on year and country id
-    df = pd.merge(
-        final_songs,
-        votes_combined,
-        left_on=["year", "to_country_id"],
-        right_on=["year", "to_country_id"],
-        how="left"
-    )
+    # One display name per country (Czech Republic and Czechia are both shown as Czechia),
+    # kept as registry codes in memory and written out as names
+    registry = load_registry(dataset_folder)
+    registry.encode_frame(contestants, {"to_country": "countries", "performer": "people"})
+    id_to_country = registry.countries.names_by_iso(contestants["to_country_id"].unique())
 
-    # Drop the 'to_country_id' column so the table shows country names only
-    df = df.drop(columns=["to_country_id"])
+    # Final-round jury and televote points, one row per voter country name and kind
+    tensor_votes = votes.long_votes(id_to_country, round="final")
+
+    # Filter contestants for entries with a final placement
+    df = contestants[contestants["place_final"].notna()].reset_index(drop=True)
 
     # Add audio features if available locally
     if os.path.exists(audio_features_file):
@@ -173,6 +196,11 @@ def main():
     else:
         print("⚠️ audio_features.csv not found locally — skipping audio features.")
 
+    # Drop the 'to_country_id' column so the table shows country names only
+    # (each entry's keys keep it, to match the votes)
+    entry_keys = df[["year", "to_country_id", "to_country"]]
+    df = df.drop(columns=["to_country_id"])
+
     # Define main columns to keep and rename for clarity
     main_cols = [
         "year",
@@ -197,15 +225,12 @@ def main():
     if "tempo" in df.columns:
         audio_cols = ["tempo", "danceability", "energy", "loudness", "spectral_centroid"]
 
-    # Voting columns: all except main, audio, and helper columns
-    excluded_cols = set(main_cols + ["year", "country"] + audio_cols)
-    vote_cols = sorted(
-        [col for col in df.columns if col not in excluded_cols],
-        key=lambda x: x.replace(" Jury", "").replace(" Televote", "")
-    )
+    # The other contestant columns: all except main, audio, and helper columns
+    excluded_cols = set(main_cols + ["year", "country", "lyrics"] + audio_cols)
+    other_cols = sorted(col for col in df.columns if col not in excluded_cols)
 
-    # Final column order: song info, audio features, vote columns, then youtube_url
-    columns_to_keep = main_cols + audio_cols + vote_cols + ["lyrics", "youtube_url"]
+    # Final column order: song info, audio features, other columns, then the lyrics
+    columns_to_keep = main_cols + audio_cols + other_cols + ["lyrics"]
 
     df_final = df[columns_to_keep]
 
@@ -218,33 +243,38 @@ def main():
     # We'll copy df_final to avoid modifying original while merging
     df_with_jury_scores = df_final.copy()
 
-    for year in range(1957, 2015 + 1):
-        print(f"Processing year {year}...")
-        try:
-            year_df = get_score(str(year))
-
-            mask_year = df_with_jury_scores["year"] == int(year)  # year as int in df
-
-            for idx, row in year_df.iterrows():
-                country = row["Country"]
-                total_points = row["total_judge_points"]
-
-                mask = mask_year & (df_with_jury_scores["to_country"] == country)
-
-                df_with_jury_scores.loc[mask, "points_jury_final"] = total_points
-                df_with_jury_scores.loc[mask, "points_final"] = total_points
-
-                for voter_country in year_df.columns[2:]:
-                    if voter_country in df_with_jury_scores.columns:
-                        df_with_jury_scores.loc[mask, voter_country] = row[voter_country]
-
-        except Exception as e:
-            print(f"Skipping year {year} due to error: {e}")
+    # Fetch every year's scoreboard at once (cached pages are parsed offline)
+    with ScoreboardScraper() as scraper:
+        pages = scraper.fetch_years(range(1957, 2015 + 1))
+
+    scoreboards = {}
+    with span("song_db_1.parse_scoreboards", pages=len(pages)) as s:
+        for year, html in pages.items():
+            print(f"Processing year {year}...")
+            try:
+                if isinstance(html, Exception):
+                    raise html
+                scoreboards[year] = parse_scoreboard(html, registry.countries)
+            except Exception as e:
+                print(f"Skipping year {year} due to error: {e}")
+        s.set(parsed=len(scoreboards))
+
+    long_scores = scoreboards_to_long(scoreboards)
+    entries = apply_jury_totals(df_with_jury_scores, long_scores)
+    entries.insert(0, ENTRY_ID, np.arange(len(entries)))
+
+    # The per-voter points are mostly empty: they go straight to a long (entry_id, voter_id, kind,
+    # points) table, the entry table keeps the scalar columns (vote_store.with_votes rebuilds the
+    # wide layout)
+    votes_table = entry_votes(entry_keys.assign(**{ENTRY_ID: entries[ENTRY_ID]}), tensor_votes, long_scores,
+                              registry.countries)
 
     # Save the augmented dataframe
     output_augmented = "datasets/eurovision_dataset_1.csv"
-    df_with_jury_scores.to_csv(output_augmented, index=False)
-    print(f"✅ Augmented dataset with jury scores saved to {output_augmented}")
+    with span("song_db_1.write_csv", output=list(entries.shape), votes=len(votes_table)):
+        entries.to_csv(output_augmented, index=False)
+        votes_table.to_csv(VOTES_CSV, index=False)
+    print(f"✅ Augmented dataset with jury scores saved to {output_augmented} (votes in {VOTES_CSV})")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from create_data_set_code.tracing import traced
+from create_data_set_code.vocabulary import normalize_country, normalize_text
+
+
+def _normalized_column(series, column):
+    normalize = normalize_country if column == "country" else normalize_text
+    # Normalize each distinct value once, then broadcast
+    uniques = pd.unique(series)
+    mapping = {value: normalize(value) for value in uniques}
+    return series.map(mapping)
+
+
+def _shared_categories(left, right):
+    return (isinstance(left.dtype, pd.CategoricalDtype) and isinstance(right.dtype, pd.CategoricalDtype)
+            and left.cat.categories.equals(right.cat.categories))
+
+
+def _key_codes(left, right, column):
+    """Integer codes of one key column on both sides, equal wherever the normalized values are."""
+    if _shared_categories(left[column], right[column]):
+        # Same categories on both sides (see Registry.encode_frames): normalize each category
+        # once and map the row codes through them, without touching the row values
+        normalize = normalize_country if column == "country" else normalize_text
+        # The extra last entry stands for code -1, a missing value (normalized to "" as below)
+        categories = [normalize(value) for value in left[column].cat.categories] + [normalize(None)]
+        ids, uniques = pd.factorize(np.array(categories, dtype=object))
+        return ids[left[column].cat.codes.to_numpy()], ids[right[column].cat.codes.to_numpy()], len(uniques)
+    values = pd.concat([
+        _normalized_column(left[column], column),
+        _normalized_column(right[column], column),
+    ], ignore_index=True)
+    codes, uniques = pd.factorize(values)
+    return codes[:len(left)], codes[len(left):], len(uniques)
+
+
+def surrogate_keys(left, right, columns):
+    """
+    Normalize the key columns of both frames once and turn each row's key into one
+    shared integer id, so equal (normalized) keys get the same id on both sides.
+    """
+    combined_left = np.zeros(len(left), dtype=np.int64)
+    combined_right = np.zeros(len(right), dtype=np.int64)
+    for column in columns:
+        left_codes, right_codes, n_codes = _key_codes(left, right, column)
+        combined_left = combined_left * n_codes + left_codes
+        combined_right = combined_right * n_codes + right_codes
+        # Re-factorize so the ids stay small no matter how many key columns there are
+        ids, _ = pd.factorize(np.concatenate([combined_left, combined_right]))
+        combined_left, combined_right = ids[:len(left)], ids[len(left):]
+    return combined_left, combined_right
+
+
+@traced()
+def join(left, right, on, how="left", suffixes=("", "_drop"), indicator=False):
+    """
+    Join on normalized keys in one pass over integer ids, keeping the left row order.
+    The first right row of each key is used (right should be unique on `on`); the later
+    ones are counted in stats['right_duplicates'] and otherwise ignored.
+    how: 'left', 'inner', 'anti' (left rows without a match) or 'full'.
+    Returns (joined frame, match statistics).
+    """
+    if how not in ("left", "inner", "anti", "full"):
+        raise ValueError(f"Unknown join type: {how}")
+
+    left_ids, right_ids = surrogate_keys(left, right, on)
+    n_ids = int(max(left_ids.max(initial=-1), right_ids.max(initial=-1))) + 1
+
+    # id -> position of its first row in `right` (-1: no such key on the right)
+    right_position = np.full(n_ids, -1, dtype=np.int64)
+    right_position[right_ids[::-1]] = np.arange(len(right))[::-1]
+    match = right_position[left_ids]
+    matched = match >= 0
+
+    first_right = np.zeros(len(right), dtype=bool)
+    first_right[right_position[right_position >= 0]] = True
+    # Right rows whose key some left row has, duplicates included
+    left_has_key = np.zeros(n_ids, dtype=bool)
+    left_has_key[left_ids] = True
+    matched_right = left_has_key[right_ids]
+
+    # Matches whose raw keys differ - these were silent non-matches before normalization
+    raw_left = left.loc[matched, on].astype(str).reset_index(drop=True)
+    raw_right = right.iloc[match[matched]][on].astype(str).reset_index(drop=True)
+
+    stats = {
+        "left_rows": len(left),
+        "right_rows": len(right),
+        "matched": int(matched.sum()),
+        "left_only": int((~matched).sum()),
+        "right_only": int((~matched_right & first_right).sum()),
+        "right_duplicates": int((~first_right).sum()),
+        "matched_after_normalization": int((raw_left != raw_right).any(axis=1).sum()),
+    }
+
+    left_values = left.reset_index(drop=True)
+    if how == "anti":
+        return left_values[~matched].reset_index(drop=True), stats
+
+    right_values = right.drop(columns=on).reset_index(drop=True)
+    overlap = set(right_values.columns) & set(left.columns)
+    left_values = left_values.rename(columns={c: c + suffixes[0] for c in overlap})
+    right_values = right_values.rename(columns={c: c + suffixes[1] for c in overlap})
+
+    # Label -1 doesn't exist, so unmatched left rows get an all-NaN right side
+    parts = [left_values, right_values.reindex(match).reset_index(drop=True)]
+    if indicator:
+        parts.append(pd.Series(np.where(matched, "both", "left_only"), name="_merge"))
+    joined = pd.concat(parts, axis=1)
+
+    if how == "inner":
+        joined = joined[matched].reset_index(drop=True)
+    elif how == "full":
+        right_only = right[~matched_right & first_right].rename(columns={c: c + suffixes[1] for c in overlap})
+        if indicator:
+            right_only = right_only.assign(_merge="right_only")
+        joined = pd.concat([joined, right_only], ignore_index=True)
+    return joined, stats
@@ -1,66 +1,258 @@
+import re
+import threading
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import numpy as np
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-
-def main():
-    url = "https://en.wikipedia.org/wiki/List_of_LGBTQ_participants_in_the_Eurovision_Song_Contest"
-
-    # Fetch HTML
-    html = requests.get(url, verify=False).text
-
-    # Parse HTML
-    soup = BeautifulSoup(html, "html.parser")
-
-    # Get the second table
-    tables_html = soup.find_all("table", {"class": "wikitable"})
-    target_table = tables_html[1]
-
-    # Load table into DataFrame
-    df = pd.read_html(str(target_table))[0]
-
-    # Extract artist links
-    links = []
-    placements = []  # store placement category based on color
-
-    for row in target_table.find_all("tr")[1:]:  # skip header
-        # --- Extract link ---
-        cell = row.find("td")
-        if cell and cell.find("a"):
-            link = cell.find("a")["href"]
-            if link.startswith("/wiki/"):
-                link = "https://en.wikipedia.org" + link
-            links.append(link)
-        else:
-            links.append(None)
-
-        # --- Determine placement from style ---
-        style = row.get("style", "").lower()
-        tds = row.find_all("td")
-        bgc = row.get("bgcolor", "").lower()
-        if (not style or not bgc) and tds:
-            # Sometimes color is on a <td> instead of the <tr>
-            for td in tds:
-                if "background" in td.get("style", "").lower():
-                    style = td["style"].lower()
-                    break
-
-        if "gold" in bgc:
-            placements.append("1st place")
-        elif "silver" in style:
-            placements.append("2nd place")
-        elif "#cc9966" in style or "bronze" in style:
-            placements.append("3rd place")
-        else:
-            placements.append("None")
-
-    # Add columns
+
+from create_data_set_code.scoreboard_scraper import read_snapshot, write_snapshot
+
+URL = "https://en.wikipedia.org/wiki/List_of_LGBTQ_participants_in_the_Eurovision_Song_Contest"
+CACHE_DIR = "datasets/lgbtq_cache"
+OUTPUT_FILE = "datasets/lgbtq_eurovision_artists.xlsx"
+
+ARTIST_COLUMN = "Artist"
+
+# A table whose class list holds the exact class "wikitable" (not e.g. "wikitable-foo")
+_WIKITABLE = re.compile(r'<table\b[^>]*\bclass\s*=\s*["\'](?:[^"\']*\s)?wikitable(?=[\s"\'])', re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size=8, retries=3):
+    """One pooled keep-alive session shared by every fetch, retrying transient errors with backoff."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+            session = requests.Session()
+            session.headers["User-Agent"] = "Mozilla/5.0 (eurovision-data-science)"
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def fetch_page(url=URL, cache_dir=CACHE_DIR, refresh=False, timeout=30):
+    """Page HTML, served from the snapshot cache unless missing or refresh=True."""
+    if cache_dir and not refresh:
+        html = read_snapshot(url, cache_dir)
+        if html is not None:
+            return html
+    response = get_session().get(url, verify=False, timeout=timeout)
+    response.raise_for_status()
+    html = response.text
+    if cache_dir:
+        write_snapshot(url, html, cache_dir)
+    return html
+
+
+class _TableParser(HTMLParser):
+    """
+    Streams one table and collects, per row, the cell texts, the first link of each
+    cell and the row/cell colors - everything the extraction needs in a single pass.
+    Nested tables are read as part of the enclosing cell's text.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.depth = 0
+        self.done = False
+        self.rows = []
+        self.row = None
+        self.cell = None
+        self.skip = 0  # inside <style>/<script>
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "table":
+            self.depth += 1
+            return
+        if tag in ("style", "script"):
+            self.skip += 1
+        elif tag == "a":
+            if self.cell is not None and self.cell["link"] is None:
+                self.cell["link"] = dict(attrs).get("href")
+        elif self.depth != 1:
+            return
+        elif tag == "tr":
+            self._close_row()
+            self.row = {"attrs": dict(attrs), "cells": []}
+        elif tag in ("td", "th") and self.row is not None:
+            self._close_cell()
+            attrs = dict(attrs)
+            self.cell = {
+                "header": tag == "th",
+                "attrs": attrs,
+                "text": [],
+                "link": None,
+                "rowspan": _span(attrs.get("rowspan")),
+                "colspan": _span(attrs.get("colspan")),
+            }
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag == "table":
+            self.depth -= 1
+            if self.depth == 0:
+                self._close_row()
+                self.done = True
+        elif tag in ("style", "script"):
+            self.skip = max(0, self.skip - 1)
+        elif self.depth == 1:
+            if tag in ("td", "th"):
+                self._close_cell()
+            elif tag == "tr":
+                self._close_row()
+
+    def handle_data(self, data):
+        if self.cell is not None and not self.skip and not self.done:
+            self.cell["text"].append(data)
+
+    def _close_cell(self):
+        if self.cell is not None:
+            self.cell["text"] = _SPACES.sub(" ", "".join(self.cell["text"])).strip()
+            self.row["cells"].append(self.cell)
+            self.cell = None
+
+    def _close_row(self):
+        self._close_cell()
+        if self.row is not None:
+            self.rows.append(self.row)
+            self.row = None
+
+
+def _span(value):
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return 1
+
+
+def parse_table(html, index=1, chunk_size=1 << 13):
+    """
+    Raw rows of the `index`-th wikitable. Parsing starts at that table and stops as soon
+    as it closes, so the rest of the page is never tokenized.
+    """
+    starts = [match.start() for match in _WIKITABLE.finditer(html)]
+    if len(starts) <= index:
+        raise ValueError(f"Page has {len(starts)} wikitables, wanted table #{index}")
+    parser = _TableParser()
+    position = starts[index]
+    while not parser.done and position < len(html):
+        parser.feed(html[position:position + chunk_size])
+        position += chunk_size
+    parser.close()
+    return parser.rows
+
+
+def expand_spans(rows):
+    """Lay the rows out on a grid, copying rowspan/colspan cells into every slot they cover."""
+    grid = []
+    carried = {}  # column -> [rows left, cell]
+    for row in rows:
+        cells = iter(row["cells"])
+        out = []
+        column = 0
+        while True:
+            if column in carried:
+                remaining, cell = carried[column]
+                if remaining == 1:
+                    del carried[column]
+                else:
+                    carried[column][0] -= 1
+                out.append(cell)
+                column += 1
+                continue
+            cell = next(cells, None)
+            if cell is None:
+                break
+            for offset in range(cell["colspan"]):
+                out.append(cell)
+                if cell["rowspan"] > 1:
+                    carried[column + offset] = [cell["rowspan"] - 1, cell]
+            column += cell["colspan"]
+        grid.append((row, out))
+    return grid
+
+
+def placement(row):
+    """Placement from the row color, or the first of its own cells that carries a background."""
+    style = row["attrs"].get("style", "").lower()
+    bgcolor = row["attrs"].get("bgcolor", "").lower()
+    for cell in row["cells"]:
+        cell_style = cell["attrs"].get("style", "").lower()
+        if not style and "background" in cell_style:
+            style = cell_style
+        if not bgcolor and cell["attrs"].get("bgcolor"):
+            bgcolor = cell["attrs"]["bgcolor"].lower()
+    colors = style + " " + bgcolor
+    if "gold" in colors:
+        return "1st place"
+    if "silver" in colors:
+        return "2nd place"
+    if "#cc9966" in colors or "bronze" in colors:
+        return "3rd place"
+    return "None"
+
+
+def _infer_types(df):
+    # Empty cells become NaN and numeric columns numbers, as pd.read_html would do
+    df = df.replace("", np.nan)
+    for column in df.columns:
+        converted = pd.to_numeric(df[column], errors="coerce")
+        if converted.notna().sum() == df[column].notna().sum():
+            df[column] = converted
+    return df
+
+
+def extract_table(html, index=1, base_url=URL):
+    """DataFrame of the table with an 'Artist Link' and a 'Placement' column."""
+    grid = expand_spans(parse_table(html, index))
+
+    header = next((cells for row, cells in grid if cells and all(c["header"] for c in cells)), None)
+    if header is None:
+        raise ValueError("Table has no header row")
+    columns = [cell["text"] for cell in header]
+    if ARTIST_COLUMN not in columns:
+        raise ValueError(f"Table has no {ARTIST_COLUMN!r} column")
+    artist = columns.index(ARTIST_COLUMN)
+
+    records, links, placements = [], [], []
+    for row, cells in grid:
+        if not cells or all(c["header"] for c in cells):
+            continue
+        texts = [cell["text"] for cell in cells[:len(columns)]]
+        records.append(texts + [None] * (len(columns) - len(texts)))
+        link = cells[artist]["link"] if artist < len(cells) else None
+        links.append(urljoin(base_url, link) if link else None)
+        placements.append(placement(row))
+
+    df = _infer_types(pd.DataFrame(records, columns=columns))
     df["Artist Link"] = links
     df["Placement"] = placements
+    return df
+
+
+def main(refresh=False):
+    html = fetch_page(refresh=refresh)
+    df = extract_table(html)
 
     # Save to Excel
-    df.to_excel("datasets/lgbtq_eurovision_artists.xlsx", index=False)
+    df.to_excel(OUTPUT_FILE, index=False)
 
     print("✅ Excel file created with artist names, links, and placement category!")
 
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
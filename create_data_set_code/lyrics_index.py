@@ -0,0 +1,259 @@
+import hashlib
+import json
+import math
+import os
+from collections import Counter
+
+from create_data_set_code.contest_model import Contest
+from create_data_set_code.contest_reader import EUROVISION_JSON, iter_contests
+from create_data_set_code.lyrics_tokenizer import batch_token_counts
+
+INDEX_FILE = '../datasets/lyrics_index.json'
+INDEX_VERSION = 4
+
+# Positions inside an entry row
+YEAR, COUNTRY, PLACE, ROUND_REACHED = range(4)
+
+
+def empty_index():
+    return {
+        'version': INDEX_VERSION,
+        'years': [],
+        'finalists': {},  # year -> number of finalists (to find the bottom 3)
+        'entries': [],  # entry_id -> [year, country, place, round reached] (None once removed)
+        'postings': {},  # token -> [[entry_id, term frequency], ...]
+        'contest_hashes': {},  # year -> hash of the contest it was indexed from
+    }
+
+
+def load_index(path=INDEX_FILE):
+    if not os.path.exists(path):
+        return empty_index()
+    with open(path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    if index.get('version') != INDEX_VERSION:
+        return empty_index()
+    # JSON object keys are always strings
+    index['finalists'] = {int(y): n for y, n in index['finalists'].items()}
+    index['contest_hashes'] = {int(y): h for y, h in index['contest_hashes'].items()}
+    return index
+
+
+def save_index(index, path=INDEX_FILE):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def source_signature(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def is_stale(index, source=EUROVISION_JSON):
+    """True when `source` changed since the index last scanned it (it may hold new years)."""
+    return index.get('source') != source_signature(source)
+
+
+def add_contest(index, contest):
+    """Index the English lyrics of every entry of one contest (a Contest or a raw eurovision.json dict)."""
+    if not isinstance(contest, Contest):
+        contest = Contest.from_dict(contest)
+    year = contest.year
+
+    entries = []
+    lyrics = []
+    for contestant in contest.contestants:
+        performance = contest.final_performance(contestant.id)
+        english_lyrics = contestant.english_lyrics
+        entries.append([
+            year,
+            contestant.country,
+            performance.place if performance else None,
+            contest.round_reached(contestant.id),
+        ])
+        lyrics.append(english_lyrics['content'] if english_lyrics else None)
+
+    first_id = len(index['entries'])
+    index['entries'].extend(entries)
+    postings = index['postings']
+    for offset, counts in enumerate(batch_token_counts(lyrics)):
+        for token, tf in counts.items():
+            postings.setdefault(token, []).append([first_id + offset, tf])
+
+    index['finalists'][year] = len(contest.final.by_contestant) if contest.final else 0
+    index['years'].append(year)
+
+
+def remove_year(index, year):
+    """Drop a year's entries from the index; their ids stay reserved so later ids don't move."""
+    removed = {entry_id for entry_id, entry in enumerate(index['entries'])
+               if entry is not None and entry[YEAR] == year}
+    for entry_id in removed:
+        index['entries'][entry_id] = None
+    postings = index['postings']
+    for token in list(postings):
+        remaining = [p for p in postings[token] if p[0] not in removed]
+        if remaining:
+            postings[token] = remaining
+        else:
+            del postings[token]
+    index['years'] = [y for y in index['years'] if y != year]
+    index['finalists'].pop(year, None)
+    index['contest_hashes'].pop(year, None)
+
+
+def contest_hash(contest):
+    return hashlib.sha1(json.dumps(contest, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def update_index(index=None, source=EUROVISION_JSON):
+    """
+    Bring the index in line with `source`: new years are added, years whose contest changed
+    are indexed again and years no longer in the source are removed. Returns the years (re)indexed.
+    """
+    if index is None:
+        index = empty_index()
+    hashes = index['contest_hashes']
+    seen = set()
+    added = []
+    for contest in iter_contests(source):
+        year = contest.get('year')
+        seen.add(year)
+        digest = contest_hash(contest)
+        if hashes.get(year) == digest:
+            continue
+        if year in hashes:
+            remove_year(index, year)
+        # Only new or changed years are worth building the indexed model for
+        add_contest(index, Contest.from_dict(contest))
+        hashes[year] = digest
+        added.append(year)
+    for year in [y for y in hashes if y not in seen]:
+        remove_year(index, year)
+    index['source'] = source_signature(source)
+    return added
+
+
+class QueryCache:
+    """
+    Answers of earlier queries, kept next to the index and valid until the source changes,
+    so repeating a query doesn't even load the index.
+    """
+
+    def __init__(self, index_path=INDEX_FILE, source=EUROVISION_JSON):
+        self.path = os.path.splitext(index_path)[0] + '_queries.json'
+        self.signature = [INDEX_VERSION] + source_signature(source)
+        self.answers = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('signature') == self.signature:
+                self.answers = cached['answers']
+
+    def get(self, key):
+        return self.answers.get(key)
+
+    def put(self, key, answer):
+        self.answers[key] = answer
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'signature': self.signature, 'answers': self.answers}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+# --- Entry selectors ---
+
+def winners(index, entry):
+    return entry[PLACE] == 1
+
+
+def top_three(index, entry):
+    return entry[PLACE] is not None and entry[PLACE] <= 3
+
+
+def bottom_three(index, entry):
+    finalists = index['finalists'].get(entry[YEAR], 0)
+    return entry[PLACE] is not None and entry[PLACE] > finalists - 3
+
+
+def non_finalists(index, entry):
+    return entry[ROUND_REACHED] == 'semifinal'
+
+
+def losers(index, entry):
+    return bottom_three(index, entry) or non_finalists(index, entry)
+
+
+def select_entries(index, selector, exclude_years=(1956,)):
+    return {
+        entry_id for entry_id, entry in enumerate(index['entries'])
+        if entry is not None and entry[YEAR] not in exclude_years and selector(index, entry)
+    }
+
+
+# --- Queries ---
+
+def word_counts(index, entry_ids):
+    """Term frequencies summed over the given entries, read from the postings."""
+    entry_ids = set(entry_ids)
+    counts = Counter()
+    for token, postings in index['postings'].items():
+        count = sum(tf for entry_id, tf in postings if entry_id in entry_ids)
+        if count:
+            counts[token] = count
+    return counts
+
+
+def most_common(counts, n):
+    # Ties by token, so the answer doesn't depend on the order the years were indexed in
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+
+def top_words(index, selector, n=100):
+    """e.g. top_words(index, winners) -> the 100 most common words among winning songs."""
+    return most_common(word_counts(index, select_entries(index, selector)), n)
+
+
+def over_represented(index, selector, baseline, n=50, min_count=5):
+    """
+    Words whose relative frequency in `selector` songs most exceeds that in `baseline` songs,
+    scored by the smoothed log ratio of the two frequencies.
+    """
+    counts = word_counts(index, select_entries(index, selector))
+    base_counts = word_counts(index, select_entries(index, baseline))
+    total = sum(counts.values()) or 1
+    base_total = sum(base_counts.values()) or 1
+    vocabulary = len(set(counts) | set(base_counts)) or 1
+
+    scores = {}
+    for token, count in counts.items():
+        if count < min_count:
+            continue
+        rate = (count + 1) / (total + vocabulary)
+        base_rate = (base_counts.get(token, 0) + 1) / (base_total + vocabulary)
+        scores[token] = math.log(rate / base_rate)
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+
+def main():
+    index = load_index()
+    if is_stale(index):
+        # Written only when the source changed: re-indexed years or, at least, its new signature
+        added = update_index(index)
+        save_index(index)
+    else:
+        added = []
+    if added:
+        print(f"Indexed {len(added)} new contest years ({min(added)}-{max(added)})")
+    else:
+        print("Lyrics index is up to date")
+
+    print("Top words among winners:", top_words(index, winners, n=20))
+    print("Over-represented among non-finalists vs winners:",
+          over_represented(index, non_finalists, winners, n=20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import mmap
+import os
+import struct
+import zlib
+
+# Standard library only, like extract_song_db_2 which writes the store.
+#
+# Layout of a store directory, for each lyrics version ('original', 'english'):
+#   <version>.blob  every song's lyrics, each zlib-compressed on its own, back to back
+#   <version>.idx   header, then one fixed-width record per lyrics id:
+#                   (offset into the blob, compressed length, 0 = no lyrics)
+# A record sits at HEADER.size + lyrics_id * RECORD.size, so any song is found with one
+# seek and decompressed without reading the others.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Read when a store is opened (not bound as a default), so a copy of the tree can point it elsewhere
+LYRICS_DIR = os.path.join(ROOT, 'datasets', 'lyrics')
+VERSIONS = ('original', 'english')
+
+MAGIC = b'EVLY'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sII')  # magic, format version, number of records
+RECORD = struct.Struct('<QI')    # offset, compressed length
+
+
+def _paths(directory, version):
+    return os.path.join(directory, version + '.blob'), os.path.join(directory, version + '.idx')
+
+
+class LyricsWriter:
+    """
+    Appends songs to a new store; ids are handed out in order (0, 1, 2, ...).
+    The files are written next to the old ones and swapped in on close, so readers
+    never see a half-written store.
+    """
+
+    def __init__(self, directory=None, versions=VERSIONS, level=6):
+        directory = directory or LYRICS_DIR
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.versions = versions
+        self.level = level
+        self.count = 0
+        self._blobs = {}
+        self._indexes = {}
+        self._offsets = {}
+        for version in versions:
+            blob_path, index_path = _paths(directory, version)
+            self._blobs[version] = open(blob_path + '.tmp', 'wb')
+            self._indexes[version] = open(index_path + '.tmp', 'wb')
+            self._indexes[version].write(HEADER.pack(MAGIC, FORMAT_VERSION, 0))
+            self._offsets[version] = 0
+
+    def add(self, **texts):
+        """Store one song's lyrics by version (missing or None: no lyrics); returns its lyrics id."""
+        unknown = set(texts) - set(self.versions)
+        if unknown:
+            raise ValueError(f"Unknown lyrics version(s): {', '.join(sorted(unknown))}")
+        compressed = {None: b''}  # the English version is often the original text itself
+        for version in self.versions:
+            text = texts.get(version)
+            if text not in compressed:
+                compressed[text] = zlib.compress(text.encode('utf-8'), self.level)
+            data = compressed[text]
+            self._blobs[version].write(data)
+            self._indexes[version].write(RECORD.pack(self._offsets[version], len(data)))
+            self._offsets[version] += len(data)
+        self.count += 1
+        return self.count - 1
+
+    def close(self):
+        for version in self.versions:
+            blob_path, index_path = _paths(self.directory, version)
+            index = self._indexes[version]
+            index.seek(0)
+            index.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.count))
+            index.close()
+            self._blobs[version].close()
+            os.replace(blob_path + '.tmp', blob_path)
+            os.replace(index_path + '.tmp', index_path)
+
+    def abort(self):
+        for version in self.versions:
+            self._blobs[version].close()
+            self._indexes[version].close()
+            for path in _paths(self.directory, version):
+                if os.path.exists(path + '.tmp'):
+                    os.remove(path + '.tmp')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class _Version:
+    """The memory-mapped index and blob of one lyrics version."""
+
+    def __init__(self, directory, version):
+        blob_path, index_path = _paths(directory, version)
+        self._files = [open(index_path, 'rb'), open(blob_path, 'rb')]
+        self.index = mmap.mmap(self._files[0].fileno(), 0, access=mmap.ACCESS_READ)
+        magic, format_version, self.count = HEADER.unpack_from(self.index, 0)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f"{index_path} is not a lyrics index of format {FORMAT_VERSION}")
+        # mmap refuses empty files (a store where no song has lyrics of this version)
+        self.blob = mmap.mmap(self._files[1].fileno(), 0, access=mmap.ACCESS_READ) \
+            if os.fstat(self._files[1].fileno()).st_size else b''
+
+    def get(self, lyrics_id):
+        if not 0 <= lyrics_id < self.count:
+            raise KeyError(lyrics_id)
+        offset, length = RECORD.unpack_from(self.index, HEADER.size + lyrics_id * RECORD.size)
+        return zlib.decompress(self.blob[offset:offset + length]).decode('utf-8') if length else None
+
+    def close(self):
+        if isinstance(self.blob, mmap.mmap):
+            self.blob.close()
+        self.index.close()
+        for f in self._files:
+            f.close()
+
+
+class LyricsStore:
+    """
+    Read side of a store: full lyrics of any song by lyrics id, one version at a time.
+    Only the pages of the records and blobs that are asked for are ever read.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or LYRICS_DIR
+        self._versions = {}
+
+    def _version(self, version):
+        if version not in self._versions:
+            if version not in VERSIONS:
+                raise ValueError(f"Unknown lyrics version: {version}")
+            self._versions[version] = _Version(self.directory, version)
+        return self._versions[version]
+
+    def __len__(self):
+        return self._version(VERSIONS[0]).count
+
+    def get(self, lyrics_id, version='english'):
+        """The song's lyrics in this version, or None when it has none."""
+        return self._version(version).get(int(lyrics_id))
+
+    def iter(self, lyrics_ids=None, version='english'):
+        """(lyrics id, lyrics) for the given ids (every song when None), decompressed one at a time."""
+        store = self._version(version)
+        for lyrics_id in range(store.count) if lyrics_ids is None else lyrics_ids:
+            yield lyrics_id, store.get(int(lyrics_id))
+
+    def close(self):
+        for version in self._versions.values():
+            version.close()
+        self._versions = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,73 @@
+import string
+import unicodedata
+from collections import Counter
+
+NOT_IN_ENGLISH = "Not available in English"
+
+# --- Basic English stopwords list (no downloads needed) ---
+STOP_WORDS = frozenset("""
+a about above after again against all am an and any are aren't as at be because been before being below between both
+but by can can't cannot could couldn't did didn't do does doesn't doing don't down during each few for from further
+had hadn't has hasn't have haven't having he he'd he'll he's her here here's hers herself him himself his how how's i
+i'd i'll i'm i've if in into is isn't it it's its itself let's me more most mustn't my myself no nor not of off on once
+only or other ought our ours ourselves out over own same shan't she she'd she'll she's should shouldn't so some such
+than that that's the their theirs them themselves then there there's these they they'd they'll they're they've this
+those through to too under until up very was wasn't we we'd we'll we're we've were weren't what what's when when's where
+where's which while who who's whom why why's with won't would wouldn't you you'd you'll you're you've your yours yourself
+yourselves
+""".split())
+
+MIN_WORD_LENGTH = 3
+
+
+class _PunctuationTable(dict):
+    """
+    str.translate table removing ASCII punctuation plus every Unicode punctuation
+    character ('…', '’', '«', '¿', ...). Each code point is classified the first time
+    it is seen and cached, so the table is built once and shared by every call.
+    """
+
+    def __missing__(self, code_point):
+        value = None if unicodedata.category(chr(code_point)).startswith('P') else code_point
+        self[code_point] = value
+        return value
+
+
+PUNCTUATION_TABLE = _PunctuationTable(str.maketrans('', '', string.punctuation))
+
+
+def tokenize(text):
+    """Lowercase, strip punctuation and drop stopwords and short words."""
+    if not text or text == NOT_IN_ENGLISH:
+        return []
+    words = text.lower().translate(PUNCTUATION_TABLE).split()
+    return [w for w in words if len(w) >= MIN_WORD_LENGTH and w not in STOP_WORDS]
+
+
+def batch_token_counts(lyrics):
+    """Token counts for a whole batch of lyrics - one Counter per song, in input order."""
+    stop_words = STOP_WORDS
+    table = PUNCTUATION_TABLE
+    counts = []
+    for text in lyrics:
+        if not isinstance(text, str) or text == NOT_IN_ENGLISH:
+            counts.append(Counter())
+            continue
+        counts.append(Counter(
+            w for w in text.lower().translate(table).split()
+            if len(w) >= MIN_WORD_LENGTH and w not in stop_words
+        ))
+    return counts
+
+
+def batch_top_words(lyrics, n=3):
+    """The n most common words of every song, formatted like the top_3_words column ('a, b, c')."""
+    return [', '.join(w for w, _ in counts.most_common(n)) for counts in batch_token_counts(lyrics)]
+
+
+def total_counts(lyrics):
+    """Word counts summed over every song in the batch."""
+    total = Counter()
+    for counts in batch_token_counts(lyrics):
+        total.update(counts)
+    return total
@@ -1,9 +1,35 @@
 import pandas as pd
 
+from create_data_set_code.join_keys import join
+from create_data_set_code.tracing import span
+from create_data_set_code.vocabulary import load_registry
+
 def merge_datasets():
     # Load datasets
-    df2 = pd.read_csv('../datasets/eurovision_dataset_2.csv')
-    df1 = pd.read_csv('../datasets/eurovision_dataset_1.csv')
+    with span("merge.load_dataset_2") as s:
+        df2 = pd.read_csv('datasets/eurovision_dataset_2.csv')
+        s.set(output=list(df2.shape))
+    with span("merge.load_dataset_1") as s:
+        df1 = pd.read_csv('datasets/eurovision_dataset_1.csv')
+        s.set(output=list(df1.shape))
+
+    # Load LGBTQ dataset
+    lgbtq_df = pd.read_excel('datasets/lgbtq_eurovision_artists.xlsx')
+
+    # Make sure the column names match for the join
+    lgbtq_df = lgbtq_df.rename(columns={
+        'Artist': 'artist',
+        'Country': 'country',
+        'Year': 'year',
+        'Song': 'song',
+        'Sexual orientation or gender identity': 'artist sexuality'
+    })
+    lgbtq_df = lgbtq_df.dropna(subset=['artist', 'country', 'year'])
+
+    # Countries, languages and people as registry codes until the CSV is written. The three
+    # tables are encoded together so their key columns share one dtype and join on codes.
+    registry = load_registry()
+    registry.encode_frames(df1, df2, lgbtq_df)
 
     # Rename df2 for consistency
     df1_renamed = df1.rename(columns={
@@ -18,57 +44,44 @@ def merge_datasets():
     df2 = df2.drop_duplicates(subset=['year', 'country', 'song'])
     df1_renamed = df1_renamed.drop_duplicates(subset=['year', 'country', 'song'])
 
-    # 1️⃣ Inner merge → rows in both datasets
-    inner_merge = pd.merge(
-        df2, df1_renamed,
-        on=['year', 'country', 'song'],
-        how='inner',
-        suffixes=('', '_drop')
+    # Rows in both datasets, then rows only in df2 - joined once on normalized keys
+    # (casefolded, accents/punctuation stripped, country aliases like Czechia = Czech Republic)
+    merged_tb, stats = join(df2, df1_renamed, on=['year', 'country', 'song'], how='left', indicator=True)
+    merged_tb = (
+        merged_tb.sort_values('_merge', key=lambda m: m != 'both', kind='stable')
+        .drop(columns=['_merge'])
+        .reset_index(drop=True)
     )
 
-    # 2️⃣ Find rows in df2 that are not in df1
-    only_df2 = df2.merge(
-        df1_renamed[['year', 'country', 'song']],
-        on=['year', 'country', 'song'],
-        how='left',
-        indicator=True
-    ).query('_merge == "left_only"').drop(columns=['_merge'])
-
-    # 3️⃣ Combine the inner merge and the only_df2 table
-    merged_tb = pd.concat([inner_merge, only_df2], ignore_index=True)
-
-    # Save to CSV
-    # merged_tb.to_csv('datasets/final_merged.csv', index=False)
-
-    print("Inner merge rows:", inner_merge.shape[0])
-    print("Only in df2 rows:", only_df2.shape[0])
+    print("Inner merge rows:", stats['matched'])
+    print("Only in df2 rows:", stats['left_only'])
+    print("Only in df1 rows:", stats['right_only'])
+    print("df1 rows dropped as duplicates of a normalized key:", stats['right_duplicates'])
+    print("Matched only after key normalization:", stats['matched_after_normalization'])
     print("Final merged rows:", merged_tb.shape[0])
 
-    # Load LGBTQ dataset
-    lgbtq_df = pd.read_excel('datasets/lgbtq_eurovision_artists.xlsx')
-
-    # Make sure the column names match for the join
-    lgbtq_df = lgbtq_df.rename(columns={
-        'Artist': 'artist',
-        'Country': 'country',
-        'Year': 'year',
-        'Song': 'song',
-        'Sexual orientation or gender identity': 'artist sexuality'
-    })
-
     # Merge to bring in sexuality info
-    merged_with_sexuality = pd.merge(
+    merged_with_sexuality, lgbtq_stats = join(
         merged_tb,
         lgbtq_df[['artist', 'country', 'year', 'artist sexuality']],
         on=['artist', 'country', 'year'],
         how='left'
     )
+    lgbtq_used = lgbtq_stats['right_rows'] - lgbtq_stats['right_only'] - lgbtq_stats['right_duplicates']
+    print("LGBTQ list entries matched:", lgbtq_used, "of", lgbtq_stats['right_rows'])
+    if lgbtq_stats['right_duplicates']:
+        print("LGBTQ list entries ignored (same artist, country and year as an earlier one):",
+              lgbtq_stats['right_duplicates'])
+
+    # Rows only in df2 have no dataset_1 entry, so no votes either
+    merged_with_sexuality['entry_id'] = merged_with_sexuality['entry_id'].astype('Int32')
 
     # Fill missing sexuality with "straight"
     merged_with_sexuality['artist sexuality'] = merged_with_sexuality['artist sexuality'].fillna('straight')
 
     # Save final dataset
-    merged_with_sexuality.to_csv('datasets/final_merged.csv', index=False)
+    with span("merge.write_csv", output=list(merged_with_sexuality.shape)):
+        merged_with_sexuality.to_csv('datasets/final_merged.csv', index=False)
 
     print("Added 'artist sexuality' column. Saved to datasets/final_merged_with_sexuality.csv")
 
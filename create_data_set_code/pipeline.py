@@ -0,0 +1,241 @@
+import ast
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from create_data_set_code import tracing
+from create_data_set_code.lyrics_store import VERSIONS as LYRICS_VERSIONS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE_FILE = os.path.join(ROOT, "datasets", ".pipeline_state.json")
+
+
+class Stage:
+    """
+    One step of the dataset build. `inputs` / `outputs` are paths relative to the repo root;
+    `cwd` is the directory (relative to the root) the stage's own relative paths expect.
+    """
+
+    def __init__(self, name, module, func, inputs, outputs, cwd="."):
+        self.name = name
+        self.module = module
+        self.func = func
+        self.inputs = inputs
+        self.outputs = outputs
+        self.cwd = cwd
+
+    def source_files(self):
+        """The stage's module and every create_data_set_code module it (transitively) imports."""
+        return sorted(module_file(m) for m in local_imports(self.module))
+
+
+PACKAGE = "create_data_set_code"
+
+
+def module_file(module):
+    return os.path.join(ROOT, *module.split(".")) + ".py"
+
+
+def _imported_modules(module):
+    """create_data_set_code modules named by the import statements of `module` (lazy ones included)."""
+    with open(module_file(module), "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            # 'from create_data_set_code import x' may name a module or an attribute
+            names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+        else:
+            continue
+        found.update(n for n in names if n.startswith(PACKAGE + ".") and os.path.exists(module_file(n)))
+    return found
+
+
+def local_imports(module):
+    seen = set()
+    pending = [module]
+    while pending:
+        current = pending.pop()
+        if current not in seen:
+            seen.add(current)
+            pending.extend(_imported_modules(current))
+    return seen
+
+
+STAGES = [
+    Stage(
+        "song_db_1", "create_data_set_code.extract_song_db_1", "main",
+        inputs=["basic_datasets/contestants.csv", "basic_datasets/votes.csv"],
+        outputs=["datasets/eurovision_dataset_1.csv", "datasets/eurovision_votes.csv"],
+    ),
+    Stage(
+        "song_db_2", "create_data_set_code.extract_song_db_2", "main",
+        inputs=["basic_datasets/eurovision.json", "basic_datasets/countries.json"],
+        outputs=["datasets/eurovision_dataset_2.csv"] + [
+            f"datasets/lyrics/{version}.{ext}" for version in LYRICS_VERSIONS for ext in ("blob", "idx")
+        ],
+        cwd="create_data_set_code",
+    ),
+    Stage(
+        "lgbtq", "create_data_set_code.lgtbq_artist_list", "main",
+        inputs=[],  # scraped from Wikipedia - rebuilt only when missing or forced
+        outputs=["datasets/lgbtq_eurovision_artists.xlsx"],
+    ),
+    Stage(
+        "merge", "create_data_set_code.merge_datasets", "merge_datasets",
+        inputs=[
+            "datasets/eurovision_dataset_1.csv",
+            "datasets/eurovision_dataset_2.csv",
+            "datasets/lgbtq_eurovision_artists.xlsx",
+        ],
+        outputs=["datasets/final_merged.csv"],
+    ),
+    Stage(
+        "artists", "create_data_set_code.add_artist_data", "enrich_artists",
+        inputs=["datasets/final_merged.csv"],  # pages are cached in datasets/.artist_cache
+        outputs=["datasets/artist_info.csv"],
+    ),
+]
+
+
+def dependencies(stages):
+    """stage name -> names of the stages producing its inputs."""
+    producers = {out: stage.name for stage in stages for out in stage.outputs}
+    return {
+        stage.name: {producers[i] for i in stage.inputs if i in producers}
+        for stage in stages
+    }
+
+
+def downstream(stages, name):
+    """`name` and every stage that (transitively) consumes its outputs."""
+    deps = dependencies(stages)
+    affected = {name}
+    changed = True
+    while changed:
+        changed = False
+        for stage, upstream in deps.items():
+            if stage not in affected and upstream & affected:
+                affected.add(stage)
+                changed = True
+    return affected
+
+
+def fingerprint(stage):
+    digest = hashlib.sha256()
+    # Helpers the stage imports count as its code: editing csv_cache or vocabulary reruns it
+    for path in stage.source_files() + [os.path.join(ROOT, i) for i in stage.inputs]:
+        digest.update(path.encode("utf-8"))
+        if not os.path.exists(path):
+            digest.update(b"<missing>")
+            continue
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def load_state():
+    if not os.path.exists(STATE_FILE):
+        return {}
+    with open(STATE_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state):
+    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+    with open(STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=4)
+
+
+def is_up_to_date(stage, state):
+    outputs_exist = all(os.path.exists(os.path.join(ROOT, out)) for out in stage.outputs)
+    return outputs_exist and state.get(stage.name) == fingerprint(stage)
+
+
+def _run_stage(name, module, func, cwd):
+    # Runs in a worker process, so changing directory doesn't affect other stages
+    sys.path.insert(0, ROOT)
+    os.chdir(os.path.join(ROOT, cwd))
+    start = time.perf_counter()
+    with tracing.span(f"stage:{name}", module=module):
+        getattr(importlib.import_module(module), func)()
+    return time.perf_counter() - start
+
+
+def run(stages=STAGES, force=(), max_workers=None):
+    """
+    Run every stage whose inputs changed since its last successful run, plus every stage
+    in `force` and everything downstream of it. Independent stages run concurrently.
+    Returns {stage name: "ran" | "skipped" | "failed" | "blocked"}.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    unknown = set(force) - set(by_name)
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+
+    forced = set()
+    for name in force:
+        forced |= downstream(stages, name)
+
+    deps = dependencies(stages)
+    state = load_state()
+    status = {}
+    pending = [stage.name for stage in stages]
+    running = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            progressed = False
+            for name in list(pending):
+                upstream = deps[name]
+                if any(status.get(u) in ("failed", "blocked") for u in upstream):
+                    print(f"⛔ {name}: blocked by a failed upstream stage")
+                    status[name] = "blocked"
+                    pending.remove(name)
+                    progressed = True
+                    continue
+                if not all(u in status for u in upstream):
+                    continue
+
+                pending.remove(name)
+                progressed = True
+                stage = by_name[name]
+                # Fingerprint only once upstream stages finished writing this stage's inputs
+                if name not in forced and is_up_to_date(stage, state):
+                    print(f"⏭️  {name}: inputs unchanged, skipping")
+                    status[name] = "skipped"
+                    continue
+                print(f"▶️  {name}: running")
+                running[executor.submit(_run_stage, name, stage.module, stage.func, stage.cwd)] = name
+
+            if not running:
+                if pending and not progressed:
+                    raise ValueError(f"Stages with circular inputs: {', '.join(pending)}")
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    elapsed = future.result()
+                except Exception as e:
+                    print(f"❌ {name} failed: {e}")
+                    status[name] = "failed"
+                    continue
+                print(f"✅ {name} finished in {elapsed:.1f}s")
+                status[name] = "ran"
+                state[name] = fingerprint(by_name[name])
+                save_state(state)
+
+    if tracing.is_enabled():
+        print(f"🔎 Trace written to {tracing.export_chrome_trace()} - slowest spans:")
+        for line in tracing.summary():
+            print("   " + line)
+    return status
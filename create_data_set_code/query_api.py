@@ -0,0 +1,293 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Standard library only (vocabulary is too): the service must start anywhere the datasets exist
+from create_data_set_code.vocabulary import build_country_registry, normalize_country
+
+MERGED_CSV = "datasets/final_merged.csv"
+VOTES_CSV = "basic_datasets/votes.csv"
+CONTESTANTS_CSV = "basic_datasets/contestants.csv"
+
+RESULT_COLUMNS = [
+    "year", "country", "artist", "song", "place", "points", "points_jury_final", "points_tele_final",
+    "running_order", "main_language", "artist sexuality",
+]
+VOTE_KINDS = {"total": "total_points", "jury": "jury_points", "tele": "tele_points"}
+
+csv.field_size_limit(sys.maxsize)  # lyrics fields are larger than the default limit
+
+
+def _value(text):
+    if text is None or text == "":
+        return None
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    return int(number) if number.is_integer() else number
+
+
+def _place_order(row):
+    return (row["place"] is None or isinstance(row["place"], str), row["place"] if isinstance(row["place"], int) else 0)
+
+
+def file_signature(*paths):
+    """Changes whenever any of the files is rewritten."""
+    parts = []
+    for path in paths:
+        st = os.stat(path)
+        parts.append(f"{path}:{st.st_mtime_ns}:{st.st_size}")
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class Dataset:
+    """
+    The merged results and the votes, read once and indexed for every endpoint:
+    results by year and by country, and votes by (year, round) in both directions.
+    Rendered responses are kept in an LRU cache that lives as long as this snapshot.
+    """
+
+    def __init__(self, merged_csv=MERGED_CSV, votes_csv=VOTES_CSV, contestants_csv=CONTESTANTS_CSV,
+                 cache_size=2048):
+        self.version = file_signature(merged_csv, votes_csv, contestants_csv)
+        self.names = {}  # country id -> display name
+        # Built with this snapshot, so names a rebuilt contestants.csv adds are known after a reload
+        self.countries = build_country_registry(os.path.dirname(contestants_csv) or ".")
+        self._load_countries(contestants_csv)
+
+        self.by_year = {}
+        self.by_country = {}
+        self._load_results(merged_csv)
+
+        self.given = {}     # (year, round) -> {from_id: {to_id: {kind: points}}}
+        self.received = {}  # (year, round) -> {to_id: {from_id: {kind: points}}}
+        self._load_votes(votes_csv)
+
+        self.response = lru_cache(maxsize=cache_size)(self._response)
+
+    def _load_countries(self, contestants_csv):
+        with open(contestants_csv, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                # Rows are in year order, so the latest name wins (Czechia over Czech Republic)
+                self.names[row["to_country_id"]] = row["to_country"]
+
+    def _load_results(self, merged_csv):
+        with open(merged_csv, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                year = _value(row["year"])
+                if not isinstance(year, int) or not row["country"]:
+                    continue
+                record = {column: _value(row.get(column)) for column in RESULT_COLUMNS}
+                self.by_year.setdefault(year, []).append(record)
+                key = self.lookup(row["country"]) or normalize_country(row["country"])
+                self.by_country.setdefault(key, []).append(record)
+        for rows in self.by_year.values():
+            rows.sort(key=_place_order)
+        for rows in self.by_country.values():
+            rows.sort(key=lambda r: r["year"])
+
+    def _load_votes(self, votes_csv):
+        with open(votes_csv, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                key = (int(row["year"]), row["round"])
+                points = {kind: _value(row[column]) for kind, column in VOTE_KINDS.items()}
+                from_id, to_id = row["from_country_id"], row["to_country_id"]
+                self.given.setdefault(key, {}).setdefault(from_id, {})[to_id] = points
+                self.received.setdefault(key, {}).setdefault(to_id, {})[from_id] = points
+
+    def name(self, country_id):
+        # Ids contestants.csv never uses (it has a few names in place of codes) get the registry's name
+        return self.names.get(country_id) or self.countries.name(country_id)
+
+    def lookup(self, country):
+        """Country id of a name or id (accents, case, '&' vs 'and' and aliases don't matter), or None."""
+        code = self.countries.lookup(country)
+        return None if code is None else self.countries.iso[code]
+
+    # --- Endpoints: each returns (status, payload) ---
+
+    def index(self):
+        return 200, {
+            "version": self.version,
+            "endpoints": [
+                "/years",
+                "/results/{year}",
+                "/countries/{country}",
+                "/votes/{year}/given/{country}?round=final&kind=total",
+                "/votes/{year}/received/{country}?round=final&kind=total",
+            ],
+        }
+
+    def years(self):
+        return 200, sorted(self.by_year)
+
+    def results(self, year):
+        if year not in self.by_year:
+            return 404, {"error": f"No results for {year}"}
+        return 200, self.by_year[year]
+
+    def country_history(self, country):
+        country_id = self.lookup(country)
+        rows = self.by_country.get(country_id) or self.by_country.get(normalize_country(country))
+        if not rows:
+            return 404, {"error": f"Unknown country: {country}"}
+        return 200, {"country": self.name(country_id) if country_id else country, "entries": rows}
+
+    def votes(self, year, direction, country, round="final", kind="total"):
+        if kind not in VOTE_KINDS:
+            return 400, {"error": f"kind must be one of {sorted(VOTE_KINDS)}"}
+        country_id = self.lookup(country)
+        if country_id is None:
+            return 404, {"error": f"Unknown country: {country}"}
+        index = self.given if direction == "given" else self.received
+        votes = index.get((year, round), {}).get(country_id)
+        if votes is None:
+            return 404, {"error": f"No {round} votes {direction} by {self.name(country_id)} in {year}"}
+        points = {self.name(other): p[kind] for other, p in votes.items() if p[kind] is not None}
+        ordered = dict(sorted(points.items(), key=lambda item: -item[1]))
+        return 200, {"year": year, "round": round, "kind": kind, "country": self.name(country_id),
+                     direction: ordered, "total": sum(ordered.values())}
+
+    def route(self, path, params):
+        parts = [unquote(part) for part in path.strip("/").split("/") if part]
+        try:
+            if not parts:
+                return self.index()
+            if parts == ["years"]:
+                return self.years()
+            if len(parts) == 2 and parts[0] == "results":
+                return self.results(int(parts[1]))
+            if len(parts) == 2 and parts[0] == "countries":
+                return self.country_history(parts[1])
+            if len(parts) == 4 and parts[0] == "votes" and parts[2] in ("given", "received"):
+                return self.votes(int(parts[1]), parts[2], parts[3],
+                                  params.get("round", "final"), params.get("kind", "total"))
+        except ValueError:
+            return 400, {"error": f"Bad request: {path}"}
+        return 404, {"error": f"Unknown endpoint: {path}"}
+
+    def _response(self, path, query):
+        """(status, body, etag) for a request - computed once per snapshot, then served from the LRU."""
+        params = {key: values[-1] for key, values in parse_qs(query).items()}
+        status, payload = self.route(path, params)
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = '"%s-%s"' % (self.version, hashlib.sha1(body).hexdigest()[:16])
+        return status, body, etag
+
+
+class QueryService:
+    """Holds the current Dataset and swaps in a new one when the source files change."""
+
+    def __init__(self, merged_csv=MERGED_CSV, votes_csv=VOTES_CSV, contestants_csv=CONTESTANTS_CSV,
+                 cache_size=2048, report=print):
+        self.paths = (merged_csv, votes_csv, contestants_csv)
+        self.cache_size = cache_size
+        self.report = report
+        self.dataset = self._load()
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def _load(self):
+        start = time.perf_counter()
+        dataset = Dataset(*self.paths, cache_size=self.cache_size)
+        self.report(f"📚 Loaded dataset {dataset.version}: {len(dataset.by_year)} years, "
+                    f"{len(dataset.by_country)} countries in {time.perf_counter() - start:.2f}s")
+        return dataset
+
+    def watch(self, interval=2.0):
+        """Poll the files; reload once a change has been stable for one interval (the pipeline writes in place)."""
+        def loop():
+            seen = self.dataset.version
+            while not self._stop.wait(interval):
+                try:
+                    signature = file_signature(*self.paths)
+                except OSError:
+                    continue
+                if signature == self.dataset.version:
+                    seen = signature
+                elif signature == seen:
+                    try:
+                        self.dataset = self._load()
+                    except Exception as e:
+                        self.report(f"Reload failed, still serving {self.dataset.version}: {e}")
+                else:
+                    seen = signature
+
+        self._watcher = threading.Thread(target=loop, daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    server_version = "EurovisionQueryAPI/1.0"
+    quiet = True
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        status, body, etag = self.server.service.dataset.response(parts.path, parts.query)
+
+        if status == 200 and etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 200:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=8000, service=None, reload_interval=2.0):
+    """The HTTP server (not yet serving); port=0 picks a free port."""
+    service = service or QueryService()
+    if reload_interval:
+        service.watch(reload_interval)
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def serve(host="127.0.0.1", port=8000, reload_interval=2.0):
+    server = make_server(host, port, reload_interval=reload_interval)
+    print(f"🌍 Serving on http://{host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.service.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read-only HTTP API over the merged Eurovision dataset")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--reload-interval", type=float, default=2.0,
+                        help="seconds between checks for a rebuilt dataset (0 disables hot reload)")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.reload_interval)
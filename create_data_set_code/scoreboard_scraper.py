@@ -0,0 +1,241 @@
+import hashlib
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from create_data_set_code.tracing import traced
+
+BASE_URL = "https://eurovisionworld.com/eurovision/"
+CACHE_DIR = "datasets/scoreboard_cache"
+
+_SCOREBOARD_TABLE = re.compile(r'<table\b[^>]*\bclass\s*=\s*["\'][^"\']*\bscoreboard_table\b', re.IGNORECASE)
+
+
+def year_url(year, base_url=BASE_URL):
+    return base_url.rstrip("/") + "/" + str(year)
+
+
+def cache_path(url, cache_dir=CACHE_DIR):
+    # Snapshots are keyed by the full URL so different sources never collide
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, digest + ".html")
+
+
+def read_snapshot(url, cache_dir=CACHE_DIR):
+    path = cache_path(url, cache_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def is_scoreboard_page(html):
+    """True when the page holds the rendered scoreboard table (not an error page or an unrendered shell)."""
+    return bool(_SCOREBOARD_TABLE.search(html))
+
+
+def write_snapshot(url, html, cache_dir=CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = cache_path(url, cache_dir)
+    # Write to a temp file first so a crash never leaves half a page in the cache
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(html)
+    os.replace(tmp_path, path)
+
+
+class RequestsFetcher:
+    """Plain HTTP fetcher - one keep-alive session per fetcher."""
+
+    def __init__(self, timeout=30):
+        import requests
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "Mozilla/5.0 (eurovision-data-science)"
+        self.timeout = timeout
+
+    def fetch(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def close(self):
+        self.session.close()
+
+
+class SafariFetcher:
+    """Browser fetcher for pages that need JS - the driver is kept open between years."""
+
+    def __init__(self, wait=3):
+        from selenium import webdriver
+        from selenium.webdriver.safari.options import Options
+
+        options = Options()
+        options.headless = True
+        self.driver = webdriver.Safari(options=options)
+        self.wait = wait
+
+    def fetch(self, url):
+        self.driver.get(url)
+        time.sleep(self.wait)  # wait for JS
+        return self.driver.page_source
+
+    def close(self):
+        self.driver.quit()
+
+
+class FetcherPool:
+    """Bounded pool of reusable fetchers, created lazily up to `size`."""
+
+    def __init__(self, factory, size):
+        self.factory = factory
+        self.size = size
+        self.idle = queue.Queue()
+        self.created = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def fetcher(self):
+        try:
+            fetcher = self.idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                can_create = len(self.created) < self.size
+                if can_create:
+                    fetcher = self.factory()
+                    self.created.append(fetcher)
+            if not can_create:
+                fetcher = self.idle.get()
+        try:
+            yield fetcher
+        finally:
+            self.idle.put(fetcher)
+
+    def close(self):
+        for fetcher in self.created:
+            fetcher.close()
+        self.created = []
+
+
+class ScoreboardScraper:
+    """
+    Fetch many scoreboard pages at once through a bounded pool of fetchers.
+    Raw HTML is snapshotted in `cache_dir` (keyed by URL) so reruns parse offline; pages
+    without a scoreboard table are returned but not cached, so the next run fetches them again.
+    Pass cache_dir=None to always hit the source, e.g. when benchmarking a replay server.
+    """
+
+    def __init__(self, workers=8, cache_dir=CACHE_DIR, base_url=BASE_URL,
+                 fetcher_factory=RequestsFetcher, offline=False):
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self.base_url = base_url
+        self.offline = offline
+        self.pool = FetcherPool(fetcher_factory, workers)
+
+    def fetch_html(self, url):
+        if self.cache_dir:
+            html = read_snapshot(url, self.cache_dir)
+            if html is not None:
+                return html
+        if self.offline:
+            raise FileNotFoundError(f"No snapshot cached for {url}")
+
+        with self.pool.fetcher() as fetcher:
+            html = fetcher.fetch(url)
+
+        if self.cache_dir and is_scoreboard_page(html):
+            write_snapshot(url, html, self.cache_dir)
+        return html
+
+    @traced()
+    def fetch_years(self, years):
+        """Return {year: html or the exception raised while fetching it}."""
+        years = list(years)
+
+        def fetch_one(year):
+            try:
+                return self.fetch_html(year_url(year, self.base_url))
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pages = list(executor.map(fetch_one, years))
+        return dict(zip(years, pages))
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _snapshot_handler(cache_dir, source_url, delay):
+    origin = "{0.scheme}://{0.netloc}".format(urlsplit(source_url))
+
+    class SnapshotHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if delay:
+                time.sleep(delay)
+            html = read_snapshot(origin + self.path, cache_dir)
+            if html is None:
+                self.send_error(404, "No snapshot for this page")
+                return
+            body = html.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return SnapshotHandler
+
+
+@contextmanager
+def replay_server(cache_dir=CACHE_DIR, source_url=BASE_URL, delay=0.0):
+    """
+    Serve cached snapshots from a local stand-in HTTP server.
+    Yields a base URL that can be passed to ScoreboardScraper(base_url=...).
+    `delay` simulates the per-request latency of the real site.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _snapshot_handler(cache_dir, source_url, delay))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        yield f"http://{host}:{port}{urlsplit(source_url).path}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def benchmark_replay(years, worker_counts=(1, 4, 8, 16), cache_dir=CACHE_DIR, delay=0.2):
+    """Time a full scrape against the replay server for several pool sizes."""
+    years = list(years)
+    results = {}
+    with replay_server(cache_dir, delay=delay) as local_url:
+        for workers in worker_counts:
+            with ScoreboardScraper(workers=workers, cache_dir=None, base_url=local_url) as scraper:
+                start = time.perf_counter()
+                pages = scraper.fetch_years(years)
+                elapsed = time.perf_counter() - start
+            failed = sum(isinstance(p, Exception) for p in pages.values())
+            results[workers] = elapsed
+            print(f"{workers:>3} workers: {elapsed:.2f}s for {len(years)} pages ({failed} failed)")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_replay(range(1957, 2015 + 1))
@@ -0,0 +1,200 @@
+import functools
+import glob
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Directory the trace files go to. Set in the environment so worker processes trace too.
+TRACE_ENV = "EUROVISION_TRACE"
+
+_directory = os.environ.get(TRACE_ENV) or None
+if _directory:
+    _directory = os.path.abspath(_directory)
+    os.makedirs(_directory, exist_ok=True)
+_local = threading.local()
+_file_lock = threading.Lock()
+
+
+def enable(directory):
+    """Start tracing into `directory` (also for processes started from now on)."""
+    global _directory
+    os.makedirs(directory, exist_ok=True)
+    _directory = os.path.abspath(directory)
+    os.environ[TRACE_ENV] = _directory
+
+
+def disable():
+    global _directory
+    _directory = None
+    os.environ.pop(TRACE_ENV, None)
+
+
+def is_enabled():
+    return _directory is not None
+
+
+def _shape(obj):
+    """[rows, cols] of a DataFrame / array-like (or of the first item of a returned tuple), else None."""
+    if isinstance(obj, tuple) and obj:
+        obj = obj[0]
+    shape = getattr(obj, "shape", None)
+    if not isinstance(shape, tuple) or not shape:
+        return None
+    return [int(shape[0]), int(shape[1]) if len(shape) > 1 else 1]
+
+
+class Span:
+    """Measurements of one traced block; `set()` attaches extra fields (e.g. row counts)."""
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self.child_peak = 0
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+
+class _NullSpan:
+    def set(self, **fields):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _write(record):
+    path = os.path.join(_directory, f"trace.{os.getpid()}.jsonl")
+    line = json.dumps(record, default=str) + "\n"
+    with _file_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+@contextmanager
+def span(name, **fields):
+    """
+    Time a block: wall and CPU time, peak traced memory (including nested spans) and any
+    fields given here or via the yielded span's set(). A no-op while tracing is disabled.
+    """
+    if _directory is None:
+        yield _NULL_SPAN
+        return
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    # The parent's peak so far is banked before the peak counter is reset for this span
+    if stack:
+        stack[-1].child_peak = max(stack[-1].child_peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.reset_peak()
+
+    current = Span(name, dict(fields))
+    stack.append(current)
+    start_memory = tracemalloc.get_traced_memory()[0]
+    start_ts = time.time()
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    error = None
+    try:
+        yield current
+    except BaseException as e:
+        error = repr(e)
+        raise
+    finally:
+        wall = time.perf_counter() - start_wall
+        cpu = time.process_time() - start_cpu
+        peak = max(tracemalloc.get_traced_memory()[1], current.child_peak)
+        stack.pop()
+        if stack:
+            stack[-1].child_peak = max(stack[-1].child_peak, peak)
+        record = {
+            "name": name,
+            "start": start_ts,
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "peak_mb": round((peak - start_memory) / (1 << 20), 3),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "depth": len(stack),
+        }
+        if error:
+            record["error"] = error
+        record.update(current.fields)
+        _write(record)
+
+
+def traced(name=None):
+    """
+    Decorator form of span(): records the [rows, cols] of DataFrame arguments and of the
+    result as `inputs` / `output`. While tracing is disabled it only adds one check per call.
+    """
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _directory is None:
+                return func(*args, **kwargs)
+            inputs = [s for s in map(_shape, list(args) + list(kwargs.values())) if s]
+            with span(label, inputs=inputs) as current:
+                result = func(*args, **kwargs)
+                current.set(output=_shape(result))
+                return result
+
+        return wrapper
+
+    return decorate
+
+
+def read_trace(directory=None):
+    """Every span recorded in `directory` (all processes), in start order."""
+    records = []
+    for path in glob.glob(os.path.join(directory or _directory, "trace.*.jsonl")):
+        with open(path, "r", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    return sorted(records, key=lambda r: r["start"])
+
+
+def export_chrome_trace(directory=None, output=None):
+    """Write the spans as a Chrome trace (chrome://tracing, Perfetto); returns its path."""
+    directory = directory or _directory
+    output = output or os.path.join(directory, "trace.json")
+    events = []
+    for record in read_trace(directory):
+        args = {k: v for k, v in record.items() if k not in ("name", "start", "wall_s", "pid", "tid")}
+        events.append({
+            "name": record["name"],
+            "ph": "X",
+            "ts": record["start"] * 1e6,
+            "dur": record["wall_s"] * 1e6,
+            "pid": record["pid"],
+            "tid": record["tid"],
+            "args": args,
+        })
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return output
+
+
+def summary(directory=None, top=15):
+    """Lines of the slowest spans, for printing after a traced build."""
+    lines = []
+    for record in sorted(read_trace(directory), key=lambda r: -r["wall_s"])[:top]:
+        shape = f" -> {record['output'][0]}x{record['output'][1]}" if record.get("output") else ""
+        lines.append(f"{record['name']:<45} {record['wall_s']:8.3f}s wall "
+                     f"{record['cpu_s']:8.3f}s cpu {record['peak_mb']:8.1f} MB{shape}")
+    return lines
+
+
+def reset(directory=None):
+    """Remove the trace files of earlier runs."""
+    directory = directory or _directory
+    for path in glob.glob(os.path.join(directory, "trace.*.jsonl")) + [os.path.join(directory, "trace.json")]:
+        if os.path.exists(path):
+            os.remove(path)
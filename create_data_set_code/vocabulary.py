@@ -0,0 +1,247 @@
+import csv
+import json
+import numbers
+import os
+import re
+import sys
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+
+# Standard library only at import time: song_db_2 resolves country names without loading pandas.
+# pandas is imported by the encode functions, whose callers have it loaded already.
+
+BASIC_DATASETS = "basic_datasets"
+
+# Alternative country names (already normalized) -> one canonical name
+COUNTRY_ALIASES = {
+    "czechia": "czech republic",
+    "bosnia herzegovina": "bosnia and herzegovina",
+    "macedonia": "north macedonia",
+    "fyr macedonia": "north macedonia",
+    "former yugoslav republic of macedonia": "north macedonia",
+    "the netherlands": "netherlands",
+    "holland": "netherlands",
+    "russian federation": "russia",
+    "republic of moldova": "moldova",
+    "uk": "united kingdom",
+    "great britain": "united kingdom",
+    "west germany": "germany",
+    "turkiye": "turkey",
+}
+
+# Column -> registry vocabulary it is encoded against (see encode_frame)
+ENCODED_COLUMNS = {
+    "country": "countries",
+    "to_country": "countries",
+    "artist": "people",
+    "performer": "people",
+    "stage_director": "people",
+    "language": "languages",
+    "main_language": "languages",
+    "all_languages": "languages",
+}
+
+
+_non_word = re.compile(r"[^\w\s]|_")
+_spaces = re.compile(r"\s+")
+
+
+def _missing(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def normalize_text(value):
+    """Casefold, strip accents and punctuation and collapse whitespace: 'Ça  plane, pour moi!' -> 'ca plane pour moi'."""
+    if _missing(value):
+        return ""
+    if isinstance(value, numbers.Integral) or (isinstance(value, float) and value.is_integer()):
+        return str(int(value))
+    text = unicodedata.normalize("NFKD", str(value).replace("&", " and "))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    text = _non_word.sub(" ", text)
+    return _spaces.sub(" ", text).strip()
+
+
+def normalize_country(value):
+    name = normalize_text(value)
+    return COUNTRY_ALIASES.get(name, name)
+
+
+def _uniques(series):
+    import pandas as pd
+
+    return series.cat.categories if isinstance(series.dtype, pd.CategoricalDtype) else pd.unique(series)
+
+
+class Vocabulary:
+    """Interned strings: every distinct value gets one integer code, in first-seen order."""
+
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        self._dtype = None
+        for value in values:
+            self.intern(value)
+
+    def __len__(self):
+        return len(self.values)
+
+    def intern(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    @property
+    def dtype(self):
+        """One CategoricalDtype per vocabulary size, so encoded columns share their categories."""
+        if self._dtype is None or len(self._dtype.categories) != len(self.values):
+            import pandas as pd
+
+            self._dtype = pd.CategoricalDtype(self.values)
+        return self._dtype
+
+    def intern_all(self, series):
+        for value in _uniques(series):
+            if not _missing(value):
+                self.intern(value)
+        return series
+
+    def encode(self, series):
+        """
+        The column as a Categorical over the whole vocabulary: integer codes in memory,
+        strings again when written out. Columns encoded by one vocabulary share categories,
+        so merges and groupbys on them compare codes.
+        """
+        return self.intern_all(series).astype(self.dtype)
+
+    def decode(self, codes):
+        return [self.values[code] if code >= 0 else None for code in codes]
+
+
+class CountryRegistry(Vocabulary):
+    """
+    Every country once: ISO code, display name and the other names it appears under
+    (historical names, '&' spellings, the aliases of join_keys). Values are display names.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.iso = []   # code -> ISO code (lower case)
+        self._keys = {}  # normalized name or ISO code -> code
+
+    @staticmethod
+    def _key(value):
+        return normalize_country(value)
+
+    def add(self, iso, name, aliases=()):
+        code = self.lookup(iso)
+        if code is None:
+            code = self.intern(name)
+            self.iso.append(iso.lower())
+            self._keys[self._key(iso)] = code
+        for alias in (name, *aliases):
+            self._keys.setdefault(self._key(alias), code)
+        return code
+
+    def lookup(self, value):
+        """Code of a country given by ISO code or any of its names, or None."""
+        if _missing(value):
+            return None
+        return self._keys.get(self._key(value))
+
+    def name(self, value):
+        """Display name of a country given by ISO code or any name; unknown values come back unchanged."""
+        code = self.lookup(value)
+        return value if code is None else self.values[code]
+
+    def names_by_iso(self, isos=None):
+        isos = self.iso if isos is None else isos
+        return {iso: self.name(iso) for iso in isos}
+
+    def encode(self, series):
+        """
+        Country names or ISO codes as a Categorical of display names. Unknown names are kept
+        as they are, as extra categories of this column only: the registry is never changed.
+        """
+        return Vocabulary(self.values).encode(self.canonical(series))
+
+    def canonical(self, series):
+        """Every name or ISO code replaced by its display name (unknown names are kept as they are)."""
+        mapping = {value: self.name(value) for value in _uniques(series) if not _missing(value)}
+        return series.map(mapping)
+
+
+class Registry:
+    """The shared vocabularies: countries, languages and people (performers, composers, directors)."""
+
+    def __init__(self, countries):
+        self.countries = countries
+        self.languages = Vocabulary()
+        self.people = Vocabulary()
+
+    def encode_frames(self, *dfs, columns=None):
+        """
+        Encode the string columns listed in ENCODED_COLUMNS (or `columns`) of every frame, in place.
+        Every column of every frame is interned before any is cast, so the columns of one
+        vocabulary get the very same dtype across the frames and joins on them compare codes.
+        Unknown countries are categories of this call only; they don't join the registry.
+        """
+        vocabularies = {"countries": Vocabulary(self.countries.values), "languages": self.languages,
+                        "people": self.people}
+        encoded = []
+        for df in dfs:
+            df_columns = {c: v for c, v in (columns or ENCODED_COLUMNS).items() if c in df.columns}
+            for column, vocabulary in df_columns.items():
+                if vocabulary == "countries":
+                    df[column] = self.countries.canonical(df[column])
+                vocabularies[vocabulary].intern_all(df[column])
+            encoded.append((df, df_columns))
+        for df, df_columns in encoded:
+            for column, vocabulary in df_columns.items():
+                df[column] = df[column].astype(vocabularies[vocabulary].dtype)
+        return dfs
+
+    def encode_frame(self, df, columns=None):
+        """Encode one frame (see encode_frames)."""
+        return self.encode_frames(df, columns=columns)[0]
+
+
+def build_country_registry(basic_dir=BASIC_DATASETS):
+    """
+    countries.json gives the ISO codes and display names; every name contestants.csv
+    uses for a code (Czech Republic / Czechia, Bosnia & Herzegovina, ...) becomes an alias.
+    """
+    countries = CountryRegistry()
+    with open(os.path.join(basic_dir, "countries.json"), "r", encoding="utf-8") as f:
+        for iso, name in json.load(f).items():
+            countries.add(iso, name)
+
+    contestants_csv = os.path.join(basic_dir, "contestants.csv")
+    if os.path.exists(contestants_csv):
+        names = {}
+        csv.field_size_limit(sys.maxsize)  # the lyrics column is larger than the default limit
+        with open(contestants_csv, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                if row["to_country_id"] and row["to_country"]:
+                    names.setdefault(row["to_country_id"], Counter())[row["to_country"]] += 1
+        for iso, counts in names.items():
+            # Codes missing from countries.json are shown under their most used name
+            countries.add(iso, counts.most_common(1)[0][0], counts)
+    return countries
+
+
+@lru_cache(maxsize=None)
+def load_countries(basic_dir=BASIC_DATASETS):
+    """One country registry per process and source folder; encoding never changes it."""
+    return build_country_registry(basic_dir)
+
+
+def load_registry(basic_dir=BASIC_DATASETS):
+    """
+    A registry over the shared country registry, with languages and people of its own:
+    encoding frames interns into those, so they aren't shared between callers.
+    """
+    return Registry(load_countries(basic_dir))
@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from create_data_set_code.csv_cache import load_csv
+from create_data_set_code.tracing import traced
+
+VOTES_CSV = "datasets/eurovision_votes.csv"
+ENTRY_ID = "entry_id"
+
+# Wide column suffix <-> vote kind (the kind names of VoteTensor)
+SUFFIXES = {"Jury": "jury", "Televote": "tele"}
+KIND_SUFFIXES = {kind: suffix for suffix, kind in SUFFIXES.items()}
+
+# Big text columns, stored apart in the columnar cache so an entries-only load never parses them
+TEXT_COLUMNS = ["lyrics"]
+
+# voter_id of an entry's default row: the points of every voter it has no row of that kind from
+ANY_VOTER = "*"
+
+
+def votes_frame(entry_ids, voters, kinds, points, countries):
+    """
+    The stored vote rows (entry_id, voter_id, kind, points), in entry / kind / voter order.
+    Voter names become their ISO codes through `countries` (a CountryRegistry); names it
+    doesn't know (and ANY_VOTER) are kept. Points are integers whenever they all are.
+    """
+    voters = pd.Series(voters, dtype=object)
+    voter_ids = {}
+    for name in voters.unique():
+        code = countries.lookup(name)
+        voter_ids[name] = countries.iso[code] if code is not None and countries.iso[code] else name
+    points = np.asarray(points, dtype=float)
+    votes = pd.DataFrame({
+        ENTRY_ID: np.asarray(entry_ids),
+        "voter_id": voters.map(voter_ids).to_numpy(),
+        "kind": np.asarray(kinds, dtype=object),
+        "points": points.astype(int) if np.all(points == np.round(points)) else points,
+    })
+    return votes.sort_values([ENTRY_ID, "kind", "voter_id"], ignore_index=True)
+
+
+def load_votes(path=VOTES_CSV):
+    return load_csv(path)
+
+
+@traced()
+def wide_votes(votes, names):
+    """
+    The wide vote block indexed by entry_id: one "<Country> Jury" / "<Country> Televote" column
+    per voter and kind, sorted by country name. A cell no vote was stored for holds the points
+    of the entry's ANY_VOTER row of that kind, or NaN when it has none.
+    `names` maps voter ids to display names (a dict or a function).
+    """
+    name_of = names.get if isinstance(names, dict) else names
+    is_default = (votes["voter_id"] == ANY_VOTER).to_numpy()
+    defaults = votes[is_default].pivot(index=ENTRY_ID, columns="kind", values="points")
+    votes = votes[~is_default]
+    voters = pd.unique(votes["voter_id"].astype(object))
+    voter_names = {voter: name_of(voter) or voter for voter in voters}
+    columns = (votes["voter_id"].astype(object).map(voter_names) + " "
+               + votes["kind"].astype(object).map(KIND_SUFFIXES))
+
+    wide = pd.DataFrame({ENTRY_ID: votes[ENTRY_ID], "column": columns, "points": votes["points"]})
+    wide = wide.pivot(index=ENTRY_ID, columns="column", values="points").astype(float)
+    kind_order = list(SUFFIXES)
+    ordered = sorted(wide.columns, key=lambda c: (c.rpartition(" ")[0], kind_order.index(c.rpartition(" ")[2])))
+    wide = wide[ordered]
+    wide.columns.name = None
+
+    if len(defaults):
+        wide = wide.reindex(wide.index.union(defaults.index))
+        for kind in defaults.columns:
+            columns = [c for c in wide.columns if c.endswith(" " + KIND_SUFFIXES[kind])]
+            block = wide[columns].to_numpy()
+            fill = defaults[kind].reindex(wide.index).to_numpy(dtype=float)[:, None]
+            wide[columns] = np.where(np.isnan(block), fill, block)
+    return wide
+
+
+def votes_path_for(entries_path):
+    """The votes table song_db_1 writes next to the entry tables: <folder of entries_path>/eurovision_votes.csv."""
+    return os.path.join(os.path.dirname(entries_path), os.path.basename(VOTES_CSV))
+
+
+def _country_names(votes_path):
+    from create_data_set_code.vocabulary import BASIC_DATASETS, load_registry
+
+    # basic_datasets/ sits next to the datasets/ folder the votes were written to
+    basic_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(votes_path))), BASIC_DATASETS)
+    return load_registry(basic_dir if os.path.isdir(basic_dir) else BASIC_DATASETS).countries.name
+
+
+@traced()
+def with_votes(entries, votes=None, names=None):
+    """
+    The legacy wide layout on demand: `entries` with the vote columns appended.
+    votes is a votes table or the path of one (default VOTES_CSV); names defaults to the
+    display names of the country registry.
+    """
+    votes_path = votes if isinstance(votes, str) else VOTES_CSV
+    if votes is None or isinstance(votes, str):
+        votes = load_votes(votes_path)
+    if names is None:
+        names = _country_names(votes_path)
+    wide = wide_votes(votes, names)
+    block = wide.reindex(entries[ENTRY_ID].to_numpy())
+    block.index = entries.index
+    return pd.concat([entries, block], axis=1)
+
+
+def load_entries(path, columns=None, votes=False, votes_path=None):
+    """
+    Entry table (dataset_1 or final_merged) through the columnar cache. Without `columns`
+    the scalar columns are read - no lyrics text, no votes; votes=True adds the wide vote block,
+    read from votes_path (default: the eurovision_votes.csv next to `path`).
+    """
+    if columns is None:
+        header = pd.read_csv(path, nrows=0).columns
+        columns = [c for c in header if c not in TEXT_COLUMNS]
+    elif votes and ENTRY_ID not in columns:
+        columns = [ENTRY_ID] + list(columns)
+    entries = load_csv(path, columns=columns)
+    return with_votes(entries, votes_path or votes_path_for(path)) if votes else entries
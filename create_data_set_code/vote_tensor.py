@@ -0,0 +1,176 @@
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from create_data_set_code.csv_cache import cache_dir_for, file_hash, load_csv
+from create_data_set_code.tracing import traced
+
+KINDS = ["jury", "tele", "total"]
+KIND_COLUMNS = {"jury": "jury_points", "tele": "tele_points", "total": "total_points"}
+MISSING = -1  # no vote of this kind was cast (e.g. no televote before 1997)
+
+
+class VoteTensor:
+    """
+    votes.csv as a dense int16 array indexed [year, round, from_country, to_country, kind],
+    with integer-coded countries. Entries without a vote hold MISSING.
+    """
+
+    def __init__(self, data, years, rounds, countries):
+        self.data = data
+        self.years = list(years)
+        self.rounds = list(rounds)
+        self.countries = list(countries)
+        self.year_index = {y: i for i, y in enumerate(self.years)}
+        self.round_index = {r.lower(): i for i, r in enumerate(self.rounds)}
+        self.country_index = {c: i for i, c in enumerate(self.countries)}
+
+    # --- Building / persistence ---
+
+    @classmethod
+    def from_votes(cls, votes):
+        years = sorted(votes["year"].unique())
+        rounds = sorted(str(r) for r in votes["round"].unique())
+        countries = sorted(set(votes["from_country_id"].astype(str)) | set(votes["to_country_id"].astype(str)))
+
+        data = np.full((len(years), len(rounds), len(countries), len(countries), len(KINDS)), MISSING, dtype=np.int16)
+        y = np.searchsorted(years, votes["year"].to_numpy())
+        r = pd.Categorical(votes["round"].astype(str), categories=rounds).codes
+        f = pd.Categorical(votes["from_country_id"].astype(str), categories=countries).codes
+        t = pd.Categorical(votes["to_country_id"].astype(str), categories=countries).codes
+        for k, kind in enumerate(KINDS):
+            points = votes[KIND_COLUMNS[kind]]
+            valid = points.notna().to_numpy()
+            data[y[valid], r[valid], f[valid], t[valid], k] = points[valid].astype(np.int16).to_numpy()
+        return cls(data, years, rounds, countries)
+
+    @classmethod
+    @traced("VoteTensor.load")
+    def load(cls, votes_file="basic_datasets/votes.csv"):
+        """Memory-map the tensor cached for this votes.csv, building it first if needed."""
+        content_hash = file_hash(votes_file)
+        prefix = os.path.join(cache_dir_for(votes_file), f"votes.{content_hash}.tensor")
+        if not os.path.exists(prefix + ".npy"):
+            columns = ["year", "round", "from_country_id", "to_country_id"] + list(KIND_COLUMNS.values())
+            cls.from_votes(load_csv(votes_file, columns=columns)).save(prefix)
+            for old in glob.glob(os.path.join(cache_dir_for(votes_file), "votes.*.tensor.*")):
+                if not old.startswith(prefix):
+                    os.remove(old)
+
+        with open(prefix + ".json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        data = np.load(prefix + ".npy", mmap_mode="r")
+        return cls(data, meta["years"], meta["rounds"], meta["countries"])
+
+    def save(self, prefix):
+        os.makedirs(os.path.dirname(prefix) or ".", exist_ok=True)
+        np.save(prefix + ".npy", np.ascontiguousarray(self.data))
+        with open(prefix + ".json", "w", encoding="utf-8") as f:
+            json.dump({
+                "years": [int(y) for y in self.years],
+                "rounds": self.rounds,
+                "countries": self.countries,
+            }, f)
+
+    # --- Queries ---
+
+    def points(self, round="final", kind="total"):
+        """[year, from_country, to_country] slice as float with NaN where no vote was cast."""
+        block = self.data[:, self.round_index[round], :, :, KINDS.index(kind)].astype(float)
+        block[block == MISSING] = np.nan
+        return block
+
+    def given(self, from_country, to_country, round="final", kind="total"):
+        """What `from_country` gave `to_country` in every year, as a Series indexed by year."""
+        f = self.country_index[from_country]
+        t = self.country_index[to_country]
+        # Only this one vector is read and converted, not the whole [year, from, to] block
+        given = self.data[:, self.round_index[round], f, t, KINDS.index(kind)].astype(float)
+        given[given == MISSING] = np.nan
+        return pd.Series(given, index=self.years, name=f"{from_country}->{to_country}")
+
+    def totals_received(self, year, round="final", kind="total"):
+        block = self.points(round, kind)[self.year_index[year]]
+        received = np.nansum(block, axis=0)
+        voted_for = ~np.isnan(block).all(axis=0)
+        return pd.Series(received[voted_for], index=np.array(self.countries)[voted_for])
+
+    def totals_given(self, year, round="final", kind="total"):
+        block = self.points(round, kind)[self.year_index[year]]
+        given = np.nansum(block, axis=1)
+        voted = ~np.isnan(block).all(axis=1)
+        return pd.Series(given[voted], index=np.array(self.countries)[voted])
+
+    def by_voter_name(self, names, round="final", kind="total"):
+        """
+        The [year, from_country, to_country] block with the voters grouped by name:
+        (voter names, their mean points as a [year, voter name, to_country] array,
+        a [year, to_country] mask of who received a vote). Voters without a name are dropped,
+        as are names that never voted.
+        """
+        block = self.points(round, kind)
+        has_vote = ~np.isnan(block)
+
+        voter_names = pd.Series(self.countries).map(names)
+        has_vote &= voter_names.notna().to_numpy()[None, :, None]
+        named, means = [], []
+        for name in sorted(voter_names.dropna().unique()):
+            voters = np.flatnonzero((voter_names == name).to_numpy())
+            counts = has_vote[:, voters, :].sum(axis=1)
+            if not counts.any():
+                continue
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means.append(np.nansum(block[:, voters, :], axis=1) / counts)
+            named.append(name)
+        values = np.stack(means, axis=1) if means else np.empty((len(self.years), 0, len(self.countries)))
+        return named, values, has_vote.any(axis=1)
+
+    @traced()
+    def wide_votes(self, names, round="final", suffixes=(("jury", "Jury"), ("tele", "Televote"))):
+        """
+        Rebuild the wide "<Country> Jury" / "<Country> Televote" block of eurovision_dataset_1:
+        one row per (year, to_country_id) that received a vote of any listed kind,
+        one column per voter name (voter ids mapping to the same name are averaged).
+        """
+        frames = []
+        for kind, suffix in suffixes:
+            voter_names, values, received = self.by_voter_name(names, round, kind)
+            year_idx, to_idx = np.nonzero(received)
+            frame = pd.DataFrame({
+                "year": np.array(self.years)[year_idx],
+                "to_country_id": np.array(self.countries)[to_idx],
+            })
+            for i, name in enumerate(voter_names):
+                frame[f"{name} {suffix}"] = np.nan_to_num(values[year_idx, i, to_idx], nan=0.0)
+            frames.append(frame)
+
+        wide = frames[0]
+        for frame in frames[1:]:
+            wide = pd.merge(wide, frame, on=["year", "to_country_id"], how="outer")
+        return wide.fillna(0)
+
+    @traced()
+    def long_votes(self, names, round="final", kinds=("jury", "tele")):
+        """
+        The recorded cells of wide_votes as rows (year, to_country_id, voter, kind, points), without
+        building the wide block: one row per voter name, kind and (year, to_country_id) it voted on
+        in this round. Cells without a vote aren't rows (wide_votes shows them as 0).
+        """
+        frames = []
+        for kind in kinds:
+            voter_names, values, received = self.by_voter_name(names, round, kind)
+            year_idx, to_idx = np.nonzero(received)
+            # [row, voter name] -> one row per recorded cell, row-major like the wide block
+            cells = values[year_idx, :, to_idx]
+            rows, voters = np.nonzero(~np.isnan(cells))
+            frames.append(pd.DataFrame({
+                "year": np.array(self.years)[year_idx[rows]],
+                "to_country_id": np.array(self.countries)[to_idx[rows]],
+                "voter": np.array(voter_names, dtype=object)[voters],
+                "kind": kind,
+                "points": cells[rows, voters],
+            }))
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,117 @@
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+import pandas as pd
+
+from create_data_set_code.vocabulary import Vocabulary
+
+
+class _Dimension:
+    """
+    Prefix sums of one dimension: prefix[i, k] is key k's count over the first i years.
+    Rows and columns grow by doubling, so appending a year copies one row, not the table.
+    """
+
+    def __init__(self):
+        self.keys = Vocabulary()
+        self.prefix = np.zeros((16, 8), dtype=np.int64)
+
+    def _reserve(self, rows, columns):
+        if rows <= self.prefix.shape[0] and columns <= self.prefix.shape[1]:
+            return
+        grown = np.zeros((max(rows, 2 * self.prefix.shape[0]), max(columns, 2 * self.prefix.shape[1])),
+                         dtype=np.int64)
+        grown[:self.prefix.shape[0], :self.prefix.shape[1]] = self.prefix
+        self.prefix = grown
+
+    def append(self, n_years, counts):
+        """Row n_years + 1 = row n_years + this year's counts (new keys start at zero in every earlier row)."""
+        codes = [(self.keys.intern(key), n) for key, n in counts.items()]
+        self._reserve(n_years + 2, len(self.keys))
+        row = self.prefix[n_years + 1]
+        row[:] = self.prefix[n_years]
+        for code, n in codes:
+            row[code] += n
+
+    def add(self, n_years, counts):
+        """Add to the last year's counts (another entry of that same year)."""
+        codes = [(self.keys.intern(key), n) for key, n in counts.items()]
+        self._reserve(n_years + 1, len(self.keys))
+        for code, n in codes:
+            self.prefix[n_years, code] += n
+
+    def rows(self, n_years):
+        return self.prefix[:n_years + 1, :len(self.keys)]
+
+
+class YearStats:
+    """
+    Running counts per year for a few dimensions (e.g. wins by language, entries by country),
+    kept as prefix sums over the contest years. Adding a year appends one prefix row per
+    dimension; the count of any key over any range of years is one subtraction of two rows,
+    and cumulative or rolling tables are row differences of the prefix array.
+
+    Years are contest years in increasing order (missing years like 2020 simply have no row);
+    `start` / `end` bounds are inclusive calendar years.
+    """
+
+    def __init__(self, dimensions=()):
+        self.years = []
+        self._dimensions = {name: _Dimension() for name in dimensions}
+
+    def add_year(self, year, counts):
+        """
+        counts: {dimension: {key: count}} for this year; dimensions left out count nothing.
+        A year equal to the last one adds to it, an earlier year is an error.
+        """
+        unknown = set(counts) - set(self._dimensions)
+        if unknown:
+            raise ValueError(f"Unknown dimension(s): {', '.join(sorted(unknown))}")
+        if self.years and year < self.years[-1]:
+            raise ValueError(f"Years must be added in order: {year} after {self.years[-1]}")
+
+        n = len(self.years)
+        if self.years and year == self.years[-1]:
+            for name, dimension_counts in counts.items():
+                self._dimensions[name].add(n, dimension_counts)
+            return
+        for name, dimension in self._dimensions.items():
+            dimension.append(n, counts.get(name, {}))
+        self.years.append(year)
+
+    def keys(self, dimension):
+        return list(self._dimensions[dimension].keys.values)
+
+    def _span(self, start, end):
+        """Prefix rows (lo, hi) bounding the years in [start, end]."""
+        lo = 0 if start is None else bisect_left(self.years, start)
+        hi = len(self.years) if end is None else bisect_right(self.years, end)
+        return lo, max(lo, hi)
+
+    def _frame(self, dimension, values, lo, hi):
+        return pd.DataFrame(values, index=pd.Index(self.years[lo:hi], name="year"), columns=self.keys(dimension))
+
+    def total(self, dimension, start=None, end=None):
+        """Count of every key over the years in [start, end], as a Series."""
+        lo, hi = self._span(start, end)
+        rows = self._dimensions[dimension].rows(len(self.years))
+        return pd.Series(rows[hi] - rows[lo], index=self.keys(dimension))
+
+    def per_year(self, dimension, start=None, end=None):
+        """Year x key table of each year's own counts."""
+        lo, hi = self._span(start, end)
+        rows = self._dimensions[dimension].rows(len(self.years))
+        return self._frame(dimension, rows[lo + 1:hi + 1] - rows[lo:hi], lo, hi)
+
+    def cumulative(self, dimension, start=None, end=None):
+        """Year x key table of the counts from `start` up to and including each year."""
+        lo, hi = self._span(start, end)
+        rows = self._dimensions[dimension].rows(len(self.years))
+        return self._frame(dimension, rows[lo + 1:hi + 1] - rows[lo], lo, hi)
+
+    def rolling(self, dimension, window, start=None, end=None):
+        """Year x key table of the counts over the last `window` contest years up to each year."""
+        lo, hi = self._span(start, end)
+        rows = self._dimensions[dimension].rows(len(self.years))
+        ends = np.arange(lo + 1, hi + 1)
+        return self._frame(dimension, rows[ends] - rows[np.maximum(ends - window, 0)], lo, hi)
@@ -1,12 +1,23 @@
-from create_data_set_code import extract_song_db_2, extract_song_db_1, lgtbq_artist_list, merge_datasets
+import argparse
 
+from create_data_set_code import pipeline, tracing
 
-def create_dataset():
-    extract_song_db_1.main()  # mute this command if dataset1 exists - takes long
-    extract_song_db_2.main()
-    lgtbq_artist_list.main()
-    merge_datasets.merge_datasets()
+
+def create_dataset(force=()):
+    # Stages whose inputs haven't changed are skipped; independent stages run in parallel
+    return pipeline.run(force=force)
 
 
 if __name__ == '__main__':
-    create_dataset()
+    parser = argparse.ArgumentParser(description="Build the Eurovision datasets")
+    parser.add_argument('--force', action='append', default=[], metavar='STAGE',
+                        choices=[stage.name for stage in pipeline.STAGES],
+                        help="rebuild STAGE and everything downstream of it (can be repeated)")
+    parser.add_argument('--workers', type=int, default=None, help="max stages running at once")
+    parser.add_argument('--trace', metavar='DIR',
+                        help="record per-stage timings and memory to DIR (JSON lines + Chrome trace)")
+    args = parser.parse_args()
+    if args.trace:
+        tracing.enable(args.trace)
+        tracing.reset()
+    pipeline.run(force=args.force, max_workers=args.workers)
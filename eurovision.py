@@ -0,0 +1,198 @@
+import argparse
+import os
+import sys
+
+# Only the standard library at the top: every subcommand imports what it needs when it runs,
+# so `python eurovision.py words --winners` never loads pandas, matplotlib or selenium.
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib", "seaborn", "selenium", "bs4", "requests", "lxml", "wikipedia")
+
+
+def _chdir(relative):
+    """Most scripts use paths relative to their own folder (e.g. '../datasets')."""
+    os.chdir(os.path.join(ROOT, relative))
+
+
+def _years(text):
+    first, _, last = text.partition("-")
+    return range(int(first), int(last or first) + 1)
+
+
+def build(args):
+    from create_data_set_code import pipeline, tracing
+
+    names = [stage.name for stage in pipeline.STAGES]
+    unknown = [name for name in args.force if name not in names]
+    if unknown:
+        raise SystemExit(f"Unknown stage(s) {', '.join(unknown)}; choose from {', '.join(names)}")
+    if args.trace:
+        tracing.enable(args.trace)
+        tracing.reset()
+    pipeline.run(force=args.force, max_workers=args.workers)
+
+
+def scrape(args):
+    _chdir(".")
+    if not args.lgbtq_only:
+        from create_data_set_code import scoreboard_scraper as scoreboards
+
+        fetcher = scoreboards.SafariFetcher if args.safari else scoreboards.RequestsFetcher
+        # Without a cache dir every page is fetched; the fresh snapshots are written below
+        cache_dir = None if args.refresh else scoreboards.CACHE_DIR
+        with scoreboards.ScoreboardScraper(args.workers, cache_dir, fetcher_factory=fetcher) as scraper:
+            pages = scraper.fetch_years(_years(args.years))
+        if args.refresh:
+            for year, html in pages.items():
+                if not isinstance(html, Exception) and scoreboards.is_scoreboard_page(html):
+                    scoreboards.write_snapshot(scoreboards.year_url(year), html)
+        failed = {year: page for year, page in pages.items() if isinstance(page, Exception)}
+        print(f"🌐 {len(pages) - len(failed)} scoreboard pages cached ({len(failed)} failed)")
+        for year, error in sorted(failed.items()):
+            print(f"  {year}: {error}")
+
+    if not args.scoreboards_only:
+        from create_data_set_code.lgtbq_artist_list import fetch_page
+
+        html = fetch_page(refresh=args.refresh)
+        print(f"🌈 LGBTQ artists page cached ({len(html):,} characters)")
+
+
+def audio(args):
+    from create_data_set_code import extract_audio_features as features
+
+    _chdir(".")
+    if args.step == "all":
+        features.main()
+    elif args.step == "download":
+        features.download_audio(workers=args.workers or 4)
+    elif args.step == "extract":
+        features.extract_audio_features(workers=args.workers)
+    else:
+        features.json_features_to_csv(workers=args.workers)
+
+
+def words(args):
+    from create_data_set_code import lyrics_index
+
+    selectors = {
+        "winners": lyrics_index.winners,
+        "top_three": lyrics_index.top_three,
+        "bottom_three": lyrics_index.bottom_three,
+        "non_finalists": lyrics_index.non_finalists,
+        "losers": lyrics_index.losers,
+    }
+    # Paths given on the command line are relative to where it was run
+    source = os.path.abspath(args.source) if args.source else lyrics_index.EUROVISION_JSON
+    index_file = os.path.abspath(args.index) if args.index else lyrics_index.INDEX_FILE
+    _chdir("create_data_set_code")
+    if not os.path.exists(source):
+        raise SystemExit(f"No contest data at {os.path.abspath(source)}: the lyrics index is built from "
+                         "eurovision.json - add it to basic_datasets/ or pass --source")
+
+    cache = lyrics_index.QueryCache(index_file, source)
+    key = f"{args.group}:{args.vs}:{args.n}"
+    ranked = cache.get(key)
+    if ranked is None:
+        index = lyrics_index.load_index(index_file)
+        if lyrics_index.is_stale(index, source):
+            lyrics_index.update_index(index, source)
+            lyrics_index.save_index(index, index_file)
+        selector = selectors[args.group]
+        if args.vs:
+            ranked = lyrics_index.over_represented(index, selector, selectors[args.vs], n=args.n)
+        else:
+            ranked = lyrics_index.top_words(index, selector, n=args.n)
+        cache.put(key, ranked)
+
+    for word, value in ranked:
+        print(f"{word:<20} {value:6.3f}" if args.vs else f"{word:<20} {value:6d}")
+
+
+def plots(args):
+    out_dir = os.path.abspath(args.out) if args.out else None
+    if args.batch:
+        os.environ.setdefault("MPLBACKEND", "Agg")  # never needs a display
+    sys.path.insert(0, os.path.join(ROOT, "analysing"))
+    import winner_langugue
+
+    _chdir("analysing")
+    winner_langugue.main(args.batch, out_dir or winner_langugue.FIGURES_DIR, tuple(args.format or ["png"]),
+                         args.dpi, args.workers)
+
+
+def serve(args):
+    from create_data_set_code import query_api
+
+    _chdir(".")
+    query_api.serve(args.host, args.port, args.reload_interval)
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog="eurovision", description="Eurovision dataset tools")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    p = commands.add_parser("build", help="build the datasets (only stages whose inputs changed)")
+    p.add_argument("--force", action="append", default=[], metavar="STAGE",
+                   help="rebuild STAGE and everything downstream of it (can be repeated)")
+    p.add_argument("--workers", type=int, default=None, help="max stages running at once")
+    p.add_argument("--trace", metavar="DIR", help="record per-stage timings and memory to DIR")
+    p.set_defaults(handler=build)
+
+    p = commands.add_parser("scrape", help="fetch and cache the scoreboard and LGBTQ artist pages")
+    p.add_argument("--years", default="1957-2015", help="year or range of scoreboards, e.g. 1990-2000")
+    p.add_argument("--workers", type=int, default=8)
+    p.add_argument("--refresh", action="store_true", help="fetch again even if a snapshot is cached")
+    p.add_argument("--safari", action="store_true", help="use the Safari webdriver instead of plain HTTP")
+    only = p.add_mutually_exclusive_group()
+    only.add_argument("--scoreboards-only", action="store_true")
+    only.add_argument("--lgbtq-only", action="store_true")
+    p.set_defaults(handler=scrape)
+
+    p = commands.add_parser("audio", help="download songs and extract their audio features")
+    p.add_argument("--step", choices=["all", "download", "extract", "table"], default="all")
+    p.add_argument("--workers", type=int, default=None)
+    p.set_defaults(handler=audio)
+
+    p = commands.add_parser("words", help="most frequent lyrics words of a group of songs")
+    group = p.add_mutually_exclusive_group()
+    group.add_argument("--winners", dest="group", action="store_const", const="winners")
+    group.add_argument("--top-three", dest="group", action="store_const", const="top_three")
+    group.add_argument("--bottom-three", dest="group", action="store_const", const="bottom_three")
+    group.add_argument("--non-finalists", dest="group", action="store_const", const="non_finalists")
+    group.add_argument("--losers", dest="group", action="store_const", const="losers",
+                       help="bottom three and non-finalists")
+    p.add_argument("--vs", choices=["winners", "top_three", "bottom_three", "non_finalists", "losers"],
+                   help="rank words over-represented compared to this group instead")
+    p.add_argument("-n", type=int, default=20, help="number of words")
+    p.add_argument("--source", help="eurovision.json to index (default: basic_datasets/eurovision.json)")
+    p.add_argument("--index", help="lyrics index file (default: datasets/lyrics_index.json)")
+    p.set_defaults(handler=words, group="winners")
+
+    p = commands.add_parser("plots", help="draw the winner language plots")
+    p.add_argument("--batch", action="store_true",
+                   help="save every figure to files instead of showing them (no display needed)")
+    p.add_argument("--out", help="folder for the figures and their index (default: datasets/figures)")
+    p.add_argument("--format", action="append", choices=["png", "svg", "pdf"],
+                   help="file format (can be repeated, default png)")
+    p.add_argument("--dpi", type=int, default=150)
+    p.add_argument("--workers", type=int, default=None)
+    p.set_defaults(handler=plots)
+
+    p = commands.add_parser("serve", help="read-only HTTP API over the merged dataset")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--reload-interval", type=float, default=2.0,
+                   help="seconds between checks for a rebuilt dataset (0 disables hot reload)")
+    p.set_defaults(handler=serve)
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    sys.path.insert(0, ROOT)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
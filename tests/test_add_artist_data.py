@@ -0,0 +1,64 @@
+import json
+
+import pandas as pd
+
+from create_data_set_code import pipeline
+from create_data_set_code.add_artist_data import (FixtureSource, enrich_artists, fixture_name,
+                                                  get_freddie_mercury_info)
+
+PAGES = {
+    "Freddie Mercury": {
+        "title": "Freddie Mercury",
+        "summary": "Freddie Mercury (born Farrokh Bulsara; September 5, 1946) was a British singer.",
+        "content": "He died November 24, 1991. Years active 1969–1991. His partner Jim Hutton...",
+    },
+    "ABBA": {
+        "title": "ABBA",
+        "summary": "ABBA is a Swedish pop supergroup formed in Stockholm in 1972.",
+        "content": "Years active 1972–1982, 2016–present",
+    },
+}
+
+
+def write_fixtures(directory):
+    for artist, page in PAGES.items():
+        (directory / fixture_name(artist)).write_text(json.dumps(page), encoding="utf-8")
+    return FixtureSource(str(directory))
+
+
+def test_enrich_artists_offline(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    fixtures.mkdir()
+    source = write_fixtures(fixtures)
+    merged = tmp_path / "final_merged.csv"
+    pd.DataFrame({"artist": ["ABBA", "Freddie Mercury", "ABBA", "Nobody Known"]}).to_csv(merged, index=False)
+    output = tmp_path / "artist_info.csv"
+    cache = tmp_path / "cache"
+
+    info = enrich_artists(str(merged), str(output), source=source, workers=2, cache_dir=str(cache))
+    assert info["artist"].tolist() == ["ABBA", "Freddie Mercury", "Nobody Known"]
+    assert info["band_info"].tolist()[:2] == ["Band", "Solo performer"]
+    assert info["years_active"].tolist()[:2] == [10, 22]
+    assert info.loc[1, "birth_date"] == "September 5, 1946"
+    # No page: nothing is known about the artist
+    assert info.iloc[2].drop("artist").isna().all()
+    assert pd.read_csv(output)["artist"].tolist() == info["artist"].tolist()
+
+    # Misses are cached too, so a rerun needs none of the pages
+    enrich_artists(str(merged), str(output), source=FixtureSource(str(tmp_path / "empty")), cache_dir=str(cache))
+    assert pd.read_csv(output)["band_info"].tolist()[:2] == ["Band", "Solo performer"]
+
+
+def test_freddie_mercury_info(tmp_path):
+    source = write_fixtures(tmp_path)
+    assert get_freddie_mercury_info(source) == {
+        "birth_date": "September 5, 1946",
+        "sexual_orientation": "Gay",
+        "years_active": 22,
+        "band_info": "Solo performer",
+    }
+
+
+def test_artists_stage_runs_after_the_merge():
+    assert pipeline.dependencies(pipeline.STAGES)["artists"] == {"merge"}
+    assert "artists" in pipeline.downstream(pipeline.STAGES, "song_db_1")
@@ -0,0 +1,120 @@
+import json
+import os
+import stat
+import sys
+import textwrap
+
+from create_data_set_code.audio_extraction import Manifest, output_path_for, partial_path_for, run_extractions
+from create_data_set_code.audio_features_table import find_json_files
+
+# Stands in for streaming_extractor_music: logs each call, writes JSON features for the input,
+# and for inputs named 'bad*' writes half an output and fails
+FAKE_EXTRACTOR = textwrap.dedent("""\
+    #!{python}
+    import json, os, sys
+    mp3, output = sys.argv[1], sys.argv[2]
+    with open(os.environ["FAKE_EXTRACTOR_LOG"], "a") as log:
+        log.write(os.path.basename(mp3) + "\\n")
+    with open(output, "w") as f:
+        if os.path.basename(mp3).startswith("bad"):
+            f.write('{{"truncat')
+            sys.exit(1)
+        json.dump({{"source": os.path.basename(mp3)}}, f)
+""")
+
+
+def make_extractor(tmp_path, monkeypatch):
+    script = tmp_path / "fake_extractor"
+    script.write_text(FAKE_EXTRACTOR.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    log = tmp_path / "calls.log"
+    monkeypatch.setenv("FAKE_EXTRACTOR_LOG", str(log))
+    return str(script), log
+
+
+def calls(log):
+    return log.read_text().split() if log.exists() else []
+
+
+def make_mp3s(tmp_path, *names):
+    paths = []
+    for name in names:
+        path = tmp_path / f"{name}.mp3"
+        path.write_bytes(b"ID3")
+        paths.append(str(path))
+    return paths
+
+
+def run(files, manifest_path, extractor, **kwargs):
+    return run_extractions(files, manifest_path, extractor=extractor, workers=2, retries=0,
+                           report=lambda message: None, **kwargs)
+
+
+def test_extracts_and_resumes_from_the_manifest(tmp_path, monkeypatch):
+    extractor, log = make_extractor(tmp_path, monkeypatch)
+    files = make_mp3s(tmp_path, "a", "b")
+    manifest_path = str(tmp_path / "manifest.json")
+
+    manifest = run(files, manifest_path, extractor)
+    assert sorted(manifest.completed) == sorted(files)
+    for mp3 in files:
+        with open(output_path_for(mp3)) as f:
+            assert json.load(f) == {"source": os.path.basename(mp3)}
+        assert not os.path.exists(partial_path_for(mp3))
+
+    run(files, manifest_path, extractor)
+    assert sorted(calls(log)) == ["a.mp3", "b.mp3"]  # nothing extracted twice
+
+
+def test_output_unknown_to_the_manifest_is_extracted_again(tmp_path, monkeypatch):
+    extractor, log = make_extractor(tmp_path, monkeypatch)
+    (mp3,) = make_mp3s(tmp_path, "a")
+    # Left behind by a run that was killed before it recorded the file
+    with open(output_path_for(mp3), "w") as f:
+        f.write('{"trunc')
+
+    manifest = run([mp3], str(tmp_path / "manifest.json"), extractor)
+    assert mp3 in manifest.completed
+    assert calls(log) == ["a.mp3"]
+    with open(output_path_for(mp3)) as f:
+        assert json.load(f) == {"source": "a.mp3"}
+
+
+def test_completed_file_whose_output_is_gone_is_extracted_again(tmp_path, monkeypatch):
+    extractor, log = make_extractor(tmp_path, monkeypatch)
+    (mp3,) = make_mp3s(tmp_path, "a")
+    manifest_path = str(tmp_path / "manifest.json")
+
+    run([mp3], manifest_path, extractor)
+    os.remove(output_path_for(mp3))
+    run([mp3], manifest_path, extractor)
+    assert calls(log) == ["a.mp3", "a.mp3"]
+    assert os.path.exists(output_path_for(mp3))
+
+
+def test_failed_extraction_leaves_no_output(tmp_path, monkeypatch):
+    extractor, log = make_extractor(tmp_path, monkeypatch)
+    bad, good = make_mp3s(tmp_path, "bad", "good")
+    manifest_path = str(tmp_path / "manifest.json")
+
+    manifest = run([bad, good], manifest_path, extractor)
+    assert list(manifest.completed) == [good]
+    assert manifest.failed[bad]["error"] == "exit code 1"
+    assert not os.path.exists(output_path_for(bad))
+    assert not os.path.exists(partial_path_for(bad))
+
+    # Failures are kept in the manifest and skipped until asked for again
+    assert bad in Manifest(manifest_path).failed
+    run([bad, good], manifest_path, extractor)
+    assert calls(log).count("bad.mp3") == 1
+    run([bad, good], manifest_path, extractor, retry_failed=True)
+    assert calls(log).count("bad.mp3") == 2
+
+
+def test_only_finished_outputs_are_ingested(tmp_path):
+    done, running = make_mp3s(tmp_path, "done", "running")
+    for path in (output_path_for(done), partial_path_for(running), str(tmp_path / "manifest.json")):
+        with open(path, "w") as f:
+            f.write("{}")
+
+    assert find_json_files(str(tmp_path)) == [output_path_for(done)]
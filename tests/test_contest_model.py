@@ -0,0 +1,20 @@
+from benchmarks.synthetic_data import SyntheticContests
+from create_data_set_code.contest_model import Contest
+
+
+def test_national_selection_losers_are_not_semifinalists():
+    contest, contestant_rows, votes = SyntheticContests(scale=3).contest(60)
+    model = Contest.from_dict(contest)
+    base, _, base_votes = SyntheticContests(scale=1).contest(60)
+
+    # The contest itself is the one of scale 1, its selection losers come on top
+    assert contest["contestants"][:len(base["contestants"])] == base["contestants"]
+    assert [c.id for c in model.semi_only] == [c.id for c in Contest.from_dict(base).semi_only]
+    losers = [c.id for c in model.contestants if c.id >= len(base["contestants"])]
+    assert len(losers) == 2 * len(base["contestants"])
+    assert {model.round_reached(i) for i in losers} == {"selection"}
+    assert all(row["place_contest"] is None for row in contestant_rows[len(base["contestants"]):])
+
+    # Every selection heat is voted on, so the vote rows grow with the entries
+    assert len(votes) > 2 * len(base_votes)
+    assert len({vote[1:4] for vote in votes}) == len(votes)
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from create_data_set_code.join_keys import join
+
+ENTRIES = pd.DataFrame({
+    "artist": ["Conchita Wurst", "Måneskin", "Loreen"],
+    "country": ["Austria", "Italy", "Sweden"],
+    "year": [2014, 2021, 2012],
+})
+
+
+def test_duplicate_right_keys_are_counted():
+    # The second Conchita row only differs in case and accents, so it has the same normalized key
+    lgbtq = pd.DataFrame({
+        "artist": ["Conchita Wurst", "conchita wurst", "Dana International", "Dana International"],
+        "country": ["Austria", "Austria", "Israel", "Israel"],
+        "year": [2014, 2014, 1998, 1998],
+        "artist sexuality": ["gay", "queer", "trans", "trans"],
+    })
+
+    joined, stats = join(ENTRIES, lgbtq, on=["artist", "country", "year"])
+    assert joined["artist sexuality"].iloc[0] == "gay"
+    assert joined["artist sexuality"].isna().tolist() == [False, True, True]
+    assert stats["matched"] == 1
+    assert stats["right_only"] == 1  # Dana International, once
+    assert stats["right_duplicates"] == 2
+
+    full, _ = join(ENTRIES, lgbtq, on=["artist", "country", "year"], how="full")
+    assert len(full) == len(ENTRIES) + 1
+
+
+def test_unique_right_side_has_no_duplicates():
+    lgbtq = pd.DataFrame({"artist": ["Maneskin"], "country": ["Italy"], "year": [2021], "artist sexuality": ["bi"]})
+    _, stats = join(ENTRIES, lgbtq, on=["artist", "country", "year"])
+    assert stats["right_duplicates"] == 0
+    assert stats["matched"] == stats["matched_after_normalization"] == 1
@@ -0,0 +1,58 @@
+import json
+
+from create_data_set_code.lyrics_index import (empty_index, non_finalists, over_represented, top_words,
+                                               update_index, winners)
+
+
+def contest(year, songs):
+    """songs: (country, English lyrics, place in the final or None for a semifinal-only entry)"""
+    contestants = [
+        {"id": i, "country": country, "lyrics": [{"languages": ["English"], "content": text}]}
+        for i, (country, text, _) in enumerate(songs)
+    ]
+    final = [{"contestantId": i, "place": place} for i, (_, _, place) in enumerate(songs) if place]
+    semi = [{"contestantId": i} for i in range(len(songs))]
+    return {"year": year, "contestants": contestants,
+            "rounds": [{"name": "semifinal", "performances": semi}, {"name": "final", "performances": final}]}
+
+
+def write_source(path, contests):
+    path.write_text(json.dumps(contests), encoding="utf-8")
+    return str(path)
+
+
+def build(source):
+    index = empty_index()
+    update_index(index, source)
+    return index
+
+
+CONTESTS = [
+    contest(1998, [("IL", "diva viva diva", 1), ("MT", "love love me", 2), ("NL", "hello goodbye", None)]),
+    contest(1999, [("SE", "take me to your heaven love", 1), ("IS", "all out of luck luck", 2),
+                   ("DE", "reise nach jerusalem love", None)]),
+]
+
+
+def test_queries_read_the_postings(tmp_path):
+    index = build(write_source(tmp_path / "eurovision.json", CONTESTS))
+    assert top_words(index, winners, n=3) == [("diva", 2), ("heaven", 1), ("love", 1)]
+    assert top_words(index, non_finalists, n=10) == [
+        ("goodbye", 1), ("hello", 1), ("jerusalem", 1), ("love", 1), ("nach", 1), ("reise", 1)]
+    assert [token for token, _ in over_represented(index, winners, non_finalists, min_count=2)] == ["diva"]
+
+
+def test_changed_year_is_reindexed_like_a_fresh_build(tmp_path):
+    source = write_source(tmp_path / "eurovision.json", CONTESTS)
+    index = build(source)
+
+    changed = CONTESTS[:1] + [contest(1999, [("SE", "heaven heaven", 1), ("IS", "luck", None)])]
+    write_source(tmp_path / "eurovision.json", changed)
+    assert update_index(index, source) == [1999]
+
+    fresh = build(write_source(tmp_path / "fresh.json", changed))
+    assert "jerusalem" not in index["postings"]
+    for selector in (winners, non_finalists):
+        assert top_words(index, selector) == top_words(fresh, selector)
+    assert over_represented(index, winners, non_finalists, min_count=1) == \
+        over_represented(fresh, winners, non_finalists, min_count=1)
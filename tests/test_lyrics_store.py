@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from create_data_set_code.lyrics_store import VERSIONS, LyricsStore, LyricsWriter
+
+SONGS = [
+    {"original": "Ein bißchen Frieden\nein bißchen Sonne", "english": "A little peace\na little sun"},
+    {"original": "Waterloo, I was defeated", "english": "Waterloo, I was defeated"},  # identical texts
+    {"original": None, "english": None},
+    {"original": "Ne partez pas sans moi"},  # no english version
+    {},
+    {"original": "", "english": "ünïcödé ✓"},  # empty lyrics are kept apart from no lyrics
+]
+
+
+def write_store(directory, songs, versions=VERSIONS):
+    with LyricsWriter(str(directory), versions) as writer:
+        return [writer.add(**song) for song in songs]
+
+
+def test_round_trip(tmp_path):
+    ids = write_store(tmp_path, SONGS)
+    assert ids == list(range(len(SONGS)))
+
+    with LyricsStore(str(tmp_path)) as store:
+        assert len(store) == len(SONGS)
+        for lyrics_id, song in zip(ids, SONGS):
+            for version in VERSIONS:
+                assert store.get(lyrics_id, version) == song.get(version)
+        assert list(store.iter(version="original")) == [(i, song.get("original")) for i, song in enumerate(SONGS)]
+        assert list(store.iter([3, 1], "english")) == [(3, None), (1, "Waterloo, I was defeated")]
+
+
+def test_identical_versions(tmp_path):
+    # Compressed once and written to both blobs
+    write_store(tmp_path, SONGS[1:2])
+    blobs = {version: (tmp_path / f"{version}.blob").read_bytes() for version in VERSIONS}
+    assert blobs["original"] == blobs["english"] != b""
+    with LyricsStore(str(tmp_path)) as store:
+        assert store.get(0, "original") == store.get(0, "english") == SONGS[1]["english"]
+
+
+def test_version_without_any_lyrics(tmp_path):
+    write_store(tmp_path, [{"original": "Only the original"}, {"original": None}])
+    assert os.path.getsize(tmp_path / "english.blob") == 0
+
+    with LyricsStore(str(tmp_path)) as store:
+        assert list(store.iter(version="english")) == [(0, None), (1, None)]
+        assert store.get(0, "original") == "Only the original"
+
+
+def test_empty_store(tmp_path):
+    write_store(tmp_path, [])
+    with LyricsStore(str(tmp_path)) as store:
+        assert len(store) == 0
+        assert list(store.iter()) == []
+        with pytest.raises(KeyError):
+            store.get(0)
+
+
+def test_failed_write_keeps_the_previous_store(tmp_path):
+    write_store(tmp_path, SONGS[:1])
+    with pytest.raises(RuntimeError):
+        with LyricsWriter(str(tmp_path)) as writer:
+            writer.add(original="half written")
+            raise RuntimeError("interrupted")
+
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{v}.{ext}" for v in VERSIONS for ext in ("blob", "idx"))
+    with LyricsStore(str(tmp_path)) as store:
+        assert len(store) == 1
+        assert store.get(0, "english") == SONGS[0]["english"]
+
+
+def test_unknown_version(tmp_path):
+    with LyricsWriter(str(tmp_path)) as writer:
+        with pytest.raises(ValueError):
+            writer.add(french="Ne partez pas sans moi")
+    with LyricsStore(str(tmp_path)) as store:
+        with pytest.raises(ValueError):
+            store.get(0, "french")
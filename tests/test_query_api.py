@@ -0,0 +1,34 @@
+import json
+
+import pandas as pd
+
+from create_data_set_code.query_api import Dataset
+
+
+def write_files(directory):
+    (directory / "countries.json").write_text(json.dumps({"cz": "Czechia", "nl": "Netherlands"}), encoding="utf-8")
+    pd.DataFrame({
+        "year": [2007, 2021], "to_country_id": ["cz", "nl"], "to_country": ["Czech Republic", "Netherlands"],
+    }).to_csv(directory / "contestants.csv", index=False)
+    pd.DataFrame({
+        "year": [2007, 2021], "country": ["Czech Republic", "the Netherlands"], "song": ["Malořez", "Birth of a New Age"],
+        "place": [28, 23],
+    }).to_csv(directory / "final_merged.csv", index=False)
+    pd.DataFrame({
+        "year": [2021], "round": ["final"], "from_country_id": ["cz"], "to_country_id": ["nl"],
+        "total_points": [8], "jury_points": [5], "tele_points": [3],
+    }).to_csv(directory / "votes.csv", index=False)
+    return [str(directory / name) for name in ("final_merged.csv", "votes.csv", "contestants.csv")]
+
+
+def test_countries_are_found_under_any_of_their_names(tmp_path):
+    dataset = Dataset(*write_files(tmp_path))
+    for name in ("cz", "Czechia", "czech republic", "CZECHIA"):
+        assert dataset.lookup(name) == "cz"
+    assert dataset.lookup("Holland") == "nl"  # an alias of the registry
+    assert dataset.lookup("Atlantis") is None
+
+    status, history = dataset.country_history("Czechia")
+    assert status == 200 and [entry["song"] for entry in history["entries"]] == ["Malořez"]
+    status, votes = dataset.votes(2021, "received", "Netherlands")
+    assert status == 200 and votes["received"] == {"Czech Republic": 8}
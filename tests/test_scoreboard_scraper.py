@@ -0,0 +1,32 @@
+from create_data_set_code.scoreboard_scraper import ScoreboardScraper, read_snapshot, year_url
+
+SCOREBOARD = '<html><table class="scoreboard_table"><tr><td>Italy</td></tr></table></html>'
+UNRENDERED = '<html><div id="app">Loading...</div></html>'
+
+
+def fake_fetcher(pages, calls):
+    class FakeFetcher:
+        def fetch(self, url):
+            calls.append(url)
+            return pages[url]
+
+        def close(self):
+            pass
+
+    return FakeFetcher
+
+
+def test_only_scoreboard_pages_are_cached(tmp_path):
+    good, bad = year_url(2021), year_url(2022)
+    calls = []
+    factory = fake_fetcher({good: SCOREBOARD, bad: UNRENDERED}, calls)
+
+    with ScoreboardScraper(workers=1, cache_dir=str(tmp_path), fetcher_factory=factory) as scraper:
+        assert scraper.fetch_years([2021, 2022]) == {2021: SCOREBOARD, 2022: UNRENDERED}
+    assert read_snapshot(good, str(tmp_path)) == SCOREBOARD
+    assert read_snapshot(bad, str(tmp_path)) is None
+
+    # The cached page is served offline, the unrendered one is fetched again
+    with ScoreboardScraper(workers=1, cache_dir=str(tmp_path), fetcher_factory=factory) as scraper:
+        scraper.fetch_years([2021, 2022])
+    assert calls == [good, bad, bad]
@@ -0,0 +1,26 @@
+import json
+
+import pandas as pd
+
+from create_data_set_code.vocabulary import load_registry
+
+
+def write_basic_datasets(directory):
+    (directory / "countries.json").write_text(json.dumps({"cz": "Czechia", "nl": "Netherlands"}), encoding="utf-8")
+    pd.DataFrame({
+        "year": [2007, 2021], "to_country_id": ["cz", "nl"], "to_country": ["Czech Republic", "Netherlands"],
+    }).to_csv(directory / "contestants.csv", index=False)
+    return str(directory)
+
+
+def test_registries_share_countries_but_not_what_they_encode(tmp_path):
+    basic_dir = write_basic_datasets(tmp_path)
+    first, second = load_registry(basic_dir), load_registry(basic_dir)
+    assert first.countries is second.countries
+
+    frame = pd.DataFrame({"country": ["Czech Republic"], "artist": ["Kabát"], "language": ["Czech"]})
+    first.encode_frame(frame)
+    assert frame["country"].tolist() == ["Czechia"]
+    assert len(first.people) == len(first.languages) == 1
+    assert len(second.people) == len(second.languages) == 0
+    assert len(first.countries) == 2
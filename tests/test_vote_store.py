@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from create_data_set_code.extract_song_db_1 import apply_jury_scores, entry_votes, scoreboards_to_long
+from create_data_set_code.vocabulary import CountryRegistry
+from create_data_set_code.vote_store import ANY_VOTER, ENTRY_ID, with_votes
+from create_data_set_code.vote_tensor import VoteTensor
+
+COUNTRIES = {"aa": "Alpha", "bb": "Beta", "cc": "Gamma", "dd": "Delta"}
+
+
+def final_votes(year, voters, finalists, jury, tele):
+    """votes.csv rows of one final; jury / tele give the points as {(from, to): points}, 0 otherwise."""
+    return [
+        {"year": year, "round": "final", "from_country_id": v, "to_country_id": f,
+         "jury_points": jury.get((v, f), 0) if jury is not None else np.nan,
+         "tele_points": tele.get((v, f), 0) if tele is not None else np.nan,
+         "total_points": jury.get((v, f), 0) + tele.get((v, f), 0) if jury is not None else 3}
+        for v in voters for f in finalists if v != f
+    ]
+
+
+def make_inputs():
+    votes = pd.DataFrame(
+        # Totals only: the jury points of 2015 come from its scoreboard
+        final_votes(2015, ["aa", "bb", "cc"], ["aa", "bb"], None, None)
+        # Delta votes without being in the final
+        + final_votes(2016, ["aa", "bb", "cc", "dd"], ["aa", "bb", "cc"],
+                      jury={("aa", "bb"): 12, ("bb", "aa"): 12, ("cc", "aa"): 10, ("dd", "cc"): 12},
+                      tele={("aa", "cc"): 12, ("bb", "cc"): 8, ("cc", "bb"): 12, ("dd", "aa"): 12})
+    )
+    entries = pd.DataFrame({
+        ENTRY_ID: range(6),
+        "year": [2014, 2015, 2015, 2016, 2016, 2016],
+        "to_country_id": ["aa", "aa", "bb", "aa", "bb", "cc"],
+        "to_country": ["Alpha", "Alpha", "Beta", "Alpha", "Beta", "Gamma"],
+        "points_final": np.nan,
+        "points_jury_final": np.nan,
+    })
+    scoreboards = {
+        2015: pd.DataFrame({"Country": ["Alpha", "Beta"], "total_judge_points": [10, 5],
+                            "Beta Jury": [10, 0], "Gamma Jury": [0, 5], "Omega Jury": [3, 3]}),
+        # Written over the tensor's jury points
+        2016: pd.DataFrame({"Country": ["Beta"], "total_judge_points": [7], "Alpha Jury": [7]}),
+    }
+    countries = CountryRegistry()
+    for iso, name in COUNTRIES.items():
+        countries.add(iso, name)
+    return VoteTensor.from_votes(votes), entries, scoreboards_to_long(scoreboards), countries
+
+
+def test_with_votes_rebuilds_the_wide_block():
+    tensor, entries, long_scores, countries = make_inputs()
+
+    # The block song_db_1 used to write: the wide votes of each entry, scraped jury points over them
+    legacy = entries.merge(tensor.wide_votes(COUNTRIES), on=["year", "to_country_id"], how="left")
+    legacy = apply_jury_scores(legacy, long_scores)
+    vote_columns = [c for c in legacy.columns if c.endswith((" Jury", " Televote"))]
+
+    votes = entry_votes(entries, tensor.long_votes(COUNTRIES), long_scores, countries)
+    rebuilt = with_votes(entries, votes, names=countries.name)
+    assert sorted(c for c in rebuilt.columns if c.endswith((" Jury", " Televote"))) == sorted(vote_columns)
+    pd.testing.assert_frame_equal(rebuilt[vote_columns], legacy[vote_columns])
+
+    # Only the votes themselves are stored: no empty cells, the 0s of an entry are its default row
+    assert votes["points"].notna().all()
+    defaults = votes[votes["voter_id"] == ANY_VOTER]
+    assert sorted(defaults[ENTRY_ID].unique()) == [3, 4, 5]
+    assert not ((votes["voter_id"] != ANY_VOTER) & votes[ENTRY_ID].isin([3, 4, 5]) & (votes["points"] == 0)).any()
+
+
+def test_long_votes_has_no_empty_cells():
+    tensor, _, _, _ = make_inputs()
+    long = tensor.long_votes(COUNTRIES)
+    # 2016: every voter but the finalist itself, recorded 0s included; 2015 has no jury or televotes
+    assert set(long["year"]) == {2016}
+    assert len(long) == 2 * (4 * 3 - 3)
+    assert long["points"].notna().all()